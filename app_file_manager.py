@@ -1,29 +1,135 @@
+import gzip
+import hashlib
 import io
 import json
 import os
+import tempfile
+import threading
 import zipfile
 
+SAVE_COALESCE_SECONDS = 1.5
+
 
 class AppFileManager:
     def __init__(self, logger=None, has_pil=False, image_module=None):
         self.logger = logger
         self.has_pil = has_pil
         self.image_module = image_module
+        self._written_digests = {}
+        self._pending_writes = {}
+        self._pending_timers = {}
+        self._write_generations = {}
+        self._path_locks = {}
+        self._write_lock = threading.RLock()
 
     def log(self, msg):
         if self.logger:
             self.logger(msg)
 
+    def _write_key(self, path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def _payload_digest(self, data):
+        text = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _atomic_write_text(self, path, text):
+        self._atomic_write_bytes(path, text.encode("utf-8"))
+
+    def _atomic_write_bytes(self, path, data):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=parent or None)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
     def load_json_file(self, path):
+        with self._write_lock:
+            pending = self._pending_writes.get(self._write_key(path))
+        if pending is not None:
+            return json.loads(json.dumps(pending[0]))
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def _next_generation(self, key):
+        self._write_generations[key] = self._write_generations.get(key, 0) + 1
+        return self._write_generations[key]
+
+    def _path_lock(self, key):
+        with self._write_lock:
+            return self._path_locks.setdefault(key, threading.Lock())
+
+    def _write_json(self, key, path, data, generation):
+        digest = self._payload_digest(data)
+        text = json.dumps(data, indent=4)
+        with self._path_lock(key):
+            with self._write_lock:
+                if self._write_generations.get(key) != generation:
+                    return False
+                if self._written_digests.get(key) == digest and os.path.exists(path):
+                    return False
+            self._atomic_write_text(path, text)
+            with self._write_lock:
+                self._written_digests[key] = digest
+            return True
+
     def save_json_file(self, path, data):
-        parent = os.path.dirname(path)
-        if parent:
-            os.makedirs(parent, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        key = self._write_key(path)
+        with self._write_lock:
+            self._cancel_pending_write(key)
+            generation = self._next_generation(key)
+        return self._write_json(key, path, data, generation)
+
+    def save_json_file_deferred(self, path, data, delay=SAVE_COALESCE_SECONDS):
+        key = self._write_key(path)
+        with self._write_lock:
+            self._pending_writes[key] = (data, path)
+            if key in self._pending_timers:
+                return
+            timer = threading.Timer(delay, self._flush_pending_write, args=(key,))
+            timer.daemon = True
+            self._pending_timers[key] = timer
+            timer.start()
+
+    def _cancel_pending_write(self, key):
+        timer = self._pending_timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending_writes.pop(key, None)
+
+    def _flush_pending_write(self, key):
+        with self._write_lock:
+            self._pending_timers.pop(key, None)
+            pending = self._pending_writes.pop(key, None)
+            if pending is None:
+                return False
+            generation = self._next_generation(key)
+        data, path = pending
+        try:
+            return self._write_json(key, path, data, generation)
+        except Exception as e:
+            self.log(f"Deferred save failed for {os.path.basename(path)}: {e}")
+            return False
+
+    def flush_pending_writes(self):
+        with self._write_lock:
+            keys = list(self._pending_writes)
+        written = 0
+        for key in keys:
+            if self._flush_pending_write(key):
+                written += 1
+        return written
 
     def load_config(self, config_path, legacy_paths=None):
         candidate_paths = [config_path]
@@ -41,14 +147,38 @@ class AppFileManager:
         return {}
 
     def save_config(self, config_path, data):
-        self.save_json_file(config_path, data)
+        return self.save_json_file(config_path, data)
 
-    def save_profile(self, path, data):
-        self.save_json_file(path, data)
+    def save_profile(self, path, data, defer=False):
+        if defer:
+            self.save_json_file_deferred(path, data)
+            return True
+        return self.save_json_file(path, data)
 
     def load_profile(self, path):
         return self.load_json_file(path)
 
+    def save_snapshot_file(self, path, snapshot):
+        rows = []
+        for rel_path, entry in sorted((snapshot or {}).items()):
+            row = [rel_path, entry.get("size", 0), entry.get("mtime_ns", 0)]
+            if entry.get("hash"):
+                row.append(entry["hash"])
+            rows.append(row)
+        payload = json.dumps({"version": 1, "entries": rows}, separators=(",", ":"))
+        self._atomic_write_bytes(path, gzip.compress(payload.encode("utf-8"), compresslevel=6))
+
+    def load_snapshot_file(self, path):
+        with gzip.open(path, "rb") as f:
+            data = json.loads(f.read().decode("utf-8"))
+        snapshot = {}
+        for row in data.get("entries", []):
+            rel_path, size, mtime_ns = row[:3]
+            snapshot[rel_path] = {"size": size, "mtime_ns": mtime_ns}
+            if len(row) > 3 and row[3]:
+                snapshot[rel_path]["hash"] = row[3]
+        return snapshot
+
     def resize_preview_image(self, image_path, temp_dir):
         if not self.has_pil or self.image_module is None:
             return None
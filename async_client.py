@@ -0,0 +1,79 @@
+import asyncio
+
+from workshop_backend import DETAILS_BATCH_SIZE
+
+ASYNC_MAX_CONCURRENCY = 6
+
+
+class AsyncWorkshopClient:
+    def __init__(self, workshop_backend, max_concurrency=ASYNC_MAX_CONCURRENCY, logger=None):
+        self.workshop_backend = workshop_backend
+        self.max_concurrency = max_concurrency
+        self.logger = logger
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    async def _bounded(self, semaphore, fn, *args, **kwargs):
+        async with semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def gather_calls(self, calls):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._bounded(semaphore, fn, *args, **kwargs) for fn, args, kwargs in calls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_details(self, api_key, item_ids, known_updates=None, batch_size=DETAILS_BATCH_SIZE):
+        item_ids = list(dict.fromkeys(str(item_id) for item_id in item_ids or [] if item_id))
+        batches = [item_ids[start:start + batch_size] for start in range(0, len(item_ids), batch_size)]
+        results = await self.gather_calls([
+            (self.workshop_backend.fetch_workshop_items_details, (api_key, batch), {"known_updates": known_updates, "batch_size": batch_size})
+            for batch in batches
+        ])
+        merged = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                self.log(f"Details batch of {len(batch)} item(s) failed: {result}")
+                continue
+            merged.update(result)
+        return merged
+
+    async def update_tags(self, api_key, appid, tags_by_item, change_note="", change_notes=None, steamworks_updater=None, base_dir=None, create_appid_file=False):
+        item_ids = list(tags_by_item)
+        change_notes = change_notes or {}
+        native = {}
+        if steamworks_updater is not None:
+            native = {"steamworks_updater": steamworks_updater, "base_dir": base_dir, "create_appid_file": create_appid_file}
+        results = await self.gather_calls([
+            (
+                self.workshop_backend.update_workshop_tags,
+                (api_key, item_id, appid, tags_by_item[item_id]),
+                dict(native, change_note=change_notes.get(item_id, change_note)),
+            )
+            for item_id in item_ids
+        ])
+        return dict(zip(item_ids, results))
+
+
+class WorkshopBatchClient:
+    def __init__(self, async_client):
+        self.async_client = async_client
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def fetch_details(self, api_key, item_ids, known_updates=None):
+        return self._run(self.async_client.fetch_details(api_key, item_ids, known_updates=known_updates))
+
+    def update_tags(self, api_key, appid, tags_by_item, change_note="", change_notes=None, steamworks_updater=None, base_dir=None, create_appid_file=False):
+        return self._run(self.async_client.update_tags(
+            api_key,
+            appid,
+            tags_by_item,
+            change_note=change_note,
+            change_notes=change_notes,
+            steamworks_updater=steamworks_updater,
+            base_dir=base_dir,
+            create_appid_file=create_appid_file,
+        ))
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+
+VANITY_CACHE_TTL_SECONDS = 7 * 24 * 3600
+API_KEY_VALID_TTL_SECONDS = 24 * 3600
+API_KEY_INVALID_TTL_SECONDS = 300
+
+
+class IdentityCache:
+    def __init__(
+        self,
+        path,
+        file_manager,
+        vanity_ttl=VANITY_CACHE_TTL_SECONDS,
+        valid_key_ttl=API_KEY_VALID_TTL_SECONDS,
+        invalid_key_ttl=API_KEY_INVALID_TTL_SECONDS,
+        logger=None,
+    ):
+        self.path = path
+        self.file_manager = file_manager
+        self.vanity_ttl = vanity_ttl
+        self.valid_key_ttl = valid_key_ttl
+        self.invalid_key_ttl = invalid_key_ttl
+        self.logger = logger
+        self._data = None
+        self._lock = threading.Lock()
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def _load(self):
+        if self._data is None:
+            self._data = {"vanity": {}, "api_keys": {}}
+            try:
+                loaded = self.file_manager.load_json_file(self.path)
+                if isinstance(loaded, dict):
+                    self._data["vanity"].update(loaded.get("vanity") or {})
+                    self._data["api_keys"].update(loaded.get("api_keys") or {})
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.log(f"Ignoring unreadable identity cache: {e}")
+        return self._data
+
+    def _save(self):
+        try:
+            self.file_manager.save_json_file(self.path, self._data)
+        except Exception as e:
+            self.log(f"Could not save identity cache: {e}")
+
+    def _key_digest(self, api_key):
+        return hashlib.sha256((api_key or "").strip().encode("utf-8")).hexdigest()
+
+    def _fresh(self, entry, ttl, now):
+        return isinstance(entry, dict) and now - float(entry.get("at", 0) or 0) < ttl
+
+    def get_vanity(self, vanity, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load()["vanity"].get((vanity or "").strip().lower())
+            if self._fresh(entry, self.vanity_ttl, now):
+                return entry.get("steam_id")
+        return None
+
+    def put_vanity(self, vanity, steam_id, now=None):
+        with self._lock:
+            self._load()["vanity"][(vanity or "").strip().lower()] = {
+                "steam_id": str(steam_id),
+                "at": time.time() if now is None else now,
+            }
+            self._save()
+
+    def get_api_key_result(self, api_key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load()["api_keys"].get(self._key_digest(api_key))
+            if not isinstance(entry, dict):
+                return None
+            ttl = self.valid_key_ttl if entry.get("ok") else self.invalid_key_ttl
+            if self._fresh(entry, ttl, now):
+                return bool(entry.get("ok")), f"{entry.get('detail', '')} (cached)"
+        return None
+
+    def put_api_key_result(self, api_key, ok, detail, now=None):
+        with self._lock:
+            self._load()["api_keys"][self._key_digest(api_key)] = {
+                "ok": bool(ok),
+                "detail": detail,
+                "at": time.time() if now is None else now,
+            }
+            self._save()
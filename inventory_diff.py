@@ -0,0 +1,224 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+CONTENT_HASH_CACHE_LIMIT = 50000
+
+class ContentHasher:
+    def __init__(self, logger=None, max_workers=None, chunk_size=1024 * 1024, cache_limit=CONTENT_HASH_CACHE_LIMIT):
+        self.logger = logger
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 2) + 2)
+        self.chunk_size = chunk_size
+        self.cache_limit = cache_limit
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def _cache_key(self, entry):
+        return (entry["path"], entry["size"], entry["mtime_ns"])
+
+    def _remember(self, key, digest):
+        self._cache[key] = digest
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_limit:
+            self._cache.popitem(last=False)
+
+    def hash_file(self, path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def seed(self, inventory, snapshot):
+        snapshot = snapshot or {}
+        with self._lock:
+            for entry in inventory or []:
+                previous = snapshot.get(entry["rel_path"])
+                if not previous or not previous.get("hash"):
+                    continue
+                if previous.get("size") == entry["size"] and previous.get("mtime_ns") == entry["mtime_ns"]:
+                    key = self._cache_key(entry)
+                    if key not in self._cache:
+                        self._remember(key, previous["hash"])
+
+    def hash_entries(self, entries):
+        hashes = {}
+        missing = []
+        with self._lock:
+            for entry in entries or []:
+                key = self._cache_key(entry)
+                cached = self._cache.get(key)
+                if cached:
+                    self._cache.move_to_end(key)
+                    hashes[entry["rel_path"]] = cached
+                else:
+                    missing.append(entry)
+
+        def _hash(entry):
+            try:
+                return entry, self.hash_file(entry["path"])
+            except Exception as e:
+                self.log(f"Could not hash {entry['rel_path']}: {e}")
+                return entry, ""
+
+        if len(missing) == 1:
+            results = [_hash(missing[0])]
+        elif missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(_hash, missing))
+        else:
+            results = []
+
+        with self._lock:
+            for entry, digest in results:
+                if not digest:
+                    continue
+                self._remember(self._cache_key(entry), digest)
+                hashes[entry["rel_path"]] = digest
+        return hashes
+
+
+class InventoryDiffEngine:
+    def __init__(self, logger=None, cache_size=8):
+        self.logger = logger
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def build_snapshot(self, inventory, hashes=None):
+        snapshot = {}
+        for entry in inventory or []:
+            snapshot[entry["rel_path"]] = {
+                "size": entry["size"],
+                "mtime_ns": entry["mtime_ns"],
+            }
+            if hashes and hashes.get(entry["rel_path"]):
+                snapshot[entry["rel_path"]]["hash"] = hashes[entry["rel_path"]]
+        return snapshot
+
+    def _entry_changed(self, current, previous):
+        return current.get("size") != previous.get("size") or current.get("mtime_ns") != previous.get("mtime_ns")
+
+    def diff(self, inventory, last_snapshot, current_key=None, previous_key=None, hasher=None):
+        cache_key = None
+        if current_key is not None and previous_key is not None:
+            cache_key = (current_key, previous_key, "content" if hasher is not None else "metadata")
+            with self._lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    return cached
+
+        current = sorted(inventory or [], key=lambda item: item["rel_path"])
+        previous = last_snapshot or {}
+        previous_paths = sorted(previous)
+        added = []
+        modified = []
+        removed = []
+
+        i = 0
+        j = 0
+        while i < len(current) and j < len(previous_paths):
+            entry = current[i]
+            rel_path = entry["rel_path"]
+            previous_path = previous_paths[j]
+            if rel_path == previous_path:
+                if self._entry_changed(entry, previous[previous_path]):
+                    modified.append(rel_path)
+                i += 1
+                j += 1
+            elif rel_path < previous_path:
+                added.append(rel_path)
+                i += 1
+            else:
+                removed.append(previous_path)
+                j += 1
+        added.extend(entry["rel_path"] for entry in current[i:])
+        removed.extend(previous_paths[j:])
+
+        renamed = []
+        if hasher is not None:
+            current_by_path = {entry["rel_path"]: entry for entry in current}
+            modified = self._drop_identical_content(modified, current_by_path, previous, hasher)
+            added, removed, renamed = self._pair_renames(added, removed, current_by_path, previous, hasher)
+
+        result = {
+            "added": added,
+            "modified": modified,
+            "removed": removed,
+            "renamed": renamed,
+            "changed": len(added) + len(modified) + len(removed) + len(renamed),
+        }
+        if cache_key is not None:
+            with self._lock:
+                self._cache[cache_key] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def changed_bytes(self, inventory, diff):
+        changed = set(diff["added"]) | set(diff["modified"])
+        return sum(entry["size"] for entry in inventory or [] if entry["rel_path"] in changed)
+
+    def _drop_identical_content(self, modified, current_by_path, previous, hasher):
+        candidates = [
+            current_by_path[rel_path]
+            for rel_path in modified
+            if previous[rel_path].get("hash") and previous[rel_path].get("size") == current_by_path[rel_path]["size"]
+        ]
+        if not candidates:
+            return modified
+        hashes = hasher.hash_entries(candidates)
+        return [
+            rel_path for rel_path in modified
+            if not hashes.get(rel_path) or hashes[rel_path] != previous[rel_path].get("hash")
+        ]
+
+    def _pair_renames(self, added, removed, current_by_path, previous, hasher):
+        removed_by_hash = {}
+        for rel_path in removed:
+            digest = previous[rel_path].get("hash")
+            if digest:
+                removed_by_hash.setdefault((previous[rel_path].get("size"), digest), []).append(rel_path)
+        if not removed_by_hash:
+            return added, removed, []
+
+        removed_sizes = {size for size, _digest in removed_by_hash}
+        candidates = [current_by_path[rel_path] for rel_path in added if current_by_path[rel_path]["size"] in removed_sizes]
+        hashes = hasher.hash_entries(candidates)
+
+        renamed = []
+        paired_added = set()
+        paired_removed = set()
+        for rel_path in added:
+            digest = hashes.get(rel_path)
+            sources = removed_by_hash.get((current_by_path[rel_path]["size"], digest)) if digest else None
+            if sources:
+                source = sources.pop(0)
+                renamed.append((source, rel_path))
+                paired_added.add(rel_path)
+                paired_removed.add(source)
+        if not renamed:
+            return added, removed, []
+        return (
+            [rel_path for rel_path in added if rel_path not in paired_added],
+            [rel_path for rel_path in removed if rel_path not in paired_removed],
+            renamed,
+        )
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
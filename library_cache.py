@@ -0,0 +1,73 @@
+import os
+import re
+import time
+
+LIBRARY_CACHE_TTL_SECONDS = 3600
+
+
+class WorkshopLibraryCache:
+    def __init__(self, cache_dir, file_manager, ttl_seconds=LIBRARY_CACHE_TTL_SECONDS, logger=None):
+        self.cache_dir = cache_dir
+        self.file_manager = file_manager
+        self.ttl_seconds = ttl_seconds
+        self.logger = logger
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def _path(self, steam_id, appid):
+        safe_id = re.sub(r"[^0-9A-Za-z_-]+", "", str(steam_id or ""))
+        safe_appid = re.sub(r"[^0-9A-Za-z_-]+", "", str(appid or ""))
+        return os.path.join(self.cache_dir, f"library-{safe_id}-{safe_appid}.json")
+
+    def load(self, steam_id, appid):
+        if not steam_id:
+            return None
+        path = self._path(steam_id, appid)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = self.file_manager.load_json_file(path)
+        except Exception as e:
+            self.log(f"Ignoring unreadable Workshop library cache: {e}")
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("items"), list):
+            return None
+        return entry
+
+    def save(self, steam_id, appid, items, meta=None, fetched_at=None, details=None):
+        entry = {
+            "steam_id": str(steam_id),
+            "appid": str(appid),
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "items": list(items or []),
+            "meta": dict(meta or {}),
+            "details": dict(details or {}),
+        }
+        self.file_manager.save_json_file(self._path(steam_id, appid), entry)
+        return entry
+
+    def age_seconds(self, entry, now=None):
+        now = time.time() if now is None else now
+        try:
+            return max(0.0, now - float(entry.get("fetched_at", 0)))
+        except Exception:
+            return float("inf")
+
+    def is_fresh(self, entry, now=None):
+        if not entry:
+            return False
+        return self.age_seconds(entry, now=now) < self.ttl_seconds
+
+    def describe_age(self, entry, now=None):
+        age = self.age_seconds(entry, now=now)
+        if age == float("inf"):
+            return "an unknown time ago"
+        if age < 60:
+            return "just now"
+        if age < 3600:
+            return f"{int(age // 60)} min ago"
+        if age < 86400:
+            return f"{int(age // 3600)} h ago"
+        return f"{int(age // 86400)} d ago"
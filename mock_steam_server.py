@@ -0,0 +1,326 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MOCK_STEAM_ID = "76561198000000001"
+MOCK_BASE_TIME = 1700000000
+QUERY_RANKED_BY_PUBLICATION_DATE = 1
+QUERY_RANKED_BY_LAST_UPDATED_DATE = 21
+
+
+class MockSteamState:
+    def __init__(self, item_count=100, appid="301650", steam_id=MOCK_STEAM_ID, latency=0.0, error_rate=0.0, rate_limit_every=0, qr_polls_until_login=2, seed=0):
+        self.appid = str(appid)
+        self.steam_id = steam_id
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_every = rate_limit_every
+        self.qr_polls_until_login = qr_polls_until_login
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.forced_failures = []
+        self.qr_sessions = {}
+        self.items = {}
+        for index in range(item_count):
+            item_id = str(1000000 + index)
+            self.items[item_id] = {
+                "publishedfileid": item_id,
+                "result": 1,
+                "creator": steam_id,
+                "creator_app_id": int(appid),
+                "consumer_app_id": int(appid),
+                "title": f"Mock Item {index}",
+                "description": f"Generated mock Workshop item {index}.",
+                "file_size": str(1024 * (index + 1)),
+                "preview_url": f"/previews/{item_id}.jpg",
+                "visibility": index % 3,
+                "time_created": MOCK_BASE_TIME + index,
+                "time_updated": MOCK_BASE_TIME + index,
+                "tags": [{"tag": "Mod"}],
+            }
+
+    def fail_next(self, status, count=1, retry_after=None):
+        with self.lock:
+            self.forced_failures.extend([(status, retry_after)] * count)
+
+    def touch_item(self, item_id, **changes):
+        with self.lock:
+            item = self.items[str(item_id)]
+            item.update(changes)
+            item["time_updated"] = max(entry["time_updated"] for entry in self.items.values()) + 1
+
+    def next_failure(self, path):
+        with self.lock:
+            self.requests[path] += 1
+            total = sum(self.requests.values())
+            if self.forced_failures:
+                return self.forced_failures.pop(0)
+            if self.rate_limit_every and total % self.rate_limit_every == 0:
+                return 429, 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                return 500, None
+        return None
+
+
+class MockSteamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, _format, *_args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, status, payload=b"", content_type="application/json", headers=None):
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _params(self):
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            params.update({key: values[-1] for key, values in parse_qs(body).items()})
+        return parsed.path, params
+
+    def _dispatch(self):
+        path, params = self._params()
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        failure = self.state.next_failure(path)
+        if failure:
+            status, retry_after = failure
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+            return self._send(status, {"error": status}, headers=headers)
+
+        routes = {
+            "/IPublishedFileService/QueryFiles/v1/": self._query_files,
+            "/ISteamRemoteStorage/GetPublishedFileDetails/v1/": self._get_details,
+            "/ISteamUser/ResolveVanityURL/v1/": self._resolve_vanity,
+            "/IPublishedFileService/Update/v1/": self._update,
+            "/IAuthenticationService/BeginAuthSessionViaQR/v1/": self._begin_qr,
+            "/IAuthenticationService/PollAuthSessionStatus/v1/": self._poll_qr,
+        }
+        if path in routes:
+            return routes[path](params)
+        if path.startswith("/previews/"):
+            return self._preview(path)
+        return self._send(404, {"error": "not found"})
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+    def _public_item(self, item):
+        item = dict(item)
+        item["preview_url"] = self.server.base_url + item["preview_url"]
+        return item
+
+    def _query_files(self, params):
+        query = json.loads(params.get("input_json") or "{}")
+        per_page = max(1, min(int(query.get("numperpage", 100) or 100), 100))
+        with self.state.lock:
+            items = [item for item in self.state.items.values() if item["creator"] == str(query.get("steamid", self.state.steam_id))]
+        query_type = int(query.get("query_type", QUERY_RANKED_BY_PUBLICATION_DATE))
+        if query_type == QUERY_RANKED_BY_LAST_UPDATED_DATE:
+            items.sort(key=lambda item: item["time_updated"], reverse=True)
+        else:
+            items.sort(key=lambda item: (item["time_created"], item["publishedfileid"]), reverse=True)
+        cursor = str(query.get("cursor", "*"))
+        start = 0 if cursor == "*" else int(cursor)
+        page = items[start:start + per_page]
+        next_cursor = str(start + per_page) if start + per_page < len(items) else cursor
+        self._send(200, {"response": {
+            "total": len(items),
+            "next_cursor": next_cursor,
+            "publishedfiledetails": [self._public_item(item) for item in page],
+        }})
+
+    def _get_details(self, params):
+        count = int(params.get("itemcount", 0) or 0)
+        details = []
+        with self.state.lock:
+            for index in range(count):
+                item_id = params.get(f"publishedfileids[{index}]", "")
+                item = self.state.items.get(item_id)
+                details.append(self._public_item(item) if item else {"publishedfileid": item_id, "result": 9})
+        self._send(200, {"response": {"result": 1, "resultcount": len(details), "publishedfiledetails": details}})
+
+    def _resolve_vanity(self, params):
+        vanity = (params.get("vanityurl") or "").lower()
+        if not vanity or vanity == "missing":
+            return self._send(200, {"response": {"success": 42, "message": "No match"}})
+        steam_id = self.state.steam_id if vanity != "valve" else "76561197960287930"
+        self._send(200, {"response": {"steamid": steam_id, "success": 1}})
+
+    def _update(self, params):
+        item_id = params.get("publishedfileid", "")
+        with self.state.lock:
+            exists = item_id in self.state.items
+        if not exists:
+            return self._send(400, {"response": {}})
+        tags = [params[key] for key in sorted(params) if key.startswith("tags[")]
+        changes = {"tags": [{"tag": tag} for tag in tags]} if tags else {}
+        if "title" in params:
+            changes["title"] = params["title"]
+        if "file_description" in params:
+            changes["description"] = params["file_description"]
+        if params.get("visibility", "").isdigit():
+            changes["visibility"] = int(params["visibility"])
+        self.state.touch_item(item_id, **changes)
+        self._send(200, {"response": {}})
+
+    def _begin_qr(self, _params):
+        with self.state.lock:
+            client_id = str(len(self.state.qr_sessions) + 1)
+            self.state.qr_sessions[client_id] = 0
+        self._send(200, {"response": {
+            "client_id": client_id,
+            "request_id": f"request-{client_id}",
+            "challenge_url": f"https://s.team/q/1/{client_id}",
+            "interval": 5,
+        }})
+
+    def _poll_qr(self, params):
+        client_id = params.get("client_id", "")
+        with self.state.lock:
+            if client_id not in self.state.qr_sessions:
+                return self._send(400, {"response": {}})
+            self.state.qr_sessions[client_id] += 1
+            done = self.state.qr_sessions[client_id] >= self.state.qr_polls_until_login
+        if done:
+            return self._send(200, {"response": {"account_name": "mockuser", "refresh_token": "mock-refresh", "access_token": "mock-access"}})
+        self._send(200, {"response": {"had_remote_interaction": False}})
+
+    def _preview(self, path):
+        item_id = path.rsplit("/", 1)[-1].split(".")[0]
+        with self.state.lock:
+            item = self.state.items.get(item_id)
+        if not item:
+            return self._send(404, b"", content_type="image/jpeg")
+        body = f"preview-{item_id}-{item['time_updated']}".encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", content_type="image/jpeg", headers={"ETag": etag})
+        self._send(200, body, content_type="image/jpeg", headers={"ETag": etag})
+
+
+class MockSteamServer:
+    def __init__(self, host="127.0.0.1", port=0, **state_kwargs):
+        self.state = MockSteamState(**state_kwargs)
+        self.httpd = ThreadingHTTPServer((host, port), MockSteamHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.httpd.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return self.httpd.base_url
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_exc):
+        self.stop()
+
+
+def run_benchmark(item_count, latency, tag_updates, error_rate=0.0, rate_limit_every=0):
+    from steam_service import RateLimiter, SteamService
+    from workshop_backend import WorkshopBackend
+    from async_client import AsyncWorkshopClient, WorkshopBatchClient
+
+    with MockSteamServer(item_count=item_count, latency=latency, error_rate=error_rate, rate_limit_every=rate_limit_every) as server:
+        service = SteamService(api_base_url=server.base_url, rate_limiter=RateLimiter(rate=1000.0, burst=1000))
+        backend = WorkshopBackend(service)
+        start = time.perf_counter()
+        _steam_id, items, meta = backend.query_workshop_items("mock-key", MOCK_STEAM_ID, server.state.appid, lambda identity, _key: identity)
+        full = time.perf_counter() - start
+
+        server.state.touch_item(items[0]["publishedfileid"], title="Changed")
+        start = time.perf_counter()
+        _steam_id, items, sync_meta = backend.query_workshop_items("mock-key", MOCK_STEAM_ID, server.state.appid, lambda identity, _key: identity, known_items=items)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        details = WorkshopBatchClient(AsyncWorkshopClient(backend)).fetch_details("mock-key", [item["publishedfileid"] for item in items])
+        details_time = time.perf_counter() - start
+
+        targets = {item["publishedfileid"]: ["Mod", "Map"] for item in items[:tag_updates]}
+        start = time.perf_counter()
+        WorkshopBatchClient(AsyncWorkshopClient(backend)).update_tags("mock-key", server.state.appid, targets)
+        tags_time = time.perf_counter() - start
+        service.close()
+        request_count = sum(server.state.requests.values())
+
+    print(f"Full library refresh: {len(items)} items, {meta['pages']} page(s) in {full:.3f}s")
+    print(f"Incremental sync: {sync_meta['changed']} changed, {sync_meta['pages']} page(s) in {incremental:.3f}s")
+    print(f"Batched details: {len(details)} items in {details_time:.3f}s")
+    print(f"Tag updates: {len(targets)} items in {tags_time:.3f}s")
+    if error_rate or rate_limit_every:
+        print(f"Fault injection: error rate {error_rate:.0%}, 429 every {rate_limit_every or '-'} request(s), {request_count} request(s) served")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Steam Web API endpoints used by the uploader.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay added to every response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with HTTP 429.")
+    parser.add_argument("--benchmark", action="store_true", help="Run refresh/details/tag benchmarks and exit.")
+    parser.add_argument("--tag-updates", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.items, args.latency, args.tag_updates, error_rate=args.error_rate, rate_limit_every=args.rate_limit_every)
+        return
+
+    server = MockSteamServer(
+        host=args.host,
+        port=args.port,
+        item_count=args.items,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_every=args.rate_limit_every,
+    )
+    print(f"Mock Steam Web API listening on {server.base_url} (set steam_api_base_url to use it)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,18 @@ import configparser
 import hashlib
 import os
 import re
+import threading
+from collections import OrderedDict
+
+FINGERPRINT_CACHE_LIMIT = 16384
 
 
 class ModScanner:
     def __init__(self, resource_dir, logger=None):
         self.resource_dir = resource_dir
         self.logger = logger
+        self._dir_fingerprint_cache = OrderedDict()
+        self._fingerprint_lock = threading.Lock()
 
     def log(self, msg):
         if self.logger:
@@ -73,13 +79,99 @@ class ModScanner:
                 })
         return inventory
 
-    def fingerprint_inventory(self, inventory):
+    def _hash_directory_files(self, rows):
         digest = hashlib.sha1()
-        for entry in sorted(inventory, key=lambda item: item["rel_path"]):
-            digest.update(entry["rel_path"].encode("utf-8", errors="ignore"))
-            digest.update(str(entry["mtime_ns"]).encode("ascii", errors="ignore"))
-            digest.update(str(entry["size"]).encode("ascii", errors="ignore"))
-        return digest.hexdigest()
+        for name, size, mtime_ns in rows:
+            digest.update(f"{name}\0{size}\0{mtime_ns}\n".encode("utf-8", errors="ignore"))
+        return digest.digest()
+
+    def _inventory_root(self, inventory):
+        for entry in inventory or []:
+            path = entry.get("path")
+            if path:
+                return os.path.normcase(os.path.abspath(path[:len(path) - len(entry["rel_path"])] or "."))
+        return ""
+
+    def fingerprint_tree(self, inventory, root=None):
+        if root is None:
+            root = self._inventory_root(inventory)
+        else:
+            root = os.path.normcase(os.path.abspath(root))
+        groups = {}
+        for entry in inventory or []:
+            rel_dir, _, name = entry["rel_path"].rpartition("/")
+            row = (name, entry["size"], entry["mtime_ns"])
+            group = groups.get(rel_dir)
+            if group is None:
+                groups[rel_dir] = [hash(row), row]
+            else:
+                group[0] += hash(row)
+                group.append(row)
+
+        file_digests = {}
+        with self._fingerprint_lock:
+            cache = self._dir_fingerprint_cache
+            for rel_dir, group in groups.items():
+                key = (root, rel_dir)
+                stamp = (group[0], len(group) - 1)
+                cached = cache.get(key)
+                if cached is not None and cached[0] == stamp:
+                    cache.move_to_end(key)
+                    file_digests[rel_dir] = cached[1]
+                    continue
+                rows = group[1:]
+                rows.sort()
+                file_digests[rel_dir] = self._hash_directory_files(rows)
+                cache[key] = (stamp, file_digests[rel_dir])
+                cache.move_to_end(key)
+            while len(cache) > FINGERPRINT_CACHE_LIMIT:
+                cache.popitem(last=False)
+
+        children = {"": set()}
+        for rel_dir in groups:
+            current = rel_dir
+            while current:
+                parent = current.rpartition("/")[0]
+                children.setdefault(current, set())
+                children.setdefault(parent, set()).add(current)
+                current = parent
+
+        tree = {}
+        for rel_dir in sorted(children, key=lambda name: name.count("/") + (1 if name else 0), reverse=True):
+            digest = hashlib.sha1()
+            digest.update(b"F")
+            digest.update(file_digests.get(rel_dir, b""))
+            for child in sorted(children[rel_dir]):
+                digest.update(b"D")
+                digest.update(child.rpartition("/")[2].encode("utf-8", errors="ignore"))
+                digest.update(b"\0")
+                digest.update(bytes.fromhex(tree[child]))
+            tree[rel_dir] = digest.hexdigest()
+        return tree
+
+    def fingerprint_inventory(self, inventory):
+        return self.fingerprint_tree(inventory)[""]
+
+    def locate_changed_directories(self, old_tree, new_tree):
+        old_tree = old_tree or {}
+        new_tree = new_tree or {}
+        if old_tree.get("") == new_tree.get(""):
+            return []
+
+        children = {}
+        for rel_dir in set(old_tree) | set(new_tree):
+            if rel_dir:
+                children.setdefault(rel_dir.rpartition("/")[0], []).append(rel_dir)
+
+        changed = []
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            changed.append(rel_dir)
+            for child in children.get(rel_dir, []):
+                if old_tree.get(child) != new_tree.get(child):
+                    pending.append(child)
+        return sorted(changed)
 
     def collect_findings(self, mod_dir, inventory=None):
         inventory = inventory if inventory is not None else self.build_inventory(mod_dir)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+PREVIEW_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PREVIEW_CHUNK_SIZE = 64 * 1024
+PREVIEW_BLOB_SUFFIX = ".img"
+
+
+class PreviewCache:
+    def __init__(self, cache_dir, file_manager, max_bytes=PREVIEW_CACHE_MAX_BYTES, logger=None):
+        self.cache_dir = cache_dir
+        self.file_manager = file_manager
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self._index = None
+        self._lock = threading.RLock()
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, digest + PREVIEW_BLOB_SUFFIX)
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                try:
+                    loaded = self.file_manager.load_json_file(self.index_path)
+                    if isinstance(loaded, dict):
+                        self._index = loaded
+                except Exception as e:
+                    self.log(f"Ignoring unreadable preview cache index: {e}")
+        return self._index
+
+    def _save_index(self):
+        self.file_manager.save_json_file(self.index_path, self._index)
+
+    def _touch(self, path):
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def lookup(self, url):
+        with self._lock:
+            entry = self._load_index().get(url)
+            if not entry:
+                return ""
+            path = self._blob_path(entry.get("hash", ""))
+            return path if os.path.exists(path) else ""
+
+    def fetch(self, url, steam_service, timeout=10):
+        if not url:
+            return ""
+        with self._lock:
+            entry = dict(self._load_index().get(url) or {})
+        cached_path = self.lookup(url)
+
+        headers = {}
+        if cached_path:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = steam_service.request_with_retry(
+                "GET",
+                url,
+                operation_name="Download Workshop preview",
+                stream=True,
+                timeout=timeout,
+                headers=headers,
+            )
+        except Exception as e:
+            if cached_path:
+                self.log(f"Preview revalidation failed ({e}); using cached copy.")
+                self._touch(cached_path)
+                return cached_path
+            raise
+
+        try:
+            if response.status_code == 304 and cached_path:
+                self._touch(cached_path)
+                return cached_path
+            if not response.ok:
+                return cached_path
+            tmp_path, digest, size = self._download_stream(response)
+        finally:
+            response.close()
+
+        if size > self.max_bytes:
+            path = os.path.join(tempfile.gettempdir(), f"workshop-preview-{digest}{PREVIEW_BLOB_SUFFIX}")
+            shutil.move(tmp_path, path)
+            self.log(f"Preview is larger than the cache limit ({size} bytes); not caching it.")
+            return path
+
+        with self._lock:
+            path = self._blob_path(digest)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+            self._touch(path)
+            self._load_index()[url] = {
+                "hash": digest,
+                "size": size,
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+            }
+            self.evict(keep=digest)
+            self._save_index()
+        return path
+
+    def _download_stream(self, response):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(prefix=".download-", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=PREVIEW_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    def evict(self, keep=None):
+        with self._lock:
+            index = self._load_index()
+            referenced = {entry.get("hash") for entry in index.values()}
+            blobs = []
+            try:
+                names = os.listdir(self.cache_dir)
+            except OSError:
+                return 0
+            for name in names:
+                if not name.endswith(PREVIEW_BLOB_SUFFIX):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                digest = name[:-len(PREVIEW_BLOB_SUFFIX)]
+                if digest not in referenced:
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                blobs.append((stat.st_mtime, stat.st_size, digest, path))
+
+            total = sum(size for _mtime, size, _digest, _path in blobs)
+            removed = 0
+            for _mtime, size, digest, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                if digest == keep:
+                    continue
+                os.remove(path)
+                total -= size
+                removed += 1
+                for url in [url for url, entry in index.items() if entry.get("hash") == digest]:
+                    del index[url]
+            return removed
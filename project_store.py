@@ -4,6 +4,9 @@ import re
 from datetime import datetime, timezone
 
 
+SNAPSHOT_SUFFIX = ".snapshot.gz"
+
+
 class ProjectStore:
     def __init__(self, profiles_dir, file_manager):
         self.profiles_dir = profiles_dir
@@ -19,6 +22,10 @@ class ProjectStore:
         label = self._slugify(os.path.basename(normalized) or "project")
         return os.path.join(self.profiles_dir, f"{label}-{digest}.json")
 
+    def _snapshot_path_for_profile(self, profile_path):
+        base, _ext = os.path.splitext(profile_path)
+        return base + SNAPSHOT_SUFFIX
+
     def _iter_profile_paths(self):
         if not os.path.isdir(self.profiles_dir):
             return []
@@ -46,8 +53,39 @@ class ProjectStore:
     def load_project(self, profile_path):
         data = self.file_manager.load_profile(profile_path)
         data["profile_path"] = profile_path
+        legacy_snapshot = data.pop("last_upload_inventory", None)
+        if legacy_snapshot:
+            try:
+                self.save_upload_snapshot(profile_path, legacy_snapshot)
+            except Exception:
+                data["last_upload_inventory"] = legacy_snapshot
+                return data
+            try:
+                self.file_manager.save_profile(profile_path, data)
+            except Exception:
+                pass
         return data
 
+    def save_upload_snapshot(self, profile_path, snapshot):
+        snapshot_path = self._snapshot_path_for_profile(profile_path)
+        self.file_manager.save_snapshot_file(snapshot_path, snapshot or {})
+        return snapshot_path
+
+    def load_upload_snapshot(self, profile_path):
+        if not profile_path:
+            return {}
+        snapshot_path = self._snapshot_path_for_profile(profile_path)
+        if os.path.exists(snapshot_path):
+            try:
+                return self.file_manager.load_snapshot_file(snapshot_path)
+            except Exception:
+                return {}
+        try:
+            data = self.file_manager.load_profile(profile_path)
+        except Exception:
+            return {}
+        return data.get("last_upload_inventory") or {}
+
     def find_by_mod_path(self, mod_path):
         if not mod_path:
             return None
@@ -63,11 +101,17 @@ class ProjectStore:
                 return entry
         return None
 
-    def save_project(self, data):
+    def resolve_profile_path(self, data):
+        return data.get("profile_path") or self._profile_path_for_mod(data.get("mod_path", "") or data.get("title", "project"))
+
+    def save_project(self, data, defer=False):
         payload = dict(data or {})
-        mod_path = payload.get("mod_path", "")
-        profile_path = payload.get("profile_path") or self._profile_path_for_mod(mod_path or payload.get("title", "project"))
+        profile_path = self.resolve_profile_path(payload)
         payload["profile_path"] = profile_path
-        payload["last_opened"] = datetime.now(timezone.utc).isoformat()
-        self.file_manager.save_profile(profile_path, payload)
+        if not payload.get("last_opened"):
+            payload["last_opened"] = datetime.now(timezone.utc).isoformat()
+        snapshot = payload.pop("last_upload_inventory", None)
+        if snapshot is not None:
+            self.save_upload_snapshot(profile_path, snapshot)
+        self.file_manager.save_profile(profile_path, payload, defer=defer)
         return profile_path
@@ -0,0 +1,220 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from steamcmd_progress import SteamCmdProgressParser
+
+PUBLISH_QUEUE_WORKERS = 4
+
+
+class PublishQueue:
+    def __init__(self, project_store, mod_scanner, preflight, inventory_diff_engine, vdf_dir, max_workers=PUBLISH_QUEUE_WORKERS, logger=None):
+        self.project_store = project_store
+        self.mod_scanner = mod_scanner
+        self.preflight = preflight
+        self.inventory_diff_engine = inventory_diff_engine
+        self.vdf_dir = vdf_dir
+        self.max_workers = max_workers
+        self.logger = logger
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def _job_label(self, project):
+        return project.get("project_name") or os.path.basename((project.get("mod_path") or "").rstrip("\\/")) or "project"
+
+    def prepare_job(self, profile_path, settings):
+        job = {
+            "profile_path": profile_path,
+            "label": os.path.basename(profile_path),
+            "project": None,
+            "error": "",
+            "vdf_path": "",
+        }
+        try:
+            project = self.project_store.load_project(profile_path)
+        except Exception as e:
+            job["error"] = f"Could not load project: {e}"
+            return job
+        job["project"] = project
+        job["label"] = self._job_label(project)
+
+        content = project.get("mod_path", "")
+        validation_error = self.preflight.validate_inputs(
+            title=project.get("title", ""),
+            description=project.get("description", ""),
+            steamcmd_path=settings["steamcmd_path"],
+            content_path=content,
+            preview_path=project.get("preview_path", ""),
+            username=settings.get("username", ""),
+            use_cached_creds=settings.get("use_cached_creds", True),
+            title_limit=settings["title_limit"],
+            description_limit=settings["description_limit"],
+        )
+        if validation_error:
+            job["error"] = f"{validation_error[0]}: {validation_error[1]}"
+            return job
+        if not os.path.isdir(content):
+            job["error"] = f"Content folder not found: {content}"
+            return job
+
+        inventory = self.mod_scanner.build_inventory(content)
+        findings = self.mod_scanner.collect_findings(content, inventory=inventory)
+        if findings["validation_errors"]:
+            job["error"] = "Blocking: " + "; ".join(findings["validation_errors"])
+            return job
+        job["inventory"] = inventory
+        job["signature"] = self.mod_scanner.fingerprint_inventory(inventory)
+        job["snapshot"] = self.inventory_diff_engine.build_snapshot(inventory)
+        job["warnings"] = len(findings["validation_warnings"]) + len(findings["issues"])
+        return job
+
+    def prepare_jobs(self, profile_paths, settings):
+        profile_paths = list(dict.fromkeys(path for path in profile_paths if path))
+        if not profile_paths:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(profile_paths)))) as executor:
+            futures = [executor.submit(self.prepare_job, path, settings) for path in profile_paths]
+        jobs = []
+        for path, future in zip(profile_paths, futures):
+            try:
+                jobs.append(future.result())
+            except Exception as e:
+                jobs.append({"profile_path": path, "label": os.path.basename(path), "project": None, "error": f"Preflight failed: {e}", "vdf_path": ""})
+        return jobs
+
+    def _vdf_path_for_job(self, job):
+        stem = os.path.splitext(os.path.basename(job["profile_path"]))[0]
+        return os.path.join(self.vdf_dir, f"upload-{stem}.vdf")
+
+    def write_job_vdf(self, job, appid, visibility_code, build_upload_vdf_content):
+        project = job["project"]
+        job["visibility"] = visibility_code(project.get("visibility", ""))
+        os.makedirs(self.vdf_dir, exist_ok=True)
+        job["vdf_path"] = self.preflight.write_upload_vdf(
+            base_dir=self.vdf_dir,
+            appid=appid,
+            publishedfileid=project.get("item_id") or "0",
+            contentfolder=job.get("content_dir") or project.get("mod_path", ""),
+            previewfile=project.get("preview_path", ""),
+            visibility=job["visibility"],
+            title=project.get("title", ""),
+            description=project.get("description", ""),
+            changenote=project.get("change_note", ""),
+            build_upload_vdf_content=build_upload_vdf_content,
+            vdf_name=os.path.basename(self._vdf_path_for_job(job)),
+        )
+        return job["vdf_path"]
+
+    def read_item_id(self, vdf_path):
+        try:
+            with open(vdf_path, "r", encoding="utf-8", errors="ignore") as f:
+                match = re.search(r'"publishedfileid"\s+"(\d+)"', f.read())
+        except OSError:
+            return None
+        if not match or match.group(1) == "0":
+            return None
+        return match.group(1)
+
+    def record_result(self, job, ok, detail=""):
+        now = datetime.now(timezone.utc).isoformat()
+        project = dict(job["project"] or {})
+        project.pop("last_upload_inventory", None)
+        project["last_queue_result"] = {"ok": bool(ok), "detail": detail or ("Published" if ok else "Failed"), "at": now}
+        if ok:
+            item_id = self.read_item_id(job["vdf_path"]) or project.get("item_id") or ""
+            project.update({
+                "last_upload_signature": job.get("signature"),
+                "last_upload_at": now,
+                "last_uploaded_item_id": item_id,
+                "item_id": item_id or project.get("item_id", "0"),
+                "last_published_metadata": self.preflight.build_published_metadata(
+                    title=project.get("title", ""),
+                    description=project.get("description", ""),
+                    visibility=job.get("visibility"),
+                    tags=project.get("tags", ""),
+                    preview_path=project.get("preview_path", ""),
+                ),
+            })
+        if ok:
+            profile_path = self.project_store.resolve_profile_path(project)
+            try:
+                self.project_store.save_upload_snapshot(profile_path, job.get("snapshot") or {})
+            except Exception as e:
+                self.log(f"Failed to save publish snapshot for {job['label']}: {e}")
+                project.pop("last_upload_signature", None)
+        self.project_store.save_project(project)
+        job["project"] = project
+        job["ok"] = bool(ok)
+        job["detail"] = project["last_queue_result"]["detail"]
+        return project
+
+
+class BatchProgressTracker:
+    def __init__(self, job_count, markers=None):
+        self.parsers = [SteamCmdProgressParser() for _ in range(job_count)]
+        self.index = 0
+        self.patterns = []
+        for job_markers in markers or []:
+            texts = [re.escape(str(marker).replace("\\", "/").lower()) for marker in job_markers if marker and str(marker) != "0"]
+            self.patterns.append(re.compile(r"(?<![\w.])(?:" + "|".join(texts) + r")(?![\w])") if texts else None)
+
+    def _job_for_line(self, text):
+        lower = text.replace("\\", "/").lower()
+        for index, pattern in enumerate(self.patterns):
+            if pattern is not None and pattern.search(lower):
+                return index
+        return None
+
+    @property
+    def needs_input(self):
+        return any(parser.needs_input for parser in self.parsers)
+
+    def current(self):
+        if self.index >= len(self.parsers):
+            return None
+        return self.parsers[self.index]
+
+    def _reported(self):
+        return self.current() or (self.parsers[-1] if self.parsers else None)
+
+    def should_report(self, changed):
+        parser = self._reported()
+        return parser is not None and parser.should_report(changed)
+
+    def describe(self):
+        parser = self._reported()
+        if parser is None:
+            return "Queue empty"
+        position = min(self.index + 1, len(self.parsers))
+        return f"[{position}/{len(self.parsers)}] {parser.describe()}"
+
+    def feed(self, line):
+        anchored = self._job_for_line(line or "")
+        if anchored is not None and anchored < len(self.parsers) and self.parsers[anchored].phase not in ("success", "failed"):
+            self.index = anchored
+        parser = self.current()
+        if parser is None:
+            return False
+        changed = parser.feed(line)
+        if parser.phase == "failed" and (parser.needs_input or parser.failure_reason.startswith("Login failed")):
+            for remaining in self.parsers[self.index + 1:]:
+                remaining.failure_reason = parser.failure_reason
+                remaining.phase = "failed"
+            self.index = len(self.parsers)
+        elif parser.phase in ("success", "failed"):
+            self.index += 1
+        return changed
+
+    def results(self, returncode):
+        outcomes = []
+        for parser in self.parsers:
+            if parser.phase == "success":
+                outcomes.append((True, ""))
+            elif parser.failure_reason:
+                outcomes.append((False, parser.failure_reason))
+            else:
+                outcomes.append((False, f"SteamCMD exited with code {returncode} before reporting a result"))
+        return outcomes
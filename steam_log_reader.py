@@ -0,0 +1,267 @@
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+
+from steamcmd_progress import PHASE_MARKERS, PROGRESS_COUNT_RE, PROGRESS_UNITS_RE, UNIT_BYTES
+
+TAIL_BLOCK_SIZE = 64 * 1024
+MAX_SESSION_EVENTS = 500
+LOG_VIEW_MAX_LINES = 5000
+
+TIMESTAMP_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})\]\s*")
+SESSION_START_RE = re.compile(r"(?:^|[\s+\]])workshop_build_item\b", re.IGNORECASE)
+SUCCESS_RE = re.compile(r"^(?:success\b|item updated\b)", re.IGNORECASE)
+RESULT_CODE_RE = re.compile(r"(?:eresult|result(?: code)?)\s*[:=]?\s*\(?(-?\d+)\)?", re.IGNORECASE)
+ERROR_MARKERS = ("error", "failed", "failure")
+
+
+class SteamLogReader:
+    def __init__(self, block_size=TAIL_BLOCK_SIZE, max_events=MAX_SESSION_EVENTS, logger=None):
+        self.block_size = block_size
+        self.max_events = max_events
+        self.logger = logger
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def find_session_start(self, f, size):
+        position = size
+        carry = b""
+        while position > 0:
+            read_size = min(self.block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + carry
+            lines = block.split(b"\n")
+            carry = lines[0] if position > 0 else b""
+            offset = position + len(lines[0]) + 1 if position > 0 else 0
+            starts = []
+            for index, raw in enumerate(lines):
+                if index == 0 and position > 0:
+                    continue
+                if SESSION_START_RE.search(raw.decode("utf-8", errors="ignore")):
+                    starts.append(offset)
+                offset += len(raw) + 1
+            if starts:
+                return starts[-1]
+        return 0
+
+    def _new_session(self, offset):
+        return {
+            "offset": offset,
+            "events": [],
+            "errors": [],
+            "phase": "",
+            "result_code": None,
+            "bytes_done": 0,
+            "bytes_total": 0,
+            "started_at": None,
+            "ended_at": None,
+        }
+
+    def _parse_timestamp(self, text):
+        try:
+            return datetime.fromisoformat(text.replace("T", " "))
+        except ValueError:
+            return None
+
+    def _feed(self, session, line):
+        text = line.strip()
+        if not text:
+            return
+        stamp = TIMESTAMP_RE.match(text)
+        timestamp = None
+        if stamp:
+            timestamp = self._parse_timestamp(stamp.group(1))
+            text = text[stamp.end():]
+            if timestamp is not None:
+                session["started_at"] = session["started_at"] or timestamp
+                session["ended_at"] = timestamp
+        lower = text.lower()
+        event = {"time": timestamp.isoformat() if timestamp else "", "text": text, "kind": "info"}
+
+        for phase, markers in PHASE_MARKERS:
+            if any(marker in lower for marker in markers):
+                session["phase"] = phase
+                event["kind"] = "phase"
+                break
+
+        match = PROGRESS_COUNT_RE.search(text)
+        if match:
+            done, total = int(match.group(1)), int(match.group(2))
+        else:
+            match = PROGRESS_UNITS_RE.search(text)
+            if match:
+                done = int(float(match.group(1)) * UNIT_BYTES[match.group(2).lower()])
+                total = int(float(match.group(3)) * UNIT_BYTES[match.group(4).lower()])
+        if match:
+            session["bytes_done"] = done
+            session["bytes_total"] = max(total, done, session["bytes_total"])
+            event["kind"] = "progress"
+
+        if SUCCESS_RE.match(text) and session["phase"] != "failed":
+            session["phase"] = "success"
+            event["kind"] = "phase"
+
+        result = RESULT_CODE_RE.search(text)
+        if result:
+            session["result_code"] = int(result.group(1))
+            event["kind"] = "result"
+            if session["result_code"] != 1:
+                session["phase"] = "failed"
+
+        if any(marker in lower for marker in ERROR_MARKERS):
+            session["errors"].append(text)
+            session["phase"] = "failed"
+            event["kind"] = "error"
+
+        session["events"].append(event)
+        if len(session["events"]) > self.max_events:
+            del session["events"][:len(session["events"]) - self.max_events]
+
+    def _consume(self, state, f, start):
+        f.seek(start)
+        data = f.read()
+        end = data.rfind(b"\n")
+        if end < 0:
+            return start
+        offset = start
+        for raw in data[:end].split(b"\n"):
+            line = raw.decode("utf-8", errors="ignore")
+            if SESSION_START_RE.search(line) and state["session"]["events"]:
+                state["session"] = self._new_session(offset)
+            self._feed(state["session"], line)
+            offset += len(raw) + 1
+        return start + end + 1
+
+    def read_latest_session(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        identity = (getattr(stat, "st_ino", 0), getattr(stat, "st_dev", 0))
+        with self._lock:
+            state = self._states.get(path)
+            if state is not None and (state["identity"] != identity or stat.st_size < state["offset"]):
+                state = None
+            try:
+                with open(path, "rb") as f:
+                    if state is None:
+                        start = self.find_session_start(f, stat.st_size)
+                        state = {"identity": identity, "offset": start, "session": self._new_session(start)}
+                        self._states[path] = state
+                    if stat.st_size > state["offset"]:
+                        state["offset"] = self._consume(state, f, state["offset"])
+            except OSError as e:
+                self.log(f"Could not read {path}: {e}")
+                return None
+            summary = dict(state["session"])
+            summary["events"] = list(summary["events"])
+            summary["errors"] = list(summary["errors"])
+            summary["read_offset"] = state["offset"]
+        if summary["started_at"] and summary["ended_at"]:
+            summary["duration_seconds"] = (summary["ended_at"] - summary["started_at"]).total_seconds()
+        else:
+            summary["duration_seconds"] = None
+        return summary
+
+    def forget(self, path=None):
+        with self._lock:
+            if path is None:
+                self._states.clear()
+            else:
+                self._states.pop(path, None)
+
+
+class LogTail:
+    def __init__(self, path, max_lines=LOG_VIEW_MAX_LINES, block_size=TAIL_BLOCK_SIZE):
+        self.path = path
+        self.max_lines = max_lines
+        self.block_size = block_size
+        self.offset = 0
+        self._identity = None
+        self._lock = threading.RLock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat, (getattr(stat, "st_ino", 0), getattr(stat, "st_dev", 0))
+
+    def _decode(self, data):
+        return [line.rstrip("\r") for line in data.decode("utf-8", errors="ignore").split("\n")]
+
+    def read_tail(self, start=0):
+        with self._lock:
+            found = self._stat()
+            if found is None:
+                self.offset = 0
+                self._identity = None
+                return []
+            stat, self._identity = found
+            start = min(max(0, start), stat.st_size)
+            with open(self.path, "rb") as f:
+                end = stat.st_size
+                position = end
+                data = b""
+                while position > start and data.count(b"\n") <= self.max_lines:
+                    read_size = min(self.block_size, position - start)
+                    position -= read_size
+                    f.seek(position)
+                    data = f.read(read_size) + data
+            complete = data.rfind(b"\n")
+            self.offset = position + complete + 1 if complete >= 0 else position
+            if complete < 0:
+                return []
+            lines = self._decode(data[:complete])
+            if position > start:
+                lines = lines[1:]
+            return lines[-self.max_lines:]
+
+    def read_new(self):
+        with self._lock:
+            found = self._stat()
+            if found is None:
+                return [], False
+            stat, identity = found
+            if identity != self._identity or stat.st_size < self.offset:
+                return self.read_tail(), True
+            if stat.st_size == self.offset:
+                return [], False
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(stat.st_size - self.offset)
+            complete = data.rfind(b"\n")
+            if complete < 0:
+                return [], False
+            self.offset += complete + 1
+            return self._decode(data[:complete])[-self.max_lines:], False
+
+    def search(self, pattern, max_results=None, end=None):
+        max_results = max_results or self.max_lines
+        regex = re.compile(pattern.encode("utf-8"), re.IGNORECASE | re.MULTILINE)
+        found = self._stat()
+        if found is None or found[0].st_size == 0:
+            return []
+        lines = deque(maxlen=max_results)
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                limit = len(view) if end is None else min(end, len(view))
+                last_start = -1
+                for match in regex.finditer(view, 0, limit):
+                    start = view.rfind(b"\n", 0, match.start()) + 1
+                    if start == last_start:
+                        continue
+                    last_start = start
+                    line_end = view.find(b"\n", match.start(), limit)
+                    if line_end < 0:
+                        line_end = limit
+                    lines.append(view[start:line_end].decode("utf-8", errors="ignore").rstrip("\r"))
+        return list(lines)
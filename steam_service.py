@@ -1,18 +1,114 @@
 import os
+import random
 import re
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 
 import requests
 
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+RATE_LIMIT_PER_SECOND = 4.0
+RATE_LIMIT_BURST = 8
+RETRY_AFTER_MAX_SECONDS = 120.0
+RATE_LIMITED_HOSTS = ("api.steampowered.com",)
+STEAM_API_BASE_URL = "https://api.steampowered.com"
+
+
+class RateLimiter:
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled_seconds = 0.0
+        self.throttle_events = 0
+        self.penalties = 0
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    if waited:
+                        self.throttled_seconds += waited
+                        self.throttle_events += 1
+                    return waited
+                else:
+                    delay = (1.0 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def penalize(self, delay):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + delay)
+            self._tokens = 0.0
+            self.penalties += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "throttled_seconds": self.throttled_seconds,
+                "throttle_events": self.throttle_events,
+                "penalties": self.penalties,
+            }
+
+
+SHARED_RATE_LIMITER = RateLimiter()
+
 
 class SteamService:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, rate_limiter=None, identity_cache=None, api_base_url=STEAM_API_BASE_URL):
         self.logger = logger
+        self.api_base_url = (api_base_url or STEAM_API_BASE_URL).rstrip("/")
+        self.identity_cache = identity_cache
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter or SHARED_RATE_LIMITER
+        self._session = None
+        self._session_lock = threading.Lock()
 
     def log(self, msg):
         if self.logger:
             self.logger(msg)
 
+    def get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Connection": "keep-alive"})
+                self._session = session
+            return self._session
+
+    def close(self):
+        with self._session_lock:
+            session = self._session
+            self._session = None
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
     def friendly_api_error(self, error=None, response=None):
         if response is None and error is not None:
             response = getattr(error, "response", None)
@@ -37,16 +133,55 @@ class SteamService:
             return "network connection failed"
         return str(error)
 
+    def api_url(self, path):
+        return f"{self.api_base_url}/{path.lstrip('/')}"
+
+    def _is_rate_limited_url(self, url):
+        return (urlparse(url).hostname or "").lower() in RATE_LIMITED_HOSTS or url.startswith(self.api_base_url + "/")
+
+    def _retry_after_seconds(self, response):
+        value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return min(float(value), RETRY_AFTER_MAX_SECONDS)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except Exception:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return min(max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds()), RETRY_AFTER_MAX_SECONDS)
+
+    def _backoff_delay(self, attempt, backoff, response=None):
+        base = backoff * (2 ** (attempt - 1))
+        delay = base / 2 + random.uniform(0, base / 2)
+        retry_after = self._retry_after_seconds(response)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def throttle_stats(self):
+        return self.rate_limiter.stats()
+
     def request_with_retry(self, method, url, operation_name="request", timeout=10, attempts=3, backoff=1.0, **kwargs):
         last_error = None
+        rate_limited = self._is_rate_limited_url(url)
 
         for attempt in range(1, attempts + 1):
+            if rate_limited:
+                self.rate_limiter.acquire()
             try:
-                response = requests.request(method=method, url=url, timeout=timeout, **kwargs)
+                response = self.get_session().request(method=method, url=url, timeout=timeout, **kwargs)
                 if response.status_code in (429,) or response.status_code >= 500:
                     if attempt < attempts:
-                        self.log(f"{operation_name} failed ({self.friendly_api_error(response=response)}). Retrying ({attempt}/{attempts})...")
-                        time.sleep(backoff * (2 ** (attempt - 1)))
+                        delay = self._backoff_delay(attempt, backoff, response=response)
+                        self.log(f"{operation_name} failed ({self.friendly_api_error(response=response)}). Retrying in {delay:.1f}s ({attempt}/{attempts})...")
+                        if response.status_code == 429 and rate_limited:
+                            self.rate_limiter.penalize(delay)
+                        else:
+                            time.sleep(delay)
                         continue
                 response.raise_for_status()
                 return response
@@ -57,8 +192,9 @@ class SteamService:
                     raise
                 if attempt >= attempts:
                     raise
-                self.log(f"{operation_name} failed ({self.friendly_api_error(e)}). Retrying ({attempt}/{attempts})...")
-                time.sleep(backoff * (2 ** (attempt - 1)))
+                delay = self._backoff_delay(attempt, backoff, response=getattr(e, "response", None))
+                self.log(f"{operation_name} failed ({self.friendly_api_error(e)}). Retrying in {delay:.1f}s ({attempt}/{attempts})...")
+                time.sleep(delay)
 
         if last_error:
             raise last_error
@@ -189,9 +325,13 @@ class SteamService:
                 return value
         return default
 
-    def resolve_vanity_to_steamid(self, vanity, api_key, retry_kwargs=None):
+    def resolve_vanity_to_steamid(self, vanity, api_key, retry_kwargs=None, use_cache=True):
+        if use_cache and self.identity_cache is not None:
+            cached = self.identity_cache.get_vanity(vanity)
+            if cached:
+                return cached
         retry_kwargs = retry_kwargs or {}
-        url = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
+        url = self.api_url("ISteamUser/ResolveVanityURL/v1/")
         response = self.request_with_retry(
             "GET",
             url,
@@ -202,17 +342,29 @@ class SteamService:
         )
         data = response.json().get("response", {})
         if data.get("success") == 1:
-            return data.get("steamid")
+            steam_id = data.get("steamid")
+            if steam_id and self.identity_cache is not None:
+                self.identity_cache.put_vanity(vanity, steam_id)
+            return steam_id
         return None
 
     def validate_api_key(self, api_key, retry_kwargs=None):
         retry_kwargs = retry_kwargs or {}
         if not (api_key or "").strip():
             return False, "missing API key"
-        steam_id = self.resolve_vanity_to_steamid("valve", api_key, retry_kwargs=retry_kwargs)
+        if self.identity_cache is not None:
+            cached = self.identity_cache.get_api_key_result(api_key)
+            if cached is not None:
+                return cached
+
+        steam_id = self.resolve_vanity_to_steamid("valve", api_key, retry_kwargs=retry_kwargs, use_cache=False)
         if steam_id:
-            return True, f"API key accepted; resolved test vanity to {steam_id}"
-        return False, "API key request completed, but the validation lookup did not resolve"
+            result = (True, f"API key accepted; resolved test vanity to {steam_id}")
+        else:
+            result = (False, "API key request completed, but the validation lookup did not resolve")
+        if self.identity_cache is not None:
+            self.identity_cache.put_api_key_result(api_key, *result)
+        return result
 
     def resolve_steam_id(self, identity_input, api_key, retry_kwargs=None):
         text = (identity_input or "").strip()
@@ -296,8 +448,8 @@ class SteamService:
         return None
 
     def begin_qr_auth_session(self, device_friendly_name, platform_type=1, timeout=10):
-        url = "https://api.steampowered.com/IAuthenticationService/BeginAuthSessionViaQR/v1/"
-        response = requests.post(
+        url = self.api_url("IAuthenticationService/BeginAuthSessionViaQR/v1/")
+        response = self.get_session().post(
             url,
             data={
                 "device_friendly_name": device_friendly_name,
@@ -309,8 +461,8 @@ class SteamService:
         return response.json().get("response", {})
 
     def poll_qr_auth_session(self, client_id, request_id=None, timeout=5):
-        url = "https://api.steampowered.com/IAuthenticationService/PollAuthSessionStatus/v1/"
-        response = requests.post(
+        url = self.api_url("IAuthenticationService/PollAuthSessionStatus/v1/")
+        response = self.get_session().post(
             url,
             data={"client_id": client_id, "request_id": request_id or client_id},
             timeout=timeout,
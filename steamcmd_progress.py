@@ -0,0 +1,159 @@
+import re
+import time
+from collections import deque
+
+PROGRESS_REPORT_INTERVAL = 0.25
+OUTPUT_TAIL_LINES = 200
+
+UNIT_BYTES = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3}
+
+PHASE_LABELS = {
+    "starting": "Starting SteamCMD",
+    "login": "Logging in",
+    "preparing": "Preparing content",
+    "uploading": "Uploading",
+    "committing": "Committing update",
+    "success": "Upload complete",
+    "failed": "Upload failed",
+}
+
+PHASE_MARKERS = (
+    ("login", ("logging in user", "waiting for user info", "connecting anonymously")),
+    ("preparing", ("preparing", "creating new workshop item", "scanning content", "building depot", "building manifest")),
+    ("uploading", ("uploading content", "uploading preview", "uploading", "update state")),
+    ("committing", ("committing", "publishing update", "finalizing")),
+)
+
+LOGIN_FAILURE_MARKERS = (
+    "invalid password",
+    "invalid login",
+    "two-factor code mismatch",
+    "account logon denied",
+    "rate limit exceeded",
+    "login failure",
+    "failed to login",
+)
+
+INPUT_PROMPT_MARKERS = (
+    "steam guard code:",
+    "two-factor code:",
+    "password:",
+)
+
+PROGRESS_COUNT_RE = re.compile(r"progress:\s*[\d.]+\s*\((\d+)\s*/\s*(\d+)\)", re.IGNORECASE)
+PROGRESS_UNITS_RE = re.compile(r"([\d.]+)\s*(b|kb|mb|gb)\s*(?:/|of)\s*([\d.]+)\s*(b|kb|mb|gb)\b", re.IGNORECASE)
+ERROR_RE = re.compile(r"^\s*error!?\s*[:!]?\s*(.+)$", re.IGNORECASE)
+FAILED_REASON_RE = re.compile(r"FAILED\s*\(([^)]+)\)", re.IGNORECASE)
+
+
+class SteamCmdProgressParser:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.phase = "starting"
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.rate_bps = 0.0
+        self.failure_reason = ""
+        self.needs_input = False
+        self.succeeded = False
+        self.tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        self.started_at = clock()
+        self._last_sample = None
+        self._last_report = None
+
+    def _set_phase(self, phase):
+        if phase == self.phase or self.phase in ("success", "failed"):
+            return False
+        order = ("starting", "login", "preparing", "uploading", "committing", "success")
+        if phase in order and self.phase in order and order.index(phase) < order.index(self.phase):
+            return False
+        self.phase = phase
+        return True
+
+    def _fail(self, reason):
+        if not self.failure_reason:
+            self.failure_reason = reason.strip().rstrip(".")
+        self.phase = "failed"
+        return True
+
+    def _record_bytes(self, done, total):
+        now = self._clock()
+        if self._last_sample is not None:
+            last_time, last_done = self._last_sample
+            elapsed = now - last_time
+            if elapsed > 0 and done >= last_done:
+                instant = (done - last_done) / elapsed
+                self.rate_bps = instant if not self.rate_bps else (0.7 * self.rate_bps + 0.3 * instant)
+        self._last_sample = (now, done)
+        self.bytes_done = done
+        self.bytes_total = max(total, done)
+        self._set_phase("uploading")
+
+    def feed(self, line):
+        text = (line or "").strip()
+        if not text:
+            return False
+        self.tail.append(text)
+        lower = text.lower()
+        changed = False
+
+        if any(marker in lower for marker in INPUT_PROMPT_MARKERS):
+            self.needs_input = True
+            return self._fail("SteamCMD is waiting for a password or Steam Guard code; use cached credentials or fill in the login fields")
+
+        reason = FAILED_REASON_RE.search(text)
+        if reason and "logging in" in lower:
+            return self._fail(f"Login failed: {reason.group(1)}")
+        if any(marker in lower for marker in LOGIN_FAILURE_MARKERS):
+            return self._fail(f"Login failed: {text}")
+
+        error = ERROR_RE.match(text)
+        if error:
+            return self._fail(error.group(1))
+
+        if lower.startswith("success") or "item updated" in lower or ("successfully" in lower and "workshop" in lower):
+            self.succeeded = True
+            changed = self._set_phase("success") or changed
+
+        match = PROGRESS_COUNT_RE.search(text)
+        if match:
+            self._record_bytes(int(match.group(1)), int(match.group(2)))
+            changed = True
+        else:
+            match = PROGRESS_UNITS_RE.search(text)
+            if match:
+                done = float(match.group(1)) * UNIT_BYTES[match.group(2).lower()]
+                total = float(match.group(3)) * UNIT_BYTES[match.group(4).lower()]
+                self._record_bytes(int(done), int(total))
+                changed = True
+
+        for phase, markers in PHASE_MARKERS:
+            if any(marker in lower for marker in markers):
+                changed = self._set_phase(phase) or changed
+                break
+        return changed
+
+    def should_report(self, changed):
+        if not changed:
+            return False
+        now = self._clock()
+        if self._last_report is None or self.phase in ("success", "failed") or now - self._last_report[0] >= PROGRESS_REPORT_INTERVAL or self._last_report[1] != self.phase:
+            self._last_report = (now, self.phase)
+            return True
+        return False
+
+    def percent(self):
+        if not self.bytes_total:
+            return None
+        return min(100.0, 100.0 * self.bytes_done / self.bytes_total)
+
+    def describe(self):
+        label = PHASE_LABELS.get(self.phase, self.phase.title())
+        if self.phase == "failed" and self.failure_reason:
+            return f"{label}: {self.failure_reason}"
+        if self.phase == "uploading" and self.bytes_total:
+            text = f"{label} {self.bytes_done / (1024 * 1024):.1f} / {self.bytes_total / (1024 * 1024):.1f} MB ({self.percent():.0f}%)"
+            if self.rate_bps:
+                text += f" at {self.rate_bps / (1024 * 1024):.2f} MB/s"
+            return text
+        return f"{label}..." if self.phase not in ("success", "failed") else label
@@ -0,0 +1,223 @@
+import os
+import subprocess
+import threading
+import time
+
+from steamcmd_progress import INPUT_PROMPT_MARKERS, SteamCmdProgressParser
+
+STEAMCMD_PROMPT = "Steam>"
+SESSION_START_TIMEOUT = 300
+SESSION_LOGIN_TIMEOUT = 120
+SESSION_BUILD_TIMEOUT = 6 * 3600
+SESSION_HEALTH_TIMEOUT = 15
+
+
+class SteamCmdSessionError(RuntimeError):
+    pass
+
+
+class SteamCmdSession:
+    def __init__(self, exe, logger=None, is_windows=False, popen=subprocess.Popen):
+        self.exe = exe
+        self.logger = logger
+        self.is_windows = is_windows
+        self._popen = popen
+        self.process = None
+        self.logged_in_user = None
+        self._buffer = ""
+        self._eof = False
+        self._cond = threading.Condition()
+        self._command_lock = threading.Lock()
+        self._reader = None
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, timeout=SESSION_START_TIMEOUT):
+        if self.is_running():
+            return ""
+        if self.process is not None:
+            self.close()
+        creation_flags = subprocess.CREATE_NO_WINDOW if self.is_windows else 0
+        process = self._popen(
+            [self.exe],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            cwd=os.path.dirname(self.exe) or None,
+            creationflags=creation_flags,
+        )
+        self.logged_in_user = None
+        with self._cond:
+            self.process = process
+            self._buffer = ""
+            self._eof = False
+        self._reader = threading.Thread(target=self._read_output, args=(process,), daemon=True)
+        self._reader.start()
+        self.log("Started persistent SteamCMD session.")
+        return self._wait_for_prompt(timeout)
+
+    def _read_output(self, process):
+        stream = process.stdout
+        while True:
+            try:
+                chunk = stream.read(4096)
+            except (OSError, ValueError):
+                chunk = b""
+            with self._cond:
+                if process is not self.process:
+                    return
+                if not chunk:
+                    self._eof = True
+                    self._cond.notify_all()
+                    return
+                self._buffer += chunk.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+                self._cond.notify_all()
+
+    def _wait_for_prompt(self, timeout, on_line=None):
+        deadline = time.monotonic() + timeout
+        lines = []
+        answered_prompt = False
+        while True:
+            ready = []
+            done = False
+            reply = False
+            with self._cond:
+                while "\n" in self._buffer:
+                    line, self._buffer = self._buffer.split("\n", 1)
+                    if line.startswith(STEAMCMD_PROMPT):
+                        line = line[len(STEAMCMD_PROMPT):]
+                    ready.append(line)
+                pending = self._buffer.strip()
+                if pending.endswith(STEAMCMD_PROMPT):
+                    self._buffer = ""
+                    tail = pending[:-len(STEAMCMD_PROMPT)].strip()
+                    if tail:
+                        ready.append(tail)
+                    done = True
+                elif not answered_prompt and any(marker in pending.lower() for marker in INPUT_PROMPT_MARKERS):
+                    answered_prompt = True
+                    ready.append(pending)
+                    self._buffer = ""
+                    reply = True
+                elif not ready:
+                    if self._eof or self.process is None:
+                        raise SteamCmdSessionError("SteamCMD session exited unexpectedly.")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SteamCmdSessionError("Timed out waiting for the SteamCMD prompt.")
+                    self._cond.wait(min(remaining, 1.0))
+            for line in ready:
+                lines.append(line)
+                if on_line is not None:
+                    on_line(line)
+            if reply:
+                self._write("")
+            if done:
+                return "\n".join(lines)
+
+    def _write(self, command):
+        try:
+            self.process.stdin.write((command + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise SteamCmdSessionError(f"SteamCMD session is not accepting commands: {e}")
+
+    def run_command(self, command, timeout, on_line=None):
+        with self._command_lock:
+            if not self.is_running():
+                raise SteamCmdSessionError("SteamCMD session is not running.")
+            self._write(command)
+            return self._wait_for_prompt(timeout, on_line=on_line)
+
+    def health_check(self, timeout=SESSION_HEALTH_TIMEOUT):
+        if not self.is_running():
+            return False
+        try:
+            self.run_command("", timeout)
+            return True
+        except SteamCmdSessionError as e:
+            self.log(f"SteamCMD session health check failed: {e}")
+            return False
+
+    @staticmethod
+    def accepts_credentials(*values):
+        return not any('"' in str(value or "") for value in values)
+
+    def _quote(self, value):
+        if '"' in str(value):
+            raise ValueError("SteamCMD console commands cannot contain double quotes; use a one-shot SteamCMD run for this login.")
+        return '"' + str(value) + '"'
+
+    def login(self, user, pwd="", use_cached=True, guard_code="", timeout=SESSION_LOGIN_TIMEOUT):
+        parts = ["login"]
+        if user:
+            parts.append(self._quote(user))
+        if not use_cached:
+            if not user:
+                raise ValueError("Username is required when cached credentials are disabled.")
+            if pwd:
+                parts.append(self._quote(pwd))
+            if guard_code:
+                parts.append(self._quote(guard_code))
+
+        parser = SteamCmdProgressParser()
+        output = self.run_command(" ".join(parts), timeout, on_line=parser.feed)
+        if parser.failure_reason:
+            self.logged_in_user = None
+            return False, parser.failure_reason, output
+        self.logged_in_user = user or ""
+        return True, "", output
+
+    def ensure_ready(self, user, pwd="", use_cached=True, guard_code="", force_login=False):
+        if self.is_running() and not self.health_check():
+            self.log("Restarting unresponsive SteamCMD session...")
+            self.close()
+        if not self.is_running():
+            self.start()
+        if force_login or self.logged_in_user != (user or ""):
+            return self.login(user, pwd=pwd, use_cached=use_cached, guard_code=guard_code)
+        return True, "", ""
+
+    def build_item(self, vdf, parser=None, on_update=None, timeout=SESSION_BUILD_TIMEOUT):
+        parser = parser or SteamCmdProgressParser()
+
+        def on_line(line):
+            changed = parser.feed(line)
+            if on_update is not None and parser.should_report(changed):
+                on_update(parser)
+
+        output = self.run_command(f"workshop_build_item {self._quote(os.path.abspath(vdf))}", timeout, on_line=on_line)
+        if parser.succeeded and not parser.failure_reason:
+            return True, "", output
+        return False, parser.failure_reason or "SteamCMD did not report a successful build.", output
+
+    def close(self, timeout=10):
+        with self._cond:
+            process = self.process
+            self.process = None
+            self._cond.notify_all()
+        self.logged_in_user = None
+        reader = self._reader
+        self._reader = None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                process.stdin.write(b"quit\n")
+                process.stdin.flush()
+                process.wait(timeout=timeout)
+            except Exception:
+                process.kill()
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout)
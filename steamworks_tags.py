@@ -1,5 +1,6 @@
 import ctypes
 import os
+import threading
 import time
 
 
@@ -28,6 +29,7 @@ class SteamworksTagUpdater:
 
     def __init__(self, logger=None):
         self.logger = logger
+        self._lock = threading.Lock()
 
     def log(self, msg):
         if self.logger:
@@ -110,6 +112,18 @@ class SteamworksTagUpdater:
         ]
         dll.SteamAPI_ISteamUGC_SetItemTags.restype = ctypes.c_bool
 
+        for setter in ("SetItemTitle", "SetItemDescription", "SetItemPreview"):
+            export = getattr(dll, f"SteamAPI_ISteamUGC_{setter}")
+            export.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_char_p]
+            export.restype = ctypes.c_bool
+
+        dll.SteamAPI_ISteamUGC_SetItemVisibility.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_uint64,
+            ctypes.c_int,
+        ]
+        dll.SteamAPI_ISteamUGC_SetItemVisibility.restype = ctypes.c_bool
+
         dll.SteamAPI_ISteamUGC_SubmitItemUpdate.argtypes = [
             ctypes.c_void_p,
             ctypes.c_uint64,
@@ -189,7 +203,7 @@ class SteamworksTagUpdater:
                 }
             time.sleep(0.1)
 
-        raise TimeoutError("Timed out waiting for Steamworks tag update to complete.")
+        raise TimeoutError("Timed out waiting for Steamworks item update to complete.")
 
     def try_update_tags(
         self,
@@ -202,75 +216,119 @@ class SteamworksTagUpdater:
         timeout_seconds=20.0,
         create_appid_file=False,
     ):
-        if os.name != "nt":
-            raise RuntimeError("Steamworks tag update is only supported on Windows.")
-
         clean_tags = [tag.strip() for tag in tags if str(tag).strip()]
         if not clean_tags:
             raise ValueError("No tags were provided.")
+        return self.try_update_item(
+            appid=appid,
+            publishedfileid=publishedfileid,
+            tags=clean_tags,
+            change_note=change_note,
+            dll_path=dll_path,
+            base_dir=base_dir,
+            timeout_seconds=timeout_seconds,
+            create_appid_file=create_appid_file,
+        )
+
+    def _apply_item_fields(self, dll, ugc, update_handle, title, description, visibility, preview_path, tags):
+        text_fields = (
+            ("SetItemTitle", title),
+            ("SetItemDescription", description),
+            ("SetItemPreview", os.path.abspath(preview_path) if preview_path else None),
+        )
+        for setter, value in text_fields:
+            if value is None:
+                continue
+            if not getattr(dll, f"SteamAPI_ISteamUGC_{setter}")(ugc, update_handle, value.encode("utf-8")):
+                raise RuntimeError(f"Steamworks {setter} returned failure.")
 
-        target_dll = dll_path or self.find_steam_api_path(base_dir=base_dir)
-        if not target_dll:
-            raise FileNotFoundError("steam_api.dll was not found in known Battlezone locations.")
-
-        created_appid_path = None
-        if create_appid_file:
-            created_appid_path = self._ensure_appid_file(base_dir, appid)
-            if created_appid_path:
-                self.log(f"Created temporary steam_appid.txt for native Steamworks tags: {created_appid_path}")
+        if visibility is not None:
+            if not dll.SteamAPI_ISteamUGC_SetItemVisibility(ugc, update_handle, int(visibility)):
+                raise RuntimeError("Steamworks SetItemVisibility returned failure.")
 
-        self.log(f"Attempting Steamworks tag update via {target_dll}")
-        dll = self._load_dll(target_dll)
-        try:
-            if not dll.SteamAPI_Init():
-                raise RuntimeError("SteamAPI_Init failed. Make sure Steam is running and the game AppID is available.")
+        if tags is not None:
+            encoded_tags = [tag.encode("utf-8") for tag in tags]
+            tag_array = (ctypes.c_char_p * len(encoded_tags))(*encoded_tags)
+            steam_tags = SteamParamStringArray(strings=tag_array, num_strings=len(encoded_tags))
+            if not dll.SteamAPI_ISteamUGC_SetItemTags(ugc, update_handle, ctypes.byref(steam_tags)):
+                raise RuntimeError("Steamworks SetItemTags returned failure.")
 
-            h_user = dll.SteamAPI_GetHSteamUser()
-            h_pipe = dll.SteamAPI_GetHSteamPipe()
-            client = dll.SteamClient()
-            if not client or not h_user or not h_pipe:
-                raise RuntimeError("Steamworks client handles were not available after SteamAPI_Init.")
+    def try_update_item(
+        self,
+        appid,
+        publishedfileid,
+        title=None,
+        description=None,
+        visibility=None,
+        preview_path=None,
+        tags=None,
+        change_note="",
+        dll_path=None,
+        base_dir=None,
+        timeout_seconds=20.0,
+        create_appid_file=False,
+    ):
+        with self._lock:
+            if os.name != "nt":
+                raise RuntimeError("Steamworks item updates are only supported on Windows.")
+
+            target_dll = dll_path or self.find_steam_api_path(base_dir=base_dir)
+            if not target_dll:
+                raise FileNotFoundError("steam_api.dll was not found in known Battlezone locations.")
+
+            created_appid_path = None
+            if create_appid_file:
+                created_appid_path = self._ensure_appid_file(base_dir, appid)
+                if created_appid_path:
+                    self.log(f"Created temporary steam_appid.txt for native Steamworks update: {created_appid_path}")
+
+            self.log(f"Attempting Steamworks item update via {target_dll}")
+            dll = self._load_dll(target_dll)
+            try:
+                if not dll.SteamAPI_Init():
+                    raise RuntimeError("SteamAPI_Init failed. Make sure Steam is running and the game AppID is available.")
 
-            ugc, ugc_version = self._get_ugc_interface(dll, client, h_user, h_pipe)
-            if not ugc:
-                raise RuntimeError("Failed to acquire ISteamUGC interface.")
+                h_user = dll.SteamAPI_GetHSteamUser()
+                h_pipe = dll.SteamAPI_GetHSteamPipe()
+                client = dll.SteamClient()
+                if not client or not h_user or not h_pipe:
+                    raise RuntimeError("Steamworks client handles were not available after SteamAPI_Init.")
 
-            steam_utils = dll.SteamAPI_ISteamClient_GetISteamUtils(client, h_pipe, self.STEAM_UTILS_VERSION)
-            if not steam_utils:
-                raise RuntimeError("Failed to acquire ISteamUtils interface.")
+                ugc, ugc_version = self._get_ugc_interface(dll, client, h_user, h_pipe)
+                if not ugc:
+                    raise RuntimeError("Failed to acquire ISteamUGC interface.")
 
-            update_handle = dll.SteamAPI_ISteamUGC_StartItemUpdate(ugc, int(appid), int(publishedfileid))
-            if not update_handle:
-                raise RuntimeError("Steamworks StartItemUpdate returned an invalid handle.")
+                steam_utils = dll.SteamAPI_ISteamClient_GetISteamUtils(client, h_pipe, self.STEAM_UTILS_VERSION)
+                if not steam_utils:
+                    raise RuntimeError("Failed to acquire ISteamUtils interface.")
 
-            encoded_tags = [tag.encode("utf-8") for tag in clean_tags]
-            tag_array = (ctypes.c_char_p * len(encoded_tags))(*encoded_tags)
-            steam_tags = SteamParamStringArray(strings=tag_array, num_strings=len(encoded_tags))
+                update_handle = dll.SteamAPI_ISteamUGC_StartItemUpdate(ugc, int(appid), int(publishedfileid))
+                if not update_handle:
+                    raise RuntimeError("Steamworks StartItemUpdate returned an invalid handle.")
 
-            if not dll.SteamAPI_ISteamUGC_SetItemTags(ugc, update_handle, ctypes.byref(steam_tags)):
-                raise RuntimeError("Steamworks SetItemTags returned failure.")
+                self._apply_item_fields(dll, ugc, update_handle, title, description, visibility, preview_path, tags)
 
-            submit_call = dll.SteamAPI_ISteamUGC_SubmitItemUpdate(
-                ugc,
-                update_handle,
-                (change_note or "").encode("utf-8"),
-            )
-            if not submit_call:
-                raise RuntimeError("Steamworks SubmitItemUpdate returned an invalid API call handle.")
-
-            result = self._wait_for_submit_result(dll, steam_utils, submit_call, timeout_seconds=timeout_seconds)
-            result["method"] = "steamworks"
-            result["ugc_version"] = ugc_version
-            result["dll_path"] = target_dll
-            return result
-        finally:
-            try:
-                dll.SteamAPI_Shutdown()
-            except Exception:
-                pass
-            if created_appid_path and os.path.exists(created_appid_path):
+                submit_call = dll.SteamAPI_ISteamUGC_SubmitItemUpdate(
+                    ugc,
+                    update_handle,
+                    (change_note or "").encode("utf-8"),
+                )
+                if not submit_call:
+                    raise RuntimeError("Steamworks SubmitItemUpdate returned an invalid API call handle.")
+
+                result = self._wait_for_submit_result(dll, steam_utils, submit_call, timeout_seconds=timeout_seconds)
+                result["method"] = "steamworks"
+                result["ugc_version"] = ugc_version
+                result["dll_path"] = target_dll
+                return result
+            finally:
                 try:
-                    os.remove(created_appid_path)
-                    self.log("Removed temporary steam_appid.txt after native Steamworks tag attempt.")
+                    dll.SteamAPI_Shutdown()
                 except Exception:
                     pass
+                if created_appid_path and os.path.exists(created_appid_path):
+                    try:
+                        os.remove(created_appid_path)
+                        self.log("Removed temporary steam_appid.txt after native Steamworks update attempt.")
+                    except Exception:
+                        pass
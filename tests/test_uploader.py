@@ -7,6 +7,8 @@ import shutil
 import io
 import zipfile
 import json
+import threading
+import re
 
 # Mock out GUI and network libraries that might fail in a headless test environment
 sys.modules['tkinter'] = MagicMock()
@@ -28,6 +30,20 @@ from memory_analyzer import MemoryAnalyzer
 from project_store import ProjectStore
 from upload_preflight import UploadPreflight
 from steamworks_tags import SteamworksTagUpdater
+from inventory_diff import ContentHasher, InventoryDiffEngine
+from steam_service import RateLimiter, SteamService
+from library_cache import WorkshopLibraryCache
+from preview_cache import PreviewCache
+from identity_cache import IdentityCache
+from async_client import AsyncWorkshopClient, WorkshopBatchClient
+from mock_steam_server import MOCK_STEAM_ID, MockSteamServer
+from workshop_backend import WorkshopBackend
+from steamcmd_progress import SteamCmdProgressParser
+from steamcmd_session import SteamCmdSession
+from publish_queue import BatchProgressTracker, PublishQueue
+from upload_staging import UploadStager
+from upload_history import UploadHistory
+from steam_log_reader import LogTail, SteamLogReader
 
 class DummyVar:
     def __init__(self, value=""):
@@ -247,6 +263,87 @@ class TestWorkshopUploader(unittest.TestCase):
             "+workshop_build_item", "upload.vdf", "+quit"
         ])
 
+    def test_steamcmd_progress_parser_tracks_phases_throughput_and_errors(self):
+        clock = [0.0]
+        parser = SteamCmdProgressParser(clock=lambda: clock[0])
+        for line in ("Logging in user 'tester' to Steam Public...OK", "Preparing update..."):
+            parser.feed(line)
+        self.assertEqual(parser.phase, "preparing")
+
+        parser.feed("Uploading content: 0 MB of 10 MB")
+        clock[0] = 2.0
+        parser.feed("Uploading content: 4 MB of 10 MB")
+        self.assertEqual((parser.phase, parser.percent()), ("uploading", 40.0))
+        self.assertEqual(parser.describe(), "Uploading 4.0 / 10.0 MB (40%) at 2.00 MB/s")
+
+        parser.feed("ERROR! Failed to update workshop item (Access Denied).")
+        self.assertEqual(parser.phase, "failed")
+        self.assertEqual(parser.failure_reason, "Failed to update workshop item (Access Denied)")
+
+        prompt = SteamCmdProgressParser()
+        prompt.feed("Steam Guard code:")
+        self.assertTrue(prompt.needs_input)
+
+    def test_workshop_backend_streams_steamcmd_output_to_parser(self):
+        process = MagicMock()
+        process.stdout.readline.side_effect = ["Logging in user 'tester'...OK\n", "Committing update...\n", "Success.\n", ""]
+        process.wait.return_value = 0
+        updates = []
+
+        returncode = self.uploader.workshop_backend.stream_steamcmd_output(process, SteamCmdProgressParser(), on_update=lambda p: updates.append(p.phase))
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(updates, ["login", "committing", "success"])
+
+    @unittest.skipIf(os.name == "nt", "uses a shebang script as a stand-in for steamcmd")
+    def test_steamcmd_session_logs_in_once_and_restarts_after_exit(self):
+        fake_exe = os.path.join(self.test_dir, "steamcmd")
+        with open(fake_exe, "w", encoding="utf-8") as f:
+            f.write(
+                f"#!{sys.executable}\n"
+                "import sys\n"
+                "out = sys.stdout\n"
+                "out.write('Loading Steam API...OK\\n\\nSteam>'); out.flush()\n"
+                "for line in sys.stdin:\n"
+                "    cmd = line.strip()\n"
+                "    if cmd.startswith('login'):\n"
+                "        out.write('Logging in user ' + cmd.split()[1] + ' to Steam Public...OK\\nWaiting for user info...OK\\n')\n"
+                "    elif cmd.startswith('workshop_build_item') and 'silent' in cmd:\n"
+                "        out.write('Preparing update...\\n')\n"
+                "    elif cmd.startswith('workshop_build_item'):\n"
+                "        out.write('Preparing update...\\nUploading content: 5 MB of 5 MB\\nCommitting update...\\nSuccess.\\n')\n"
+                "    elif cmd == 'quit':\n"
+                "        break\n"
+                "    out.write('\\nSteam>'); out.flush()\n"
+            )
+        os.chmod(fake_exe, 0o755)
+        vdf = os.path.join(self.test_dir, "upload.vdf")
+
+        session = SteamCmdSession(fake_exe)
+        try:
+            self.assertTrue(session.ensure_ready("tester")[0])
+            self.assertEqual(session.build_item(vdf)[:2], (True, ""))
+            self.assertFalse(session.build_item(os.path.join(self.test_dir, "silent.vdf"))[0])
+            with patch.object(session, "login", wraps=session.login) as login_spy:
+                self.assertTrue(session.ensure_ready("tester")[0])
+                login_spy.assert_not_called()
+
+            held = []
+            session.build_item(vdf, on_update=lambda _parser: held.append(session._cond._is_owned()))
+            self.assertTrue(held)
+            self.assertFalse(any(held))
+            with self.assertRaises(ValueError):
+                session.login("tester", pwd='pa"ss', use_cached=False)
+            self.assertFalse(SteamCmdSession.accepts_credentials("tester", 'pa"ss'))
+
+            session.process.kill()
+            session.process.wait()
+            self.assertTrue(session.ensure_ready("tester")[0])
+            self.assertTrue(session.build_item(vdf)[0])
+        finally:
+            session.close()
+        self.assertIsNone(session.process)
+
     def test_workshop_backend_requires_username_without_cached_creds(self):
         with self.assertRaises(ValueError):
             self.uploader.workshop_backend.build_steamcmd_command(
@@ -295,7 +392,7 @@ class TestWorkshopUploader(unittest.TestCase):
         )
 
         self.assertEqual(steam_id, "76561198000000001")
-        self.assertEqual([item["publishedfileid"] for item in items], ["111", "222"])
+        self.assertEqual([item["publishedfileid"] for item in items], ["222", "111"])
         self.assertEqual(meta["pages"], 2)
         self.assertEqual(meta["total"], 2)
         calls = self.uploader.workshop_backend.steam_service.request_with_retry.call_args_list
@@ -305,6 +402,40 @@ class TestWorkshopUploader(unittest.TestCase):
         self.assertEqual(second_payload["cursor"], "page-2")
         self.assertEqual(first_payload["query_type"], 1)
 
+    def test_workshop_backend_incremental_sync_stops_at_known_item(self):
+        page = MagicMock()
+        page.json.return_value = {
+            "response": {
+                "total": 3,
+                "next_cursor": "page-2",
+                "publishedfiledetails": [
+                    {"publishedfileid": "333", "title": "New", "visibility": 0, "time_updated": 1700000300},
+                    {"publishedfileid": "111", "title": "Edited", "visibility": 0, "time_updated": 1700000200},
+                    {"publishedfileid": "222", "title": "Old", "visibility": 0, "time_updated": 1700000100},
+                ],
+            }
+        }
+        self.uploader.workshop_backend.steam_service.request_with_retry = MagicMock(return_value=page)
+        known = [
+            {"publishedfileid": "111", "title": "Original", "time_updated": 1700000000},
+            {"publishedfileid": "222", "title": "Old", "time_updated": 1700000100},
+        ]
+
+        _steam_id, items, meta = self.uploader.workshop_backend.query_workshop_items(
+            api_key="key",
+            identity_input="76561198000000001",
+            appid="301650",
+            resolve_steam_id=lambda identity, _key: identity,
+            known_items=known,
+        )
+
+        self.uploader.workshop_backend.steam_service.request_with_retry.assert_called_once()
+        payload = json.loads(self.uploader.workshop_backend.steam_service.request_with_retry.call_args.kwargs["params"]["input_json"])
+        self.assertEqual(payload["query_type"], 21)
+        self.assertTrue(meta["incremental"])
+        self.assertEqual(meta["changed"], 2)
+        self.assertEqual([(item["publishedfileid"], item["title"]) for item in items], [("333", "New"), ("111", "Edited"), ("222", "Old")])
+
     def test_workshop_backend_fetches_details_from_remote_storage_endpoint(self):
         response = MagicMock()
         response.json.return_value = {"response": {"publishedfiledetails": [{"publishedfileid": "123"}]}}
@@ -316,6 +447,239 @@ class TestWorkshopUploader(unittest.TestCase):
         args = self.uploader.workshop_backend.steam_service.request_with_retry.call_args.args
         self.assertIn("ISteamRemoteStorage/GetPublishedFileDetails", args[1])
 
+    def test_workshop_backend_batches_details_and_serves_cache_hits(self):
+        response = MagicMock()
+        response.json.return_value = {"response": {"publishedfiledetails": [
+            {"publishedfileid": "1", "result": 1, "title": "One", "time_updated": 10, "file_size": "1048576"},
+            {"publishedfileid": "2", "result": 1, "title": "Two", "time_updated": 20},
+            {"publishedfileid": "3", "result": 9},
+        ]}}
+        backend = self.uploader.workshop_backend
+        backend.steam_service.request_with_retry = MagicMock(return_value=response)
+
+        details = backend.fetch_workshop_items_details("key", ["1", "2", "3"])
+        single = backend.fetch_workshop_item_details("key", "2")
+
+        backend.steam_service.request_with_retry.assert_called_once()
+        data = backend.steam_service.request_with_retry.call_args.kwargs["data"]
+        self.assertEqual(data["itemcount"], 3)
+        self.assertEqual(data["publishedfileids[2]"], "3")
+        self.assertEqual(sorted(details), ["1", "2"])
+        self.assertEqual(single["title"], "Two")
+
+    def test_workshop_backend_prefetch_merges_inflight_requests(self):
+        backend = self.uploader.workshop_backend
+        release = threading.Event()
+
+        def slow_details(_api_key, item_id):
+            release.wait(2)
+            return {"publishedfileid": item_id, "preview_url": "https://example.invalid/p.jpg"}
+
+        backend.fetch_workshop_item_details = MagicMock(side_effect=slow_details)
+        backend.download_preview_file = MagicMock(return_value="cached.img")
+
+        first = backend.prefetch_item("key", "55")
+        second = backend.prefetch_item("key", 55)
+        release.set()
+
+        self.assertIs(first, second)
+        self.assertEqual(first.result(timeout=2), ({"publishedfileid": "55", "preview_url": "https://example.invalid/p.jpg"}, "cached.img"))
+        self.assertEqual(backend.prefetch_item("key", "55").result(timeout=2)[1], "cached.img")
+        backend.fetch_workshop_item_details.assert_called_once()
+        backend.download_preview_file.assert_called_once()
+        backend.close()
+
+    def test_preview_cache_revalidates_and_evicts_least_recent(self):
+        cache = PreviewCache(os.path.join(self.test_dir, "previews"), AppFileManager(), max_bytes=10)
+
+        def make_response(status, body=b"", etag=""):
+            response = MagicMock()
+            response.status_code = status
+            response.ok = status < 400
+            response.headers = {"ETag": etag} if etag else {}
+            response.iter_content.return_value = [body[:3], body[3:]]
+            return response
+
+        service = MagicMock()
+        service.request_with_retry.side_effect = [
+            make_response(200, b"abcdef", etag='"v1"'),
+            make_response(304),
+            make_response(200, b"ghijkl", etag='"v2"'),
+            make_response(200, b"oversized-preview"),
+        ]
+
+        first = cache.fetch("https://example.invalid/a.jpg", service)
+        again = cache.fetch("https://example.invalid/a.jpg", service)
+        os.utime(first, (1, 1))
+        second = cache.fetch("https://example.invalid/b.jpg", service)
+
+        self.assertEqual(first, again)
+        self.assertEqual(service.request_with_retry.call_args_list[1].kwargs["headers"], {"If-None-Match": '"v1"'})
+        with open(second, "rb") as f:
+            self.assertEqual(f.read(), b"ghijkl")
+        self.assertFalse(os.path.exists(first))
+        self.assertEqual(cache.lookup("https://example.invalid/a.jpg"), "")
+
+        oversized = cache.fetch("https://example.invalid/big.jpg", service)
+        self.addCleanup(lambda: os.path.exists(oversized) and os.remove(oversized))
+        with open(oversized, "rb") as f:
+            self.assertEqual(f.read(), b"oversized-preview")
+        self.assertEqual(cache.lookup("https://example.invalid/big.jpg"), "")
+        self.assertTrue(os.path.exists(second))
+
+    def test_steam_service_reuses_one_pooled_session(self):
+        service = SteamService()
+        session = MagicMock()
+        session.request.return_value.status_code = 200
+        session.post.return_value.json.return_value = {"response": {"client_id": "1"}}
+
+        with patch("steam_service.requests.Session", return_value=session) as session_factory:
+            service.request_with_retry("GET", "https://api.steampowered.com/a", attempts=1)
+            service.request_with_retry("GET", "https://api.steampowered.com/b", attempts=1)
+            service.begin_qr_auth_session("device")
+            service.close()
+
+        session_factory.assert_called_once()
+        self.assertEqual(session.request.call_count, 2)
+        session.post.assert_called_once()
+        session.close.assert_called_once()
+        self.assertIsNone(service._session)
+
+    def test_steam_service_honors_retry_after_through_shared_limiter(self):
+        clock = [100.0]
+        sleeps = []
+
+        def fake_sleep(delay):
+            sleeps.append(delay)
+            clock[0] += delay
+
+        limiter = RateLimiter(rate=1.0, burst=2, clock=lambda: clock[0], sleep=fake_sleep)
+        service = SteamService(rate_limiter=limiter)
+        limited = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        ok = MagicMock(status_code=200, headers={})
+        session = MagicMock()
+        session.request.side_effect = [limited, ok]
+        service._session = session
+
+        with patch("steam_service.time.sleep") as local_sleep:
+            response = service.request_with_retry("GET", "https://api.steampowered.com/x", attempts=2, backoff=0.1)
+
+        self.assertIs(response, ok)
+        local_sleep.assert_not_called()
+        self.assertEqual(sleeps, [7.0])
+        self.assertEqual(service.throttle_stats(), {"throttled_seconds": 7.0, "throttle_events": 1, "penalties": 1})
+
+    def test_identity_cache_skips_repeat_vanity_and_key_lookups(self):
+        cache_path = os.path.join(self.test_dir, "cache", "identity.json")
+        service = SteamService(identity_cache=IdentityCache(cache_path, AppFileManager()))
+        response = MagicMock()
+        response.json.return_value = {"response": {"success": 1, "steamid": "76561198000000009"}}
+        service.request_with_retry = MagicMock(return_value=response)
+
+        self.assertEqual(service.resolve_steam_id("https://steamcommunity.com/id/Grizzly/", "key"), "76561198000000009")
+        ok, detail = service.validate_api_key("key")
+        self.assertEqual(service.request_with_retry.call_count, 2)
+
+        reloaded = SteamService(identity_cache=IdentityCache(cache_path, AppFileManager()))
+        reloaded.request_with_retry = MagicMock()
+        self.assertEqual(reloaded.resolve_vanity_to_steamid("grizzly", "key"), "76561198000000009")
+        self.assertEqual(reloaded.validate_api_key("key"), (ok, f"{detail} (cached)"))
+        reloaded.request_with_retry.assert_not_called()
+        with open(cache_path, "r", encoding="utf-8") as f:
+            self.assertNotIn('"key"', f.read())
+
+    def test_batch_client_runs_item_operations_concurrently(self):
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+        both_started = threading.Barrier(2, timeout=2)
+
+        calls = {}
+
+        def update_tags(_api_key, item_id, _appid, _tags, change_note="", **native):
+            calls[item_id] = (change_note, native.get("steamworks_updater"))
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            both_started.wait()
+            with lock:
+                active[0] -= 1
+            if item_id == "bad":
+                raise RuntimeError("denied")
+            return {"method": "web_api"}
+
+        backend = MagicMock()
+        backend.update_workshop_tags.side_effect = update_tags
+        client = WorkshopBatchClient(AsyncWorkshopClient(backend, max_concurrency=2))
+
+        updater = MagicMock()
+        results = client.update_tags("key", "301650", {"1": ["Mod"], "bad": ["Map"]}, change_notes={"1": "v2"}, steamworks_updater=updater)
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(calls, {"1": ("v2", updater), "bad": ("", updater)})
+        self.assertEqual(results["1"], {"method": "web_api"})
+        self.assertIsInstance(results["bad"], RuntimeError)
+
+    def test_mock_steam_server_drives_paging_retries_and_incremental_sync(self):
+        mocked_requests = sys.modules.pop("requests")
+        try:
+            import requests as real_requests
+        except ImportError:
+            real_requests = None
+        finally:
+            sys.modules["requests"] = mocked_requests
+        if real_requests is None:
+            self.skipTest("requests is not installed")
+
+        with MockSteamServer(item_count=250) as server, patch("steam_service.requests", real_requests):
+            service = SteamService(api_base_url=server.base_url, rate_limiter=RateLimiter(rate=1000.0, burst=1000))
+            backend = WorkshopBackend(service)
+            server.state.fail_next(429, retry_after=0)
+
+            _steam_id, items, meta = backend.query_workshop_items("key", MOCK_STEAM_ID, "301650", lambda identity, _key: identity)
+            server.state.touch_item(items[5]["publishedfileid"], title="Renamed")
+            _steam_id, synced, sync_meta = backend.query_workshop_items("key", MOCK_STEAM_ID, "301650", lambda identity, _key: identity, known_items=items)
+            backend.update_workshop_metadata("key", items[7]["publishedfileid"], "301650", "New Title", "New description", "2")
+            service.close()
+
+        self.assertEqual((len(items), meta["pages"]), (250, 3))
+        self.assertEqual((sync_meta["pages"], sync_meta["changed"]), (1, 1))
+        self.assertEqual(synced[0]["title"], "Renamed")
+        self.assertEqual(len(synced), 250)
+        self.assertEqual(server.state.requests["/IPublishedFileService/QueryFiles/v1/"], 5)
+        updated = server.state.items[items[7]["publishedfileid"]]
+        self.assertEqual((updated["title"], updated["description"], updated["visibility"]), ("New Title", "New description", 2))
+
+    def test_library_cache_round_trip_and_ttl(self):
+        cache = WorkshopLibraryCache(os.path.join(self.test_dir, "cache"), AppFileManager(), ttl_seconds=60)
+        items = [{"title": "Mod", "publishedfileid": "1", "visibility_label": "Public", "updated_label": "today"}]
+
+        cache.save("76561198000000001", "301650", items, {"pages": 1}, fetched_at=1000)
+        entry = cache.load("76561198000000001", "301650")
+
+        self.assertEqual(entry["items"], items)
+        self.assertIsNone(cache.load("76561198000000001", "999"))
+        self.assertTrue(cache.is_fresh(entry, now=1030))
+        self.assertFalse(cache.is_fresh(entry, now=1090))
+        self.assertEqual(cache.describe_age(entry, now=1000 + 7200), "2 h ago")
+
+    def test_refresh_worker_falls_back_to_cached_library(self):
+        self.uploader.library_cache = WorkshopLibraryCache(os.path.join(self.test_dir, "cache"), AppFileManager())
+        self.uploader.game_var = DummyVar("BZ98R")
+        appid = self.uploader.games["BZ98R"]["appid"]
+        items = [{"title": "Cached Mod", "publishedfileid": "42", "visibility_label": "Public", "updated_label": "today"}]
+        self.uploader.library_cache.save("76561198000000001", appid, items)
+        self.uploader.workshop_backend.query_workshop_items = MagicMock(side_effect=RuntimeError("429 Too Many Requests"))
+        self.uploader.library_status_var = DummyVar("")
+        self.uploader.tree = MagicMock()
+        self.uploader.tree.get_children.return_value = []
+        self.uploader.root.after = lambda _delay, fn: fn()
+
+        self.uploader._refresh_worker("76561198000000001")
+
+        self.assertIn("cached library", self.uploader.library_status_var.get())
+        self.uploader.tree.insert.assert_called_once_with("", "end", values=("Cached Mod", "42", "Public", "today", "", ""))
+
     def test_workshop_backend_builds_login_test_command(self):
         cmd = self.uploader.workshop_backend.build_steamcmd_login_test_command(
             exe="steamcmd.exe",
@@ -392,16 +756,27 @@ class TestWorkshopUploader(unittest.TestCase):
         original_cwd = os.getcwd()
         try:
             os.chdir(other_cwd)
-            self.uploader.steamcmd_path.set("C:\\steamcmd\\steamcmd.exe")
-            self.uploader.game_var.set("BZ98R")
-            self.uploader.username_var.set("tester")
-            self.uploader.manage_identity_var.set("76561198000000001")
-            self.uploader.use_cached_creds_var.set(True)
+            self.uploader.steamcmd_path = DummyVar("C:\\steamcmd\\steamcmd.exe")
+            self.uploader.game_var = DummyVar("BZ98R")
+            self.uploader.username_var = DummyVar("tester")
+            self.uploader.manage_identity_var = DummyVar("76561198000000001")
+            self.uploader.use_cached_creds_var = DummyVar(True)
+            self.uploader.experimental_native_appid_var = DummyVar(False)
+            self.uploader.content_hash_diff_var = DummyVar(False)
+            self.uploader.stream_steamcmd_var = DummyVar(False)
+            self.uploader.persistent_steamcmd_var = DummyVar(False)
+            self.uploader.prewarm_steamcmd_var = DummyVar(False)
+            self.uploader.metadata_only_var = DummyVar(True)
+            self.uploader.stage_upload_var = DummyVar(False)
+            self.uploader.stage_prune_orphans_var = DummyVar(False)
+            self.uploader.api_key_var = DummyVar("")
             self.uploader.save_config()
         finally:
             os.chdir(original_cwd)
 
         self.assertTrue(os.path.exists(self.uploader.config_path))
+        with open(self.uploader.config_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["username"], "tester")
         self.assertFalse(os.path.exists(os.path.join(other_cwd, "uploader_config.json")))
 
     def test_load_config_uses_legacy_cwd_fallback(self):
@@ -436,6 +811,54 @@ class TestWorkshopUploader(unittest.TestCase):
 
         self.assertEqual(loaded, payload)
 
+    def test_app_file_manager_skips_unchanged_profile_writes(self):
+        manager = AppFileManager()
+        profile_path = os.path.join(self.test_dir, "profiles", "sample.json")
+        payload = {"title": "Sample", "last_opened": "2024-01-01"}
+
+        self.assertTrue(manager.save_profile(profile_path, payload))
+        self.assertFalse(manager.save_profile(profile_path, dict(payload)))
+        self.assertTrue(manager.save_profile(profile_path, dict(payload, last_opened="2024-01-02")))
+        self.assertTrue(manager.save_profile(profile_path, dict(payload, title="Changed")))
+
+        self.assertEqual(manager.load_profile(profile_path)["title"], "Changed")
+        self.assertEqual(os.listdir(os.path.dirname(profile_path)), ["sample.json"])
+
+    def test_app_file_manager_coalesces_deferred_profile_writes(self):
+        manager = AppFileManager()
+        profile_path = os.path.join(self.test_dir, "profiles", "sample.json")
+
+        with patch("app_file_manager.threading.Timer") as timer_mock:
+            manager.save_profile(profile_path, {"title": "One"}, defer=True)
+            manager.save_profile(profile_path, {"title": "Two"}, defer=True)
+            timer_mock.assert_called_once()
+
+        self.assertFalse(os.path.exists(profile_path))
+        self.assertEqual(manager.load_profile(profile_path)["title"], "Two")
+        self.assertEqual(manager.flush_pending_writes(), 1)
+        with open(profile_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["title"], "Two")
+
+    def test_project_store_persists_last_opened_changes_and_writes_outside_lock(self):
+        manager = AppFileManager()
+        store = ProjectStore(os.path.join(self.test_dir, "profiles"), manager)
+        project = {"mod_path": os.path.join(self.test_dir, "mods", "sample_mod"), "title": "Sample", "last_opened": "2024-01-01T00:00:00+00:00"}
+        held = []
+        real_write = manager._atomic_write_text
+
+        def write(path, text):
+            held.append(manager._write_lock._is_owned())
+            real_write(path, text)
+
+        with patch.object(manager, "_atomic_write_text", side_effect=write):
+            profile_path = store.save_project(project)
+            store.save_project(project)
+            self.assertEqual(held, [False])
+            store.save_project(dict(project, last_opened="2024-02-01T00:00:00+00:00"))
+            self.assertEqual(held, [False, False])
+
+        self.assertEqual(manager.load_profile(profile_path)["last_opened"], "2024-02-01T00:00:00+00:00")
+
     def test_project_store_round_trip_by_mod_path(self):
         manager = AppFileManager()
         store = ProjectStore(os.path.join(self.test_dir, "profiles"), manager)
@@ -454,6 +877,43 @@ class TestWorkshopUploader(unittest.TestCase):
         self.assertEqual(loaded["title"], "Sample Mod")
         self.assertEqual(loaded["item_id"], "123")
 
+    def test_project_store_moves_publish_snapshot_to_sidecar(self):
+        manager = AppFileManager()
+        store = ProjectStore(os.path.join(self.test_dir, "profiles"), manager)
+        mod_path = os.path.join(self.test_dir, "mods", "sample_mod")
+        snapshot = {"a.odf": {"size": 10, "mtime_ns": 1}, "b.dds": {"size": 20, "mtime_ns": 2, "hash": "abc123"}}
+
+        saved_path = store.save_project({
+            "mod_path": mod_path,
+            "title": "Sample Mod",
+            "last_upload_signature": "abc",
+            "last_upload_inventory": snapshot,
+        })
+
+        with open(saved_path, "r", encoding="utf-8") as f:
+            self.assertNotIn("last_upload_inventory", json.load(f))
+        self.assertTrue(os.path.exists(store._snapshot_path_for_profile(saved_path)))
+        self.assertEqual(store.load_upload_snapshot(saved_path), snapshot)
+        self.assertEqual(len(store.list_projects()), 1)
+
+    def test_project_store_migrates_inline_snapshot_on_load(self):
+        manager = AppFileManager()
+        store = ProjectStore(os.path.join(self.test_dir, "profiles"), manager)
+        profile_path = os.path.join(self.test_dir, "profiles", "legacy.json")
+        snapshot = {"a.odf": {"size": 10, "mtime_ns": 1}}
+        manager.save_profile(profile_path, {"mod_path": "C:\\mods\\legacy", "last_upload_inventory": snapshot})
+
+        loaded = store.load_project(profile_path)
+
+        self.assertNotIn("last_upload_inventory", loaded)
+        self.assertEqual(store.load_upload_snapshot(profile_path), snapshot)
+        with open(profile_path, "r", encoding="utf-8") as f:
+            self.assertNotIn("last_upload_inventory", json.load(f))
+        with patch.object(manager, "save_snapshot_file") as save_snapshot:
+            store.load_project(profile_path)
+            save_snapshot.assert_not_called()
+        self.assertEqual(sorted(os.listdir(os.path.dirname(profile_path))), ["legacy.json", "legacy.snapshot.gz"])
+
     def test_changed_file_count_uses_last_publish_snapshot(self):
         tracked = os.path.join(self.test_dir, "tracked.txt")
         added = os.path.join(self.test_dir, "added.txt")
@@ -491,6 +951,89 @@ class TestWorkshopUploader(unittest.TestCase):
         self.assertEqual(diff["modified"], ["edit.txt"])
         self.assertEqual(diff["removed"], ["gone.txt"])
 
+    def test_inventory_diff_engine_caches_by_fingerprint_pair(self):
+        engine = InventoryDiffEngine()
+        baseline = {
+            "b.txt": {"size": 1, "mtime_ns": 1},
+            "c.txt": {"size": 1, "mtime_ns": 1},
+            "z.txt": {"size": 1, "mtime_ns": 1},
+        }
+        inventory = [
+            {"rel_path": "d.txt", "size": 1, "mtime_ns": 1},
+            {"rel_path": "c.txt", "size": 1, "mtime_ns": 5},
+            {"rel_path": "a.txt", "size": 1, "mtime_ns": 1},
+            {"rel_path": "b.txt", "size": 1, "mtime_ns": 1},
+        ]
+
+        first = engine.diff(inventory, baseline, current_key="cur", previous_key="prev")
+        second = engine.diff([], {}, current_key="cur", previous_key="prev")
+
+        self.assertEqual(first["added"], ["a.txt", "d.txt"])
+        self.assertEqual(first["modified"], ["c.txt"])
+        self.assertEqual(first["removed"], ["z.txt"])
+        self.assertEqual(first["changed"], 4)
+        self.assertIs(second, first)
+        self.assertEqual(engine.diff([], {})["changed"], 0)
+
+    def test_inventory_diff_content_mode_ignores_rewrites_and_pairs_renames(self):
+        engine = InventoryDiffEngine()
+        hasher = ContentHasher()
+        rewritten = os.path.join(self.test_dir, "rewritten.odf")
+        moved = os.path.join(self.test_dir, "textures", "moved.dds")
+        os.makedirs(os.path.dirname(moved), exist_ok=True)
+        with open(rewritten, "w", encoding="utf-8") as f:
+            f.write("same bytes")
+        with open(moved, "wb") as f:
+            f.write(b"texture")
+        baseline = {
+            "rewritten.odf": {"size": 10, "mtime_ns": 1, "hash": hasher.hash_file(rewritten)},
+            "moved.dds": {"size": 7, "mtime_ns": 1, "hash": hasher.hash_file(moved)},
+        }
+        inventory = self.uploader._build_mod_inventory(self.test_dir)
+
+        metadata_diff = engine.diff(inventory, baseline)
+        content_diff = engine.diff(inventory, baseline, hasher=hasher)
+
+        self.assertEqual(metadata_diff["changed"], 3)
+        self.assertEqual(content_diff["modified"], [])
+        self.assertEqual(content_diff["renamed"], [("moved.dds", "textures/moved.dds")])
+        self.assertEqual(content_diff["added"], [])
+        self.assertEqual(content_diff["removed"], [])
+        self.assertEqual(content_diff["changed"], 1)
+
+    def test_content_mode_status_hashes_off_the_ui_thread_with_bounded_cache(self):
+        with open(os.path.join(self.test_dir, "a.odf"), "w", encoding="utf-8") as f:
+            f.write("alpha")
+        inventory = self.uploader._build_mod_inventory(self.test_dir)
+        self.uploader.content_hash_diff_var = DummyVar(True)
+        self.uploader.changed_since_upload_var = DummyVar("")
+        deferred = []
+        self.uploader.root.after = lambda _delay, fn: deferred.append(fn)
+        started = []
+
+        with patch("uploader.threading.Thread", side_effect=lambda target, args=(), daemon=None: MagicMock(start=lambda: started.append((target, args)))):
+            self.uploader._update_project_status(inventory)
+            self.uploader._update_project_status(inventory)
+        self.assertEqual(self.uploader.changed_since_upload_var.get(), "CHANGED FILES: CHECKING...")
+
+        for target, args in started:
+            target(*args)
+        for fn in deferred:
+            fn()
+        self.assertEqual(self.uploader.changed_since_upload_var.get(), "CHANGED FILES: 1")
+        self.assertEqual(self.uploader.project_status_token, started[-1][1][0])
+
+        hasher = ContentHasher(cache_limit=2)
+        entries = []
+        for name in ("one", "two", "three"):
+            path = os.path.join(self.test_dir, name + ".txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            entries.append({"path": path, "rel_path": name + ".txt", "size": len(name), "mtime_ns": 1})
+        hasher.hash_entries(entries)
+        self.assertEqual(len(hasher._cache), 2)
+        self.assertNotIn((entries[0]["path"], 3, 1), hasher._cache)
+
     def test_build_readiness_rows_marks_fixable_actions(self):
         bad_trn = os.path.join(self.test_dir, "bad.trn")
         legacy_map = os.path.join(self.test_dir, "old.map")
@@ -515,6 +1058,7 @@ class TestWorkshopUploader(unittest.TestCase):
         self.assertIn(("Legacy File", "delete_legacy"), actions)
 
     def test_build_publish_plan_includes_changed_file_preview(self):
+        self.uploader.stage_upload_var = DummyVar(False)
         self.uploader.username_var.set("tester")
         self.uploader.title_var.set("Sample")
         self.uploader.note_var.set("note")
@@ -685,6 +1229,32 @@ class TestWorkshopUploader(unittest.TestCase):
         second = self.uploader._fingerprint_inventory(self.uploader._build_mod_inventory(self.test_dir))
         self.assertNotEqual(first, second)
 
+    def test_fingerprint_tree_locates_changed_directories(self):
+        scanner = self.uploader._get_mod_scanner()
+        inventory = [
+            {"rel_path": "root.ini", "size": 1, "mtime_ns": 1},
+            {"rel_path": "textures/a.dds", "size": 1, "mtime_ns": 1},
+            {"rel_path": "textures/hi/b.dds", "size": 1, "mtime_ns": 1},
+            {"rel_path": "odf/c.odf", "size": 1, "mtime_ns": 1},
+        ]
+        first = scanner.fingerprint_tree(inventory)
+        changed_inventory = [dict(entry) for entry in inventory]
+        changed_inventory[2]["mtime_ns"] = 2
+        second = scanner.fingerprint_tree(changed_inventory)
+
+        self.assertEqual(scanner.fingerprint_inventory(list(reversed(inventory))), first[""])
+        self.assertEqual(first["odf"], second["odf"])
+        self.assertNotEqual(first[""], second[""])
+        self.assertEqual(scanner.locate_changed_directories(first, second), ["", "textures", "textures/hi"])
+        self.assertEqual(scanner.locate_changed_directories(first, first), [])
+
+        other_mod = [{"rel_path": "odf/c.odf", "path": os.path.join(self.test_dir, "other", "odf", "c.odf"), "size": 9, "mtime_ns": 9}]
+        this_mod = [{"rel_path": "odf/c.odf", "path": os.path.join(self.test_dir, "mod", "odf", "c.odf"), "size": 1, "mtime_ns": 1}]
+        other_digest = scanner.fingerprint_tree(other_mod)["odf"]
+        self.assertEqual(scanner.fingerprint_tree(this_mod)["odf"], first["odf"])
+        self.assertEqual(scanner.fingerprint_tree(other_mod)["odf"], other_digest)
+        self.assertIn((os.path.normcase(os.path.join(self.test_dir, "other")), "odf"), scanner._dir_fingerprint_cache)
+
     def test_extract_loginusers_accounts_vdf_parser(self):
         vdf_content = """
 "users"
@@ -740,6 +1310,29 @@ class TestWorkshopUploader(unittest.TestCase):
             timeout=5,
         )
 
+    def test_qr_poll_follows_server_interval_backs_off_and_expires(self):
+        self.uploader.qr_session_id = "client-123"
+        self.uploader.qr_request_id = "request-456"
+        self.uploader.qr_poll_interval = 7.0
+        self.uploader.qr_expires_at = None
+        self.uploader.steam_login_status_var = DummyVar("")
+        waiting = MagicMock(status_code=200)
+        waiting.json.return_value = {"response": {}}
+        self.uploader.steam_service.poll_qr_auth_session = MagicMock(side_effect=[waiting, ConnectionError("down"), ConnectionError("down")])
+        self.uploader.root.after = MagicMock(return_value="timer")
+
+        self.uploader.poll_qr_status()
+        self.uploader.poll_qr_status()
+        self.uploader.poll_qr_status()
+        delays = [call.args[0] for call in self.uploader.root.after.call_args_list]
+        self.assertEqual(delays, [7000, 14000, 28000])
+
+        self.uploader.qr_expires_at = uploader.time.monotonic() - 1
+        self.uploader.poll_qr_status()
+        self.assertEqual(self.uploader.steam_service.poll_qr_auth_session.call_count, 3)
+        self.assertIsNone(self.uploader.qr_session_id)
+        self.assertEqual(self.uploader.steam_login_status_var.get(), "Steam login: QR expired")
+
     def test_use_selected_item_id_for_upload_sets_update_target(self):
         self.uploader.item_id_var = DummyVar("0")
         self.uploader.tree = MagicMock()
@@ -780,6 +1373,7 @@ class TestWorkshopUploader(unittest.TestCase):
         self.uploader.note_var = DummyVar("note")
         self.uploader.game_var = DummyVar("BZ98R")
         self.uploader.manage_identity_var = DummyVar("")
+        self.uploader.stage_upload_var = DummyVar(False)
 
         self.uploader._build_mod_inventory = MagicMock(return_value=[])
         self.uploader._collect_mod_findings = MagicMock(return_value={
@@ -794,14 +1388,465 @@ class TestWorkshopUploader(unittest.TestCase):
         self.uploader.show_safety_warning = MagicMock(return_value=True)
         self.uploader.save_config = MagicMock()
         self.uploader._confirm_upload_plan = MagicMock(return_value=True)
+        self.uploader._stage_upload_content = MagicMock()
 
         with patch("uploader.threading.Thread") as thread_mock:
             thread_instance = MagicMock()
             thread_mock.return_value = thread_instance
             self.uploader.start_upload()
             thread_mock.assert_called_once()
+            self.assertEqual(thread_mock.call_args.kwargs["target"], self.uploader._content_upload_worker)
+        self.uploader._stage_upload_content.assert_not_called()
 
         uploader.messagebox.showerror.assert_not_called()
 
+    def test_publish_queue_preflights_projects_and_records_results(self):
+        manager = AppFileManager()
+        store = ProjectStore(os.path.join(self.test_dir, "profiles"), manager)
+        sc_path = os.path.join(self.test_dir, "steamcmd.exe")
+        preview_path = os.path.join(self.test_dir, "preview.jpg")
+        for path in (sc_path, preview_path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x")
+        profile_paths = []
+        for name, item_id in (("alpha", "111"), ("beta", "0")):
+            mod_path = os.path.join(self.test_dir, "mods", name)
+            os.makedirs(mod_path, exist_ok=True)
+            profile_paths.append(store.save_project({
+                "project_name": name,
+                "mod_path": mod_path,
+                "preview_path": preview_path,
+                "title": name.title(),
+                "item_id": item_id,
+                "visibility": "2 (Hidden)",
+            }))
+        missing = store.save_project({"project_name": "gamma", "mod_path": os.path.join(self.test_dir, "mods", "gamma"), "title": ""})
+
+        scanner = MagicMock()
+        scanner.build_inventory.side_effect = lambda mod_dir: [{"rel_path": os.path.basename(mod_dir) + ".odf"}]
+        scanner.collect_findings.return_value = {"issues": [], "validation_errors": [], "validation_warnings": []}
+        scanner.fingerprint_inventory.side_effect = lambda inventory: "sig-" + inventory[0]["rel_path"]
+        diff_engine = MagicMock()
+        diff_engine.build_snapshot.side_effect = lambda inventory: {inventory[0]["rel_path"]: {"size": 1, "mtime_ns": 5}}
+        queue = PublishQueue(store, scanner, UploadPreflight(), diff_engine, os.path.join(self.test_dir, "queue"))
+        settings = {"steamcmd_path": sc_path, "use_cached_creds": True, "title_limit": 128, "description_limit": 8000}
+
+        jobs = queue.prepare_jobs(profile_paths + [missing], settings)
+        self.assertEqual([job["label"] for job in jobs], ["alpha", "beta", "gamma"])
+        self.assertTrue(jobs[2]["error"])
+
+        vdfs = [queue.write_job_vdf(job, "301650", lambda value: value.split()[0], self.uploader._build_upload_vdf_content) for job in jobs[:2]]
+        self.assertEqual(len(set(vdfs)), 2)
+        with open(vdfs[0], "r", encoding="utf-8") as f:
+            self.assertRegex(f.read(), r'"visibility"\s+"2"')
+        with open(vdfs[1], "r", encoding="utf-8") as f:
+            text = f.read()
+        with open(vdfs[1], "w", encoding="utf-8") as f:
+            f.write(re.sub(r'("publishedfileid"\s+)"0"', r'\1"222"', text))
+
+        queue.record_result(jobs[0], False, "Access denied")
+        with patch.object(store, "save_upload_snapshot", side_effect=OSError("disk full")):
+            queue.record_result(dict(jobs[1]), True)
+        self.assertNotIn("last_upload_signature", store.load_project(profile_paths[1]))
+        queue.record_result(jobs[1], True)
+
+        alpha = store.load_project(profile_paths[0])
+        self.assertNotIn("last_upload_signature", alpha)
+        self.assertEqual(alpha["last_queue_result"]["detail"], "Access denied")
+        beta = store.load_project(profile_paths[1])
+        self.assertEqual(beta["last_upload_signature"], "sig-beta.odf")
+        self.assertEqual(beta["item_id"], "222")
+        self.assertTrue(beta["last_queue_result"]["ok"])
+        self.assertEqual(store.load_upload_snapshot(profile_paths[1]), {"beta.odf": {"size": 1, "mtime_ns": 5}})
+
+    def test_batch_steamcmd_command_chains_builds_and_splits_results(self):
+        backend = WorkshopBackend(MagicMock())
+        cmd = backend.build_steamcmd_command("steamcmd", "user", "", ["a.vdf", "b.vdf", "c.vdf"], use_cached=True)
+        self.assertEqual(cmd, [
+            "steamcmd", "+login", "user",
+            "+workshop_build_item", "a.vdf",
+            "+workshop_build_item", "b.vdf",
+            "+workshop_build_item", "c.vdf",
+            "+quit",
+        ])
+
+        tracker = BatchProgressTracker(3)
+        for line in [
+            "Logging in user 'user' to Steam Public...OK",
+            "Uploading content...",
+            "Success.",
+            "ERROR! Failed to update workshop item (Access Denied).",
+            "Preparing update...",
+        ]:
+            tracker.feed(line)
+        self.assertEqual(tracker.results(0), [
+            (True, ""),
+            (False, "Failed to update workshop item (Access Denied)"),
+            (False, "SteamCMD exited with code 0 before reporting a result"),
+        ])
+        self.assertTrue(tracker.describe().startswith("[3/3]"))
+
+        tracker = BatchProgressTracker(3, markers=[("upload-a.vdf", "111"), ("upload-b.vdf", "222"), ("upload-c.vdf", "0")])
+        for line in [
+            "Uploading content...",
+            "Preparing update for workshop item 222...",
+            "Success.",
+            "ERROR! Failed to load workshop item VDF 'C:\\queue\\upload-c.vdf'",
+        ]:
+            tracker.feed(line)
+        self.assertEqual([ok for ok, _reason in tracker.results(0)], [False, True, False])
+        self.assertTrue(tracker.results(0)[2][1].startswith("Failed to load workshop item VDF"))
+
+        self.uploader.current_project_data = {"last_published_metadata": {"title": "Stale"}}
+        self.uploader._update_project_status = MagicMock()
+        self.uploader._apply_queue_result_to_current({"item_id": "222", "last_published_metadata": {"title": "Queued"}, "upload_history": [{"bytes": 1}]})
+        self.assertEqual(self.uploader.current_project_data["last_published_metadata"], {"title": "Queued"})
+        self.assertEqual(self.uploader.current_project_data["upload_history"], [{"bytes": 1}])
+
+        tracker = BatchProgressTracker(2)
+        tracker.feed("Logging in user 'user' to Steam Public...FAILED (Invalid Password)")
+        self.assertEqual([ok for ok, _reason in tracker.results(5)], [False, False])
+        self.assertTrue(tracker.results(5)[1][1].startswith("Login failed"))
+
+    @unittest.skipIf(os.name == "nt", "uses a shebang script as a stand-in for steamcmd")
+    def test_steamcmd_prewarm_runs_once_per_path_and_reports_status(self):
+        fake_exe = os.path.join(self.test_dir, "steamcmd")
+        with open(fake_exe, "w", encoding="utf-8") as f:
+            f.write(
+                f"#!{sys.executable}\n"
+                "import sys\n"
+                "print('[  0%] Downloading update...')\n"
+                "print('[----] Update complete, launching Steamcmd...')\n"
+                "sys.exit(0 if sys.argv[1:] == ['+quit'] else 3)\n"
+            )
+        os.chmod(fake_exe, 0o755)
+
+        self.uploader.steamcmd_path = DummyVar(fake_exe)
+        self.uploader.steamcmd_status_var = DummyVar("")
+        self.uploader.prewarm_steamcmd_var = DummyVar(True)
+        self.uploader.persistent_steamcmd_var = DummyVar(False)
+        self.uploader.root.after = lambda _delay, fn: fn()
+
+        with patch("uploader.threading.Thread") as thread_mock:
+            thread_mock.side_effect = lambda target, args=(), daemon=None: MagicMock(start=lambda: target(*args))
+            self.uploader._refresh_steamcmd_status()
+            self.assertTrue(self.uploader.steamcmd_status_var.get().startswith("SteamCMD: updated and ready"))
+            self.assertFalse(self.uploader.start_steamcmd_prewarm())
+            self.assertEqual(thread_mock.call_count, 1)
+
+        self.assertTrue(self.uploader.steamcmd_prewarm_done.is_set())
+        self.uploader._wait_for_steamcmd_prewarm()
+
+    def test_workshop_backend_metadata_update_uses_web_api_and_needs_native_for_preview(self):
+        backend = self.uploader.workshop_backend
+        backend.steam_service.request_with_retry = MagicMock()
+        backend.seed_item_details({"123": {"publishedfileid": "123", "title": "Old", "time_updated": 1}})
+        updater = MagicMock()
+        updater.try_update_item.side_effect = RuntimeError("native failed")
+
+        result = backend.update_workshop_metadata(
+            api_key="test-key",
+            item_id="123",
+            appid="301650",
+            title="New",
+            description="Desc",
+            visibility="2",
+            tags=["Map"],
+            steamworks_updater=updater,
+        )
+
+        self.assertEqual(result["method"], "web_api")
+        data = backend.steam_service.request_with_retry.call_args.kwargs["data"]
+        self.assertEqual((data["title"], data["file_description"], data["visibility"], data["tags[0]"]), ("New", "Desc", "2", "Map"))
+        self.assertIsNone(backend.cached_item_details("123"))
+        with self.assertRaises(RuntimeError):
+            backend.update_workshop_metadata("test-key", "123", "301650", "New", "Desc", "2", preview_path="preview.jpg", steamworks_updater=updater)
+
+    def test_start_upload_skips_steamcmd_when_only_metadata_changed(self):
+        sc_path = os.path.join(self.test_dir, "steamcmd.exe")
+        preview_path = os.path.join(self.test_dir, "preview.jpg")
+        for path in (sc_path, preview_path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x")
+        content_dir = os.path.join(self.test_dir, "content")
+        os.makedirs(content_dir, exist_ok=True)
+
+        self.uploader.base_dir = self.test_dir
+        self.uploader.desc_text = MagicMock()
+        self.uploader.desc_text.get.return_value = "new description"
+        self.uploader.title_var = DummyVar("Test Mod")
+        self.uploader.steamcmd_path = DummyVar(sc_path)
+        self.uploader.mod_path = DummyVar(content_dir)
+        self.uploader.preview_path = DummyVar(preview_path)
+        self.uploader.username_var = DummyVar("")
+        self.uploader.password_var = DummyVar("")
+        self.uploader.use_cached_creds_var = DummyVar(True)
+        self.uploader.visibility_var = DummyVar("0 (Public)")
+        self.uploader.item_id_var = DummyVar("555")
+        self.uploader.note_var = DummyVar("")
+        self.uploader.tags_var = DummyVar("")
+        self.uploader.game_var = DummyVar("BZ98R")
+        self.uploader.api_key_var = DummyVar("test-key")
+        self.uploader.metadata_only_var = DummyVar(True)
+        self.uploader.experimental_native_appid_var = DummyVar(False)
+        self.uploader.stage_upload_var = DummyVar(False)
+        self.uploader.save_config = MagicMock()
+        self.uploader.save_current_project_state = MagicMock()
+        self.uploader._update_project_status = MagicMock()
+        self.uploader._confirm_upload_plan = MagicMock(return_value=True)
+        self.uploader._build_mod_inventory = MagicMock(return_value=[])
+        self.uploader._fingerprint_inventory = MagicMock(return_value="sig-1")
+        self.uploader._collect_mod_findings = MagicMock(return_value={
+            "inventory": [],
+            "issues": [],
+            "validation_errors": [],
+            "validation_warnings": [],
+            "trn_line_endings": [],
+            "trn_duplicate_headers": [],
+            "legacy_files": [],
+        })
+        previous = self.uploader._current_published_metadata()
+        previous["description"] = "old description"
+        self.uploader.current_project_data = {
+            "last_upload_signature": "sig-1",
+            "last_uploaded_item_id": "555",
+            "last_published_metadata": previous,
+        }
+        self.uploader.workshop_backend.update_workshop_metadata = MagicMock(return_value={"method": "web_api"})
+        self.uploader.run_steamcmd = MagicMock()
+        self.uploader._stage_upload_content = MagicMock()
+
+        with patch("uploader.threading.Thread") as thread_mock:
+            thread_mock.side_effect = lambda target, args=(), daemon=None: MagicMock(start=lambda: target(*args))
+            self.uploader.start_upload()
+
+        self.uploader.run_steamcmd.assert_not_called()
+        self.uploader._stage_upload_content.assert_not_called()
+        kwargs = self.uploader.workshop_backend.update_workshop_metadata.call_args.kwargs
+        self.assertEqual((kwargs["item_id"], kwargs["description"], kwargs["preview_path"]), ("555", "new description", None))
+        self.assertIsNone(kwargs["tags"])
+        self.assertEqual(self.uploader.current_project_data["last_published_metadata"]["description"], "new description")
+
+        self.assertIsNone(self.uploader._metadata_only_changes("sig-2", previous))
+
+        self.uploader.current_project_data["last_published_metadata"] = dict(previous, description="new description", tags=["Map"])
+        with patch("uploader.threading.Thread") as thread_mock:
+            thread_mock.side_effect = lambda target, args=(), daemon=None: MagicMock(start=lambda: target(*args))
+            self.uploader.start_upload()
+        self.assertEqual(self.uploader.workshop_backend.update_workshop_metadata.call_args.kwargs["tags"], [])
+
+        self.uploader.workshop_backend.update_workshop_metadata.reset_mock()
+        with patch("uploader.threading.Thread") as thread_mock:
+            self.uploader.start_upload()
+            thread_mock.assert_not_called()
+        self.uploader.workshop_backend.update_workshop_metadata.assert_not_called()
+        self.assertEqual(uploader.messagebox.showinfo.call_args.args[0], "Nothing to Publish")
+
+        self.uploader.stage_upload_var = DummyVar(True)
+        self.uploader.stage_prune_orphans_var = DummyVar(False)
+        self.uploader.upload_stager = UploadStager(os.path.join(self.test_dir, "staging"))
+        staged_signature = self.uploader._publish_signature(content_dir, [])
+        self.assertNotEqual(staged_signature, "sig-1")
+        with open(os.path.join(content_dir, ".workshopignore"), "w", encoding="utf-8") as f:
+            f.write("work/\n")
+        self.assertNotEqual(self.uploader._publish_signature(content_dir, []), staged_signature)
+        self.uploader.stage_prune_orphans_var = DummyVar(True)
+        self.assertNotEqual(self.uploader._publish_signature(content_dir, []), staged_signature)
+
+    def test_upload_stager_filters_links_and_prunes_stale_files(self):
+        mod_dir = os.path.join(self.test_dir, "mod")
+        files = {
+            "map.odf": "odf",
+            "textures/map.dds": "dds",
+            "raw/map.psd": "psd",
+            "work/notes.txt": "notes",
+            "unused.wav": "wav",
+            ".git/config": "git",
+            "map.odf.bak": "bak",
+            ".workshopignore": "# local extras\nwork/\n",
+        }
+        for rel_path, text in files.items():
+            path = os.path.join(mod_dir, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        stager = UploadStager(os.path.join(self.test_dir, "staging"))
+        inventory = self.uploader._build_mod_inventory(mod_dir)
+        summary = stager.stage(mod_dir, inventory, orphans=["unused.wav"])
+        staged = sorted(
+            os.path.relpath(os.path.join(root, name), summary["path"]).replace("\\", "/")
+            for root, _dirs, names in os.walk(summary["path"])
+            for name in names
+        )
+        self.assertEqual(staged, ["map.odf", "textures/map.dds"])
+        self.assertEqual(summary["skipped"], 6)
+        self.assertEqual(summary["linked"] + summary["copied"], 2)
+        with open(os.path.join(mod_dir, "map.odf"), "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "odf")
+
+        os.remove(os.path.join(mod_dir, "textures", "map.dds"))
+        copy_stager = UploadStager(os.path.join(self.test_dir, "staging"), link=MagicMock(side_effect=OSError("no links")))
+        summary = copy_stager.stage(mod_dir, self.uploader._build_mod_inventory(mod_dir))
+        self.assertEqual((summary["unchanged"], summary["removed"], summary["copied"]), (1, 1, 1))
+        self.assertFalse(os.path.exists(os.path.join(summary["path"], "textures")))
+        self.assertTrue(os.path.exists(os.path.join(summary["path"], "unused.wav")))
+
+        patterns = ["/build/", "docs/*.md", "**/cache/"]
+        self.assertTrue(stager.is_ignored("build/out.odf", patterns))
+        self.assertFalse(stager.is_ignored("maps/build/out.odf", patterns))
+        self.assertTrue(stager.is_ignored("docs/readme.md", patterns))
+        self.assertFalse(stager.is_ignored("docs/a/b.md", patterns))
+        self.assertTrue(stager.is_ignored("maps/cache/tile.dds", patterns))
+
+    def test_upload_history_estimates_eta_for_changed_bytes(self):
+        history = UploadHistory(limit=3)
+        mb = 1024 * 1024
+        self.assertEqual(history.describe([], 5 * mb), "5.0 MB, ETA unknown (no upload history yet)")
+
+        samples = history.record([], 10 * mb, 12, source="stream")
+        samples = history.record(samples, 50 * mb, 52, source="stream")
+        samples = history.record(samples, 0, 30)
+        samples = history.record(samples, 30 * mb, 32, source="wall")
+        self.assertEqual(len(samples), 3)
+        self.assertAlmostEqual(history.estimate_seconds(samples, 20 * mb), 22.0, places=3)
+        self.assertEqual(history.describe(samples, 20 * mb), "20.0 MB, about 22s at 1.00 MB/s")
+
+        self.uploader.username_var.set("tester")
+        self.uploader.item_id_var.set("123")
+        self.uploader.current_project_data = {
+            "last_upload_inventory": {"same.dds": {"size": 5 * mb, "mtime_ns": 1}, "edited.odf": {"size": 1, "mtime_ns": 1}},
+            "upload_history": samples,
+        }
+        content_dir = os.path.join(self.test_dir, "content")
+        self.uploader.mod_path = DummyVar(content_dir)
+        self.uploader.stage_upload_var = DummyVar(True)
+        self.uploader.stage_prune_orphans_var = DummyVar(False)
+        self.uploader.upload_stager = UploadStager(os.path.join(self.test_dir, "staging"))
+        inventory = [
+            {"rel_path": rel_path, "path": os.path.join(content_dir, rel_path), "name_lower": rel_path, "size": size, "mtime_ns": mtime}
+            for rel_path, size, mtime in (("same.dds", 5 * mb, 1), ("edited.odf", 2 * mb, 2), ("new.dds", 18 * mb, 1), ("source.psd", 40 * mb, 1))
+        ]
+        findings = {"issues": [], "validation_errors": [], "validation_warnings": [], "trn_line_endings": [], "trn_duplicate_headers": [], "legacy_files": []}
+        plan = self.uploader._build_publish_plan("content", "preview.jpg", True, findings, inventory)
+        self.assertEqual(plan["upload_bytes"], 20 * mb)
+        self.assertTrue(plan["upload_estimate"].startswith("20.0 MB, about 22s"))
+
+        self.uploader.pending_publish_bytes = plan["upload_bytes"]
+        self.uploader.pending_publish_transfer = (85 * mb, 24.0, "stream")
+        self.uploader._record_upload_throughput(40.0, False)
+        self.assertEqual(self.uploader.current_project_data["upload_history"][-1]["bytes"], 20 * mb)
+        self.assertEqual(self.uploader.current_project_data["upload_history"][-1]["seconds"], 24.0)
+        self.uploader.pending_publish_transfer = None
+        self.uploader._record_upload_throughput(40.0, True)
+        self.assertEqual(self.uploader.current_project_data["upload_history"][-1]["bytes"], 20 * mb)
+        self.assertEqual(self.uploader.current_project_data["upload_history"][-1]["source"], "wall")
+
+    def test_steam_log_reader_tail_seeks_latest_session_and_reads_only_new_bytes(self):
+        log_path = os.path.join(self.test_dir, "workshopbuilds", "depot_build_301650.log")
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        old_session = "".join(f"[2024-01-01 10:00:{i:02d}] workshop_build_item \"item_1.vdf\"\nERROR! old failure {i}\n" for i in range(20))
+        latest = (
+            "[2024-02-01 12:00:00] workshop_build_item \"item_555.vdf\"\n"
+            "[2024-02-01 12:00:01] Starting upload\n"
+            "[2024-02-01 12:00:05] Uploading content: 10 MB of 40 MB\n"
+        )
+        with open(log_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(old_session + latest)
+
+        reader = SteamLogReader(block_size=32)
+        session = reader.read_latest_session(log_path)
+        self.assertEqual(session["offset"], len(old_session))
+        self.assertEqual(session["errors"], [])
+        self.assertEqual(session["bytes_total"], 40 * 1024 * 1024)
+        self.assertEqual(session["phase"], "uploading")
+
+        with open(log_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write("[2024-02-01 12:01:05] Upload failed, EResult 2\n[2024-02-01 12:01:06] partial")
+        with patch.object(reader, "find_session_start", wraps=reader.find_session_start) as seek_spy:
+            session = reader.read_latest_session(log_path)
+            seek_spy.assert_not_called()
+        self.assertEqual(session["result_code"], 2)
+        self.assertEqual(session["phase"], "failed")
+        self.assertEqual(session["errors"], ["Upload failed, EResult 2"])
+        self.assertEqual(session["duration_seconds"], 65)
+        self.assertEqual(session["read_offset"], os.path.getsize(log_path) - len("[2024-02-01 12:01:06] partial"))
+
+        with open(log_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(" line\n[2024-02-02 09:00:00] +workshop_build_item \"item_555.vdf\"\n")
+        session = reader.read_latest_session(log_path)
+        self.assertEqual(session["errors"], [])
+        self.assertEqual(len(session["events"]), 1)
+        with open(log_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write("[2024-02-02 09:00:30] Committing update...\n[2024-02-02 09:00:31] Success.\n")
+        self.assertEqual(reader.read_latest_session(log_path)["phase"], "success")
+
+        backend = WorkshopBackend(MagicMock())
+        with open(log_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(old_session + latest + "ERROR! disk full\n")
+        self.assertEqual(backend.analyze_last_upload_log(os.path.join(self.test_dir, "steamcmd.exe"), "301650"), "ERROR! disk full")
+
+    def test_log_tail_opens_at_bounded_window_and_reads_only_appended_lines(self):
+        log_path = os.path.join(self.test_dir, "content_log.txt")
+        with open(log_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("".join(f"line {i}\n" for i in range(100)) + "ERROR! disk full\npartial")
+
+        tail = LogTail(log_path, max_lines=5, block_size=16)
+        self.assertEqual(tail.read_tail(), ["line 96", "line 97", "line 98", "line 99", "ERROR! disk full"])
+        self.assertEqual(tail.read_tail(start=os.path.getsize(log_path) - len("line 99\nERROR! disk full\npartial")), ["line 99", "ERROR! disk full"])
+        self.assertEqual(tail.read_new(), ([], False))
+
+        with open(log_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(" upload\nline 101\n")
+        self.assertEqual(tail.read_new(), (["partial upload", "line 101"], False))
+        self.assertEqual(tail.search(r"error|line 10\d"), ["ERROR! disk full", "line 101"])
+        self.assertEqual(tail.search(r"line 9\d", max_results=2), ["line 98", "line 99"])
+        self.assertEqual(tail.search(r"error|line 10\d", end=os.path.getsize(log_path) - len("line 101\n")), ["ERROR! disk full"])
+
+        with open(log_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("fresh\n")
+        self.assertEqual(tail.read_new(), (["fresh"], True))
+
+        text = MagicMock()
+        text.index.return_value = f"{uploader.LOG_VIEW_MAX_LINES + 3}.0"
+        self.uploader._append_log_lines(text, ["ok", "Upload failed"])
+        text.insert.assert_any_call("end", "Upload failed\n", ("error",))
+        text.delete.assert_called_once_with("1.0", "3.0")
+
+        missing_path = os.path.join(self.test_dir, "Workshop_log.txt")
+        view = {
+            "text": MagicMock(),
+            "tail": LogTail(missing_path),
+            "session": None,
+            "filter_var": DummyVar("fail|error"),
+            "follow_var": DummyVar(True),
+            "regex": None,
+            "searching": False,
+            "missing": True,
+        }
+        win = MagicMock()
+        state = {"token": None}
+        self.uploader.root.after = MagicMock(return_value="token")
+        self.uploader._render_log_view = MagicMock()
+        self.uploader._poll_log_views(win, [view], state)
+        self.uploader._render_log_view.assert_not_called()
+        with open(missing_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("Upload failed\n")
+        self.uploader._poll_log_views(win, [view], state)
+        self.assertEqual(self.uploader._render_log_view.call_args.args[1], ["Upload failed"])
+        self.assertFalse(view["missing"])
+
+        with patch("uploader.threading.Thread") as thread_mock:
+            self.uploader._apply_log_filter(view)
+        self.assertTrue(view["searching"])
+        with open(missing_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write("ERROR! late\n")
+        self.uploader._poll_log_views(win, [view], state)
+        self.assertEqual(view["tail"].offset, len("Upload failed\n"))
+        self.uploader.root.after = lambda _d, fn: fn()
+        thread_mock.call_args.kwargs["target"]()
+        self.assertFalse(view["searching"])
+        self.assertEqual(self.uploader._render_log_view.call_args.args[1], ["Upload failed"])
+
 if __name__ == '__main__':
     unittest.main()
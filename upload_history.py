@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+UPLOAD_HISTORY_LIMIT = 10
+MIN_UPLOAD_SECONDS = 1.0
+
+
+class UploadHistory:
+    def __init__(self, limit=UPLOAD_HISTORY_LIMIT, logger=None):
+        self.limit = limit
+        self.logger = logger
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def _samples(self, history):
+        samples = []
+        for entry in history or []:
+            try:
+                size = int(entry.get("bytes", 0))
+                seconds = float(entry.get("seconds", 0))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if size > 0 and seconds >= MIN_UPLOAD_SECONDS:
+                samples.append((size, seconds))
+        return samples
+
+    def record(self, history, bytes_sent, seconds, source="estimate"):
+        history = list(history or [])
+        history.append({
+            "bytes": int(bytes_sent or 0),
+            "seconds": round(float(seconds or 0), 2),
+            "source": source,
+            "at": datetime.now(timezone.utc).isoformat(),
+        })
+        return history[-self.limit:]
+
+    def model(self, history):
+        samples = self._samples(history)
+        if not samples:
+            return None
+        total_bytes = sum(size for size, _seconds in samples)
+        total_seconds = sum(seconds for _size, seconds in samples)
+        if len(samples) >= 2:
+            mean_bytes = total_bytes / len(samples)
+            mean_seconds = total_seconds / len(samples)
+            spread = sum((size - mean_bytes) ** 2 for size, _seconds in samples)
+            if spread > 0:
+                slope = sum((size - mean_bytes) * (seconds - mean_seconds) for size, seconds in samples) / spread
+                overhead = mean_seconds - slope * mean_bytes
+                if slope > 0 and overhead >= 0:
+                    return {"overhead": overhead, "rate": 1.0 / slope, "samples": len(samples)}
+        return {"overhead": 0.0, "rate": total_bytes / total_seconds, "samples": len(samples)}
+
+    def estimate_seconds(self, history, bytes_to_send):
+        model = self.model(history)
+        if model is None:
+            return None
+        return model["overhead"] + max(0, bytes_to_send) / model["rate"]
+
+    def describe(self, history, bytes_to_send):
+        size_text = f"{bytes_to_send / (1024 * 1024):.1f} MB"
+        seconds = self.estimate_seconds(history, bytes_to_send)
+        if seconds is None:
+            return f"{size_text}, ETA unknown (no upload history yet)"
+        if seconds < 90:
+            eta = f"{seconds:.0f}s"
+        elif seconds < 5400:
+            eta = f"{seconds / 60:.0f} min"
+        else:
+            eta = f"{seconds / 3600:.1f} h"
+        rate = self.model(history)["rate"] / (1024 * 1024)
+        return f"{size_text}, about {eta} at {rate:.2f} MB/s"
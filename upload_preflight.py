@@ -38,6 +38,27 @@ class UploadPreflight:
             return ("Error", "SteamCMD executable not found.")
         return None
 
+    def _preview_fingerprint(self, preview_path):
+        try:
+            stat = os.stat(preview_path)
+        except (OSError, TypeError):
+            return ""
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def build_published_metadata(self, title, description, visibility, tags, preview_path):
+        return {
+            "title": title or "",
+            "description": description or "",
+            "visibility": str(visibility or "0"),
+            "tags": sorted(t.strip() for t in (tags or "").split(",") if t.strip()),
+            "preview": self._preview_fingerprint(preview_path),
+        }
+
+    def changed_metadata_fields(self, previous, current):
+        if not isinstance(previous, dict):
+            return sorted(current)
+        return sorted(key for key, value in current.items() if previous.get(key) != value)
+
     def build_safety_rows(self, issues, mod_dir):
         rows = []
         for path, issue_type, detail, line in issues:
@@ -66,8 +87,9 @@ class UploadPreflight:
         description,
         changenote,
         build_upload_vdf_content,
+        vdf_name="upload.vdf",
     ):
-        vdf_path = os.path.join(base_dir, "upload.vdf")
+        vdf_path = os.path.join(base_dir, vdf_name)
         vdf_content = build_upload_vdf_content(
             appid=appid,
             publishedfileid=publishedfileid,
@@ -0,0 +1,171 @@
+import fnmatch
+import hashlib
+import os
+import re
+import shutil
+
+STAGING_IGNORE_FILE = ".workshopignore"
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".svn/",
+    ".hg/",
+    ".vs/",
+    ".vscode/",
+    "__pycache__/",
+    "*.bak",
+    "*.tmp",
+    "*.orig",
+    "*.log",
+    "*.psd",
+    "*.xcf",
+    "*.blend",
+    "*.blend1",
+    "*.max",
+    "*.pdn",
+    "thumbs.db",
+    "desktop.ini",
+    ".ds_store",
+    STAGING_IGNORE_FILE,
+)
+
+
+class UploadStager:
+    def __init__(self, staging_root, logger=None, link=os.link, copy=shutil.copy2):
+        self.staging_root = staging_root
+        self.logger = logger
+        self._link = link
+        self._copy = copy
+
+    def log(self, msg):
+        if self.logger:
+            self.logger(msg)
+
+    def staging_dir_for(self, mod_dir):
+        normalized = os.path.abspath(mod_dir or "").lower()
+        digest = hashlib.sha1(normalized.encode("utf-8", errors="ignore")).hexdigest()[:10]
+        label = re.sub(r"[^a-zA-Z0-9]+", "-", os.path.basename(normalized)).strip("-") or "content"
+        return os.path.join(self.staging_root, f"{label}-{digest}")
+
+    def load_ignore_patterns(self, mod_dir):
+        patterns = list(DEFAULT_IGNORE_PATTERNS)
+        path = os.path.join(mod_dir, STAGING_IGNORE_FILE)
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    text = line.strip()
+                    if text and not text.startswith("#"):
+                        patterns.append(text.replace("\\", "/").lower())
+        except FileNotFoundError:
+            pass
+        return patterns
+
+    def _match_segments(self, parts, pattern_parts):
+        if not pattern_parts:
+            return not parts
+        head = pattern_parts[0]
+        if head == "**":
+            return any(self._match_segments(parts[i:], pattern_parts[1:]) for i in range(len(parts) + 1))
+        return bool(parts) and fnmatch.fnmatchcase(parts[0], head) and self._match_segments(parts[1:], pattern_parts[1:])
+
+    def is_ignored(self, rel_path, patterns):
+        rel_path = rel_path.replace("\\", "/").lower()
+        parts = rel_path.split("/")
+        name = parts[-1]
+        for pattern in patterns:
+            folder_only = pattern.endswith("/")
+            anchored = "/" in pattern.rstrip("/")
+            pattern_parts = pattern.strip("/").split("/")
+            if folder_only:
+                if anchored:
+                    if any(self._match_segments(parts[:depth], pattern_parts) for depth in range(1, len(parts))):
+                        return True
+                elif any(fnmatch.fnmatchcase(part, pattern_parts[0]) for part in parts[:-1]):
+                    return True
+            elif anchored:
+                if self._match_segments(parts, pattern_parts):
+                    return True
+            elif fnmatch.fnmatchcase(name, pattern_parts[0]):
+                return True
+        return False
+
+    def select_files(self, mod_dir, inventory, orphans=None):
+        patterns = self.load_ignore_patterns(mod_dir)
+        orphans = {name.lower() for name in orphans or []}
+        kept = []
+        skipped = []
+        for entry in inventory:
+            rel_path = os.path.relpath(entry["path"], mod_dir)
+            if self.is_ignored(rel_path, patterns) or entry["name_lower"] in orphans:
+                skipped.append(entry)
+            else:
+                kept.append((rel_path, entry))
+        return kept, skipped
+
+    def _is_current(self, source, target, entry):
+        try:
+            if os.path.samefile(source, target):
+                return True
+            stat = os.stat(target)
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+    def _place(self, source, target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.lexists(target):
+            os.remove(target)
+        try:
+            self._link(source, target)
+            return "linked"
+        except OSError:
+            self._copy(source, target)
+            return "copied"
+
+    def _remove_stale(self, staging_dir, wanted):
+        removed = 0
+        for root, dirs, files in os.walk(staging_dir, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.normcase(os.path.relpath(path, staging_dir)) not in wanted:
+                    os.remove(path)
+                    removed += 1
+            for name in dirs:
+                path = os.path.join(root, name)
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+        return removed
+
+    def stage(self, mod_dir, inventory, orphans=None):
+        staging_dir = self.staging_dir_for(mod_dir)
+        os.makedirs(staging_dir, exist_ok=True)
+        kept, skipped = self.select_files(mod_dir, inventory, orphans=orphans)
+        summary = {
+            "path": staging_dir,
+            "entries": [entry for _rel_path, entry in kept],
+            "files": len(kept),
+            "bytes": 0,
+            "skipped": len(skipped),
+            "skipped_bytes": sum(entry["size"] for entry in skipped),
+            "linked": 0,
+            "copied": 0,
+            "unchanged": 0,
+            "removed": 0,
+        }
+        wanted = set()
+        for rel_path, entry in kept:
+            target = os.path.join(staging_dir, rel_path)
+            wanted.add(os.path.normcase(rel_path))
+            summary["bytes"] += entry["size"]
+            if self._is_current(entry["path"], target, entry):
+                summary["unchanged"] += 1
+                continue
+            summary[self._place(entry["path"], target)] += 1
+        summary["removed"] = self._remove_stale(staging_dir, wanted)
+        self.log(
+            f"Staged {summary['files']} file(s) in {staging_dir} "
+            f"({summary['linked']} linked, {summary['copied']} copied, {summary['unchanged']} unchanged); "
+            f"left out {summary['skipped']} file(s), {summary['skipped_bytes'] / (1024 * 1024):.1f} MB."
+        )
+        return summary
@@ -1,7 +1,10 @@
+import hashlib
 import os
 import sys
 import subprocess
+import shutil
 import threading
+import time
 import webbrowser
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -10,7 +13,7 @@ import re
 import requests
 from datetime import datetime, timezone
 from mod_scanner import ModScanner
-from steam_service import SteamService
+from steam_service import STEAM_API_BASE_URL, SteamService
 from workshop_backend import WorkshopBackend
 from memory_analyzer import MemoryAnalyzer
 from content_fixes import ContentFixer
@@ -18,6 +21,17 @@ from app_file_manager import AppFileManager
 from project_store import ProjectStore
 from upload_preflight import UploadPreflight
 from steamworks_tags import SteamworksTagUpdater
+from inventory_diff import ContentHasher, InventoryDiffEngine
+from library_cache import LIBRARY_CACHE_TTL_SECONDS, WorkshopLibraryCache
+from preview_cache import PREVIEW_CACHE_MAX_BYTES, PreviewCache
+from identity_cache import IdentityCache
+from async_client import AsyncWorkshopClient, WorkshopBatchClient
+from steamcmd_progress import SteamCmdProgressParser
+from steamcmd_session import SteamCmdSession
+from publish_queue import BatchProgressTracker, PublishQueue
+from upload_staging import UploadStager
+from upload_history import UploadHistory
+from steam_log_reader import ERROR_MARKERS, LOG_VIEW_MAX_LINES, LogTail
 
 try:
     from PIL import Image
@@ -48,6 +62,13 @@ STEAM_TITLE_LIMIT = 128
 STEAM_DESC_LIMIT = 8000
 REQUEST_RETRY_ATTEMPTS = 3
 REQUEST_BACKOFF_SECONDS = 1.0
+PREFETCH_TOP_ITEMS = 5
+QR_POLL_DEFAULT_INTERVAL = 5.0
+QR_POLL_MAX_INTERVAL = 30.0
+QR_POLL_MAX_FAILURES = 6
+QR_SESSION_TIMEOUT_SECONDS = 300
+STEAMCMD_PREWARM_DELAY_MS = 1500
+LOG_VIEW_POLL_MS = 1000
 KEYRING_SERVICE = "BattlezoneWorkshopUploader"
 KEYRING_API_KEY_ACCOUNT = "steam_web_api_key"
 
@@ -273,8 +294,21 @@ class WorkshopUploader:
         self.use_cached_creds_var = tk.BooleanVar(value=self.config.get("use_cached_creds", False))
         self.use_cached_creds_var.trace_add("write", self._toggle_auth_fields)
         self.experimental_native_appid_var = tk.BooleanVar(value=self.config.get("experimental_native_appid", False))
+        self.content_hash_diff_var = tk.BooleanVar(value=self.config.get("content_hash_diff", False))
         self.busy_status_var = tk.StringVar(value="STATUS: IDLE")
         self.steamcmd_status_var = tk.StringVar(value="SteamCMD: not checked")
+        self.upload_progress_var = tk.StringVar(value="")
+        self.stream_steamcmd_var = tk.BooleanVar(value=self.config.get("stream_steamcmd_output", False))
+        self.persistent_steamcmd_var = tk.BooleanVar(value=self.config.get("persistent_steamcmd_session", False))
+        self.prewarm_steamcmd_var = tk.BooleanVar(value=self.config.get("prewarm_steamcmd", False))
+        self.metadata_only_var = tk.BooleanVar(value=self.config.get("metadata_only_publish", True))
+        self.stage_upload_var = tk.BooleanVar(value=self.config.get("stage_upload_content", False))
+        self.stage_prune_orphans_var = tk.BooleanVar(value=self.config.get("stage_prune_orphans", False))
+        self.steamcmd_prewarm_token = None
+        self.steamcmd_prewarmed_path = None
+        self.steamcmd_prewarm_done = threading.Event()
+        self.steamcmd_prewarm_done.set()
+        self.steamcmd_session = None
         self.steam_login_status_var = tk.StringVar(value="Steam login: not checked")
         self.api_key_status_var = tk.StringVar(value="API key: not checked")
         self.owner_status_var = tk.StringVar(value="Workshop owner: not resolved")
@@ -287,8 +321,15 @@ class WorkshopUploader:
         self.current_readiness = None
         self.current_project_data = {}
         self.current_project_signature = None
+        self.project_status_token = 0
         self.pending_publish_signature = None
         self.pending_publish_inventory = None
+        self.pending_publish_metadata = None
+        self.pending_publish_bytes = 0
+        self.pending_publish_transfer = None
+        self.staged_orphans = {}
+        self._upload_snapshot_cache_key = None
+        self._upload_snapshot_cache = {}
         self.readiness_items = []
         self.readiness_item_by_id = {}
         self.project_autosave_token = None
@@ -297,16 +338,50 @@ class WorkshopUploader:
         self.qr_session_id = None
         self.qr_request_id = None
         self.qr_poll_timer = None
+        self.qr_poll_interval = QR_POLL_DEFAULT_INTERVAL
+        self.qr_poll_failures = 0
+        self.qr_expires_at = None
         
         self.watch_mode_var = tk.BooleanVar(value=False)
         self.watch_thread = None
         self.last_watch_signature = None
+        self.last_watch_tree = None
         self.last_watch_summary = None
         self.mod_scanner = ModScanner(self.resource_dir, logger=self.log)
-        self.steam_service = SteamService(logger=self.log)
-        self.workshop_backend = WorkshopBackend(self.steam_service, logger=self.log)
+        self.identity_cache = IdentityCache(os.path.join(self.base_dir, "cache", "identity.json"), self.file_manager, logger=self.log)
+        self.steam_service = SteamService(
+            logger=self.log,
+            identity_cache=self.identity_cache,
+            api_base_url=self.config.get("steam_api_base_url", STEAM_API_BASE_URL),
+        )
+        self.preview_cache = PreviewCache(
+            os.path.join(self.base_dir, "cache", "previews"),
+            self.file_manager,
+            max_bytes=self.config.get("preview_cache_max_bytes", PREVIEW_CACHE_MAX_BYTES),
+            logger=self.log,
+        )
+        self.workshop_backend = WorkshopBackend(self.steam_service, logger=self.log, preview_cache=self.preview_cache)
+        self.batch_client = WorkshopBatchClient(AsyncWorkshopClient(self.workshop_backend, logger=self.log))
         self.memory_analyzer = MemoryAnalyzer(logger=self.log, has_pil=HAS_PIL, image_module=Image if HAS_PIL else None)
         self.content_fixer = ContentFixer(logger=self.log)
+        self.inventory_diff_engine = InventoryDiffEngine(logger=self.log)
+        self.content_hasher = ContentHasher(logger=self.log)
+        self.library_cache = WorkshopLibraryCache(
+            os.path.join(self.base_dir, "cache"),
+            self.file_manager,
+            ttl_seconds=self.config.get("library_cache_ttl_seconds", LIBRARY_CACHE_TTL_SECONDS),
+            logger=self.log,
+        )
+        self.upload_history = UploadHistory(logger=self.log)
+        self.upload_stager = UploadStager(os.path.join(self.base_dir, "staging"), logger=self.log)
+        self.publish_queue = PublishQueue(
+            self.project_store,
+            self.mod_scanner,
+            self.upload_preflight,
+            self.inventory_diff_engine,
+            os.path.join(self.base_dir, "queue"),
+            logger=self.log,
+        )
         self.project_name_var = tk.StringVar(value="NO PROJECT")
         self.project_hint_var = tk.StringVar(value="Select a mod folder to begin.")
         self.publish_target_var = tk.StringVar(value="TARGET: CREATE NEW ITEM")
@@ -333,6 +408,8 @@ class WorkshopUploader:
         self._toggle_auth_fields()
         self._refresh_steamcmd_status()
         self._on_api_key_changed()
+        self._prune_temp_previews()
+        self._show_cached_library_on_startup()
 
         # Apply theme
         self.root.configure(bg=self.colors["bg"])
@@ -364,6 +441,16 @@ class WorkshopUploader:
             "manage_identity": self.manage_identity_var.get(),
             "use_cached_creds": self.use_cached_creds_var.get(),
             "experimental_native_appid": self.experimental_native_appid_var.get(),
+            "content_hash_diff": self.content_hash_diff_var.get(),
+            "library_cache_ttl_seconds": self.library_cache.ttl_seconds,
+            "preview_cache_max_bytes": self.preview_cache.max_bytes,
+            "steam_api_base_url": self.steam_service.api_base_url,
+            "stream_steamcmd_output": self.stream_steamcmd_var.get(),
+            "persistent_steamcmd_session": self.persistent_steamcmd_var.get(),
+            "prewarm_steamcmd": self.prewarm_steamcmd_var.get(),
+            "metadata_only_publish": self.metadata_only_var.get(),
+            "stage_upload_content": self.stage_upload_var.get(),
+            "stage_prune_orphans": self.stage_prune_orphans_var.get(),
         }
         try:
             self._get_file_manager().save_config(self.config_path, cfg)
@@ -415,7 +502,7 @@ class WorkshopUploader:
         self.project_autosave_token = None
         if self.autosave_suspended:
             return
-        self.save_current_project_state(quiet=True)
+        self.save_current_project_state(quiet=True, defer=True)
 
     def _on_description_changed(self, _event=None):
         self._update_desc_counter()
@@ -442,52 +529,86 @@ class WorkshopUploader:
             return f"{text} ({labels[text]})"
         return text
 
+    def _visibility_code_for(self, value):
+        return self._normalize_visibility_value(value).split()[0]
+
     def _visibility_code(self):
-        text = self._normalize_visibility_value(self.visibility_var.get())
-        return text.split()[0]
+        return self._visibility_code_for(self.visibility_var.get())
 
     def _build_inventory_snapshot(self, inventory):
-        snapshot = {}
-        for entry in inventory or []:
-            snapshot[entry["rel_path"]] = {
-                "size": entry["size"],
-                "mtime_ns": entry["mtime_ns"],
-            }
-        return snapshot
+        return self._get_inventory_diff_engine().build_snapshot(inventory)
 
     def _count_changed_files(self, inventory, last_snapshot):
-        current = self._build_inventory_snapshot(inventory)
-        previous = last_snapshot or {}
-        changed = 0
-        keys = set(current) | set(previous)
-        for key in keys:
-            if current.get(key) != previous.get(key):
-                changed += 1
-        return changed
-
-    def _build_inventory_diff(self, inventory, last_snapshot):
-        current = self._build_inventory_snapshot(inventory)
-        previous = last_snapshot or {}
-        added = []
-        modified = []
-        removed = []
-
-        for rel_path in sorted(current):
-            if rel_path not in previous:
-                added.append(rel_path)
-            elif current[rel_path] != previous[rel_path]:
-                modified.append(rel_path)
-
-        for rel_path in sorted(previous):
-            if rel_path not in current:
-                removed.append(rel_path)
+        return self._build_inventory_diff(inventory, last_snapshot)["changed"]
+
+    def _build_inventory_diff(self, inventory, last_snapshot, current_key=None, previous_key=None):
+        return self._get_inventory_diff_engine().diff(
+            inventory,
+            last_snapshot,
+            current_key=current_key,
+            previous_key=previous_key,
+        )
 
+    def _last_upload_diff_args(self, inventory, signature=None):
+        project = self.current_project_data or {}
+        mod_dir = self.mod_path.get()
+        if signature is None and inventory is self.current_inventory:
+            signature = self.current_project_signature
+        if signature:
+            signature = self._publish_signature(mod_dir, inventory, signature)
+        if "last_upload_inventory" in project:
+            previous_key = None
+        else:
+            previous_key = project.get("last_upload_signature") or ""
         return {
-            "added": added,
-            "modified": modified,
-            "removed": removed,
+            "inventory": self._publish_inventory(mod_dir, inventory),
+            "last_snapshot": self._get_last_upload_snapshot(),
+            "current_key": signature,
+            "previous_key": previous_key,
+            "hasher": self._get_content_hasher() if self.content_hash_diff_var.get() else None,
         }
 
+    def _diff_against_last_upload(self, inventory, signature=None):
+        return self._get_inventory_diff_engine().diff(**self._last_upload_diff_args(inventory, signature))
+
+    def _build_publish_snapshot(self, inventory):
+        if not self.content_hash_diff_var.get():
+            return self._build_inventory_snapshot(inventory)
+        hasher = self._get_content_hasher()
+        hasher.seed(inventory, self._get_last_upload_snapshot())
+        hashes = hasher.hash_entries(inventory)
+        return self._get_inventory_diff_engine().build_snapshot(inventory, hashes=hashes)
+
+    def _on_content_hash_mode_changed(self):
+        mode = "content hashes" if self.content_hash_diff_var.get() else "size and timestamp"
+        self.log(f"Change tracking now compares {mode}.")
+        snapshot = self._get_last_upload_snapshot()
+        if self.content_hash_diff_var.get() and snapshot and not any(entry.get("hash") for entry in snapshot.values()):
+            self.log("The last publish snapshot has no file hashes; size and timestamp are compared until the next publish records them.")
+        self.save_config()
+        if self.current_inventory:
+            self._update_project_status(self.current_inventory)
+
+    def _get_last_upload_snapshot(self):
+        project = self.current_project_data or {}
+        inline = project.get("last_upload_inventory")
+        if inline is not None:
+            return inline
+        profile_path = project.get("profile_path") or self.current_project_profile_path
+        if not profile_path or not project.get("last_upload_signature"):
+            return {}
+        cache_key = (profile_path, project.get("last_upload_signature"))
+        if self._upload_snapshot_cache_key != cache_key:
+            self._upload_snapshot_cache = self.project_store.load_upload_snapshot(profile_path)
+            self._upload_snapshot_cache_key = cache_key
+        return self._upload_snapshot_cache
+
+    def _store_last_upload_snapshot(self, profile_path, snapshot):
+        snapshot = snapshot or {}
+        self.project_store.save_upload_snapshot(profile_path, snapshot)
+        self._upload_snapshot_cache = snapshot
+        self._upload_snapshot_cache_key = (profile_path, self.current_project_data.get("last_upload_signature"))
+
     def _build_project_payload(self):
         name = os.path.basename(self.mod_path.get().rstrip("\\/")) if self.mod_path.get() else "project"
         payload = {
@@ -512,9 +633,17 @@ class WorkshopUploader:
             payload["last_upload_at"] = self.current_project_data.get("last_upload_at")
         if self.current_project_data.get("last_uploaded_item_id"):
             payload["last_uploaded_item_id"] = self.current_project_data.get("last_uploaded_item_id")
+        if self.current_project_data.get("last_queue_result"):
+            payload["last_queue_result"] = self.current_project_data.get("last_queue_result")
+        if self.current_project_data.get("last_published_metadata"):
+            payload["last_published_metadata"] = self.current_project_data.get("last_published_metadata")
+        if self.current_project_data.get("upload_history"):
+            payload["upload_history"] = self.current_project_data.get("upload_history")
+        if self.current_project_data.get("last_opened"):
+            payload["last_opened"] = self.current_project_data.get("last_opened")
         return payload
 
-    def save_current_project_state(self, quiet=False):
+    def save_current_project_state(self, quiet=False, defer=False):
         mod_path = self.mod_path.get().strip()
         if not mod_path:
             if not quiet:
@@ -522,15 +651,20 @@ class WorkshopUploader:
             return None
 
         payload = self._build_project_payload()
+        payload.setdefault("last_opened", datetime.now(timezone.utc).isoformat())
         try:
-            profile_path = self.project_store.save_project(payload)
+            profile_path = self.project_store.save_project(payload, defer=defer)
         except Exception as e:
             if not quiet:
                 messagebox.showerror("Error", f"Failed to save project state: {e}")
             return None
 
         self.current_project_profile_path = profile_path
+        migrated_snapshot = payload.pop("last_upload_inventory", None)
         self.current_project_data = dict(payload, profile_path=profile_path)
+        if migrated_snapshot is not None:
+            self._upload_snapshot_cache = migrated_snapshot
+            self._upload_snapshot_cache_key = (profile_path, payload.get("last_upload_signature"))
         self.project_name_var.set(payload["project_name"].upper())
         self.project_hint_var.set(os.path.abspath(mod_path))
         self.refresh_recent_projects()
@@ -562,6 +696,11 @@ class WorkshopUploader:
 
     def _load_project_from_path(self, profile_path):
         data = self.project_store.load_project(profile_path)
+        data["last_opened"] = datetime.now(timezone.utc).isoformat()
+        try:
+            self.project_store.save_project(data, defer=True)
+        except Exception as e:
+            self.log(f"Could not update last opened time: {e}")
         self.current_project_profile_path = profile_path
         self.current_project_data = data
         self.autosave_suspended = True
@@ -737,11 +876,30 @@ class WorkshopUploader:
         else:
             self.last_upload_var.set("LAST PUBLISH: NONE")
 
-        if inventory is not None:
-            changed = self._count_changed_files(inventory, project.get("last_upload_inventory"))
+        self.project_status_token += 1
+        if inventory is None:
+            self.changed_since_upload_var.set("CHANGED FILES: UNKNOWN")
+        elif not self.content_hash_diff_var.get():
+            changed = self._diff_against_last_upload(inventory)["changed"]
             self.changed_since_upload_var.set(f"CHANGED FILES: {changed}")
         else:
-            self.changed_since_upload_var.set("CHANGED FILES: UNKNOWN")
+            self.changed_since_upload_var.set("CHANGED FILES: CHECKING...")
+            token = self.project_status_token
+            diff_args = self._last_upload_diff_args(inventory)
+            threading.Thread(target=self._project_status_diff_worker, args=(token, diff_args), daemon=True).start()
+
+    def _project_status_diff_worker(self, token, diff_args):
+        try:
+            changed = self._get_inventory_diff_engine().diff(**diff_args)["changed"]
+        except Exception as e:
+            self.log(f"Change check failed: {e}")
+            changed = "UNKNOWN"
+
+        def apply():
+            if token == self.project_status_token:
+                self.changed_since_upload_var.set(f"CHANGED FILES: {changed}")
+
+        self.root.after(0, apply)
 
     def refresh_current_project_readiness(self):
         mod_dir = self.mod_path.get().strip()
@@ -752,6 +910,7 @@ class WorkshopUploader:
         self.readiness_item_by_id = {}
         if not mod_dir or not os.path.exists(mod_dir):
             self.current_inventory = []
+            self.current_project_signature = None
             self.current_findings = None
             self.current_readiness = None
             self.readiness_summary_var.set("Readiness: Select a content folder.")
@@ -794,10 +953,14 @@ class WorkshopUploader:
         if findings["legacy_files"]:
             fixups.append(("legacy_files", f"Delete {len(findings['legacy_files'])} legacy .map files"))
 
-        changed = self._count_changed_files(inventory, self.current_project_data.get("last_upload_inventory"))
-        diff = self._build_inventory_diff(inventory, self.current_project_data.get("last_upload_inventory"))
+        diff_args = self._last_upload_diff_args(inventory)
+        diff = self._get_inventory_diff_engine().diff(**diff_args)
+        changed = diff["changed"]
+        upload_bytes = self._get_inventory_diff_engine().changed_bytes(diff_args["inventory"], diff)
+        upload_history = (self.current_project_data or {}).get("upload_history")
         changed_preview = []
-        for label, paths in (("Added", diff["added"]), ("Modified", diff["modified"]), ("Removed", diff["removed"])):
+        renamed = [f"{old} -> {new}" for old, new in diff["renamed"]]
+        for label, paths in (("Added", diff["added"]), ("Modified", diff["modified"]), ("Renamed", renamed), ("Removed", diff["removed"])):
             for rel_path in paths[:4]:
                 changed_preview.append(f"{label}: {rel_path}")
                 if len(changed_preview) >= 10:
@@ -815,6 +978,8 @@ class WorkshopUploader:
             "change_note": self.note_var.get().strip(),
             "changed_files": changed,
             "changed_preview": changed_preview,
+            "upload_bytes": upload_bytes,
+            "upload_estimate": self._get_upload_history().describe(upload_history, upload_bytes),
             "blockers": blockers,
             "warnings": warnings,
             "fixups": fixups,
@@ -918,8 +1083,8 @@ class WorkshopUploader:
             return
 
         inventory = self.current_inventory or self._build_mod_inventory(self.mod_path.get())
-        diff = self._build_inventory_diff(inventory, self.current_project_data.get("last_upload_inventory"))
-        snapshot_exists = bool(self.current_project_data.get("last_upload_inventory"))
+        diff = self._diff_against_last_upload(inventory)
+        snapshot_exists = bool(self._get_last_upload_snapshot())
         current_paths = {entry["rel_path"]: entry["path"] for entry in inventory}
 
         win = tk.Toplevel(self.root)
@@ -932,6 +1097,7 @@ class WorkshopUploader:
         summary = (
             f"Added: {len(diff['added'])}    "
             f"Modified: {len(diff['modified'])}    "
+            f"Renamed: {len(diff['renamed'])}    "
             f"Removed: {len(diff['removed'])}"
         )
         ttk.Label(win, text=summary, foreground="#ffff44", background="#1a1a1a").pack(anchor="w", padx=12, pady=(0, 8))
@@ -957,11 +1123,14 @@ class WorkshopUploader:
         for rel_path in diff["modified"]:
             item_id = tree.insert("", "end", values=("Modified", rel_path))
             item_paths[item_id] = current_paths.get(rel_path, "")
+        for old_path, new_path in diff["renamed"]:
+            item_id = tree.insert("", "end", values=("Renamed", f"{old_path} -> {new_path}"))
+            item_paths[item_id] = current_paths.get(new_path, "")
         for rel_path in diff["removed"]:
             item_id = tree.insert("", "end", values=("Removed", rel_path))
             item_paths[item_id] = ""
 
-        if not (diff["added"] or diff["modified"] or diff["removed"]):
+        if not diff["changed"]:
             tree.insert("", "end", values=("None", "No changes since the last publish snapshot."))
 
         def open_selected():
@@ -1010,6 +1179,7 @@ class WorkshopUploader:
             f"Preview: {plan['preview']}",
             f"Auth: {plan['auth_mode']}",
             f"Changed files since last publish: {plan['changed_files']}",
+            f"Estimated upload: {plan['upload_estimate']}",
             f"Change note: {plan['change_note'] or '(empty)'}",
             "",
             f"Blocking: {len(plan['blockers'])}",
@@ -1084,6 +1254,7 @@ class WorkshopUploader:
 
     def _get_workshop_backend(self):
         self.workshop_backend.logger = self.log
+        self.workshop_backend.log_reader.logger = self.log
         self.workshop_backend.steam_service = self._get_steam_service()
         return self.workshop_backend
 
@@ -1097,6 +1268,40 @@ class WorkshopUploader:
         self.content_fixer.logger = self.log
         return self.content_fixer
 
+    def _get_inventory_diff_engine(self):
+        self.inventory_diff_engine.logger = self.log
+        return self.inventory_diff_engine
+
+    def _get_content_hasher(self):
+        self.content_hasher.logger = self.log
+        return self.content_hasher
+
+    def _get_library_cache(self):
+        self.library_cache.logger = self.log
+        self.library_cache.file_manager = self._get_file_manager()
+        return self.library_cache
+
+    def _get_batch_client(self):
+        self.batch_client.async_client.workshop_backend = self._get_workshop_backend()
+        self.batch_client.async_client.logger = self.log
+        return self.batch_client
+
+    def _get_upload_history(self):
+        self.upload_history.logger = self.log
+        return self.upload_history
+
+    def _get_upload_stager(self):
+        self.upload_stager.logger = self.log
+        return self.upload_stager
+
+    def _get_publish_queue(self):
+        self.publish_queue.project_store = self.project_store
+        self.publish_queue.mod_scanner = self._get_mod_scanner()
+        self.publish_queue.preflight = self._get_upload_preflight()
+        self.publish_queue.inventory_diff_engine = self._get_inventory_diff_engine()
+        self.publish_queue.logger = self.log
+        return self.publish_queue
+
     def _get_file_manager(self):
         self.file_manager.logger = self.log
         self.file_manager.has_pil = HAS_PIL
@@ -1260,9 +1465,75 @@ class WorkshopUploader:
             self.steamcmd_status_var.set("SteamCMD: missing")
         elif os.path.exists(path):
             self.steamcmd_status_var.set("SteamCMD: found")
+            self._schedule_steamcmd_prewarm()
         else:
             self.steamcmd_status_var.set("SteamCMD: not found")
 
+    def _schedule_steamcmd_prewarm(self):
+        if not self.prewarm_steamcmd_var.get():
+            return
+        if self.steamcmd_prewarm_token:
+            try:
+                self.root.after_cancel(self.steamcmd_prewarm_token)
+            except Exception:
+                pass
+        self.steamcmd_prewarm_token = self.root.after(STEAMCMD_PREWARM_DELAY_MS, self.start_steamcmd_prewarm)
+
+    def _on_prewarm_steamcmd_changed(self):
+        self.save_config()
+        if self.prewarm_steamcmd_var.get():
+            self.steamcmd_prewarmed_path = None
+            self.start_steamcmd_prewarm()
+
+    def start_steamcmd_prewarm(self):
+        self.steamcmd_prewarm_token = None
+        exe = self.steamcmd_path.get().strip()
+        if not self.prewarm_steamcmd_var.get() or not exe or not os.path.exists(exe):
+            return False
+        if not self.steamcmd_prewarm_done.is_set() or os.path.abspath(exe) == self.steamcmd_prewarmed_path:
+            return False
+        with self._busy_lock:
+            publishing = bool({"Upload", "Publish Queue"} & self._active_operations)
+        if publishing:
+            return False
+        self.steamcmd_prewarmed_path = os.path.abspath(exe)
+        self.steamcmd_prewarm_done.clear()
+        self.steamcmd_status_var.set("SteamCMD: warming up...")
+        threading.Thread(target=self._steamcmd_prewarm_worker, args=(exe,), daemon=True).start()
+        return True
+
+    def _steamcmd_prewarm_worker(self, exe):
+        try:
+            if self.persistent_steamcmd_var.get():
+                started = time.monotonic()
+                self._get_steamcmd_session(exe).start()
+                status = f"SteamCMD: ready, session open ({time.monotonic() - started:.0f}s)"
+            else:
+                result = self._get_workshop_backend().prewarm_steamcmd(exe, is_windows=IS_WINDOWS)
+                if result["success"]:
+                    label = "updated and ready" if result["updated"] else "ready"
+                    status = f"SteamCMD: {label} ({result['elapsed']:.0f}s)"
+                else:
+                    status = f"SteamCMD: prewarm failed (code {result['returncode']})"
+                    tail = "\n".join(result["output"].splitlines()[-5:])
+                    self.log(f"SteamCMD prewarm exited with code {result['returncode']}.\n{tail}")
+        except subprocess.TimeoutExpired:
+            status = "SteamCMD: prewarm timed out"
+            self.log("SteamCMD prewarm timed out; the first publish may still wait for an update.")
+        except Exception as e:
+            self.steamcmd_prewarmed_path = None
+            status = "SteamCMD: prewarm failed"
+            self.log(f"SteamCMD prewarm failed: {e}")
+        finally:
+            self.steamcmd_prewarm_done.set()
+        self.root.after(0, lambda: self.steamcmd_status_var.set(status))
+
+    def _wait_for_steamcmd_prewarm(self):
+        if self.steamcmd_prewarm_done.is_set():
+            return
+        self.log("Waiting for the SteamCMD update check to finish...")
+        self.steamcmd_prewarm_done.wait()
+
     def on_close(self):
         self.save_config()
         if self.project_autosave_token:
@@ -1270,6 +1541,12 @@ class WorkshopUploader:
                 self.root.after_cancel(self.project_autosave_token)
             except Exception:
                 pass
+            self.project_autosave_token = None
+            self.save_current_project_state(quiet=True)
+        try:
+            self._get_file_manager().flush_pending_writes()
+        except Exception:
+            pass
         # Cancel any active QR polling
         if getattr(self, "qr_poll_timer", None):
             self.root.after_cancel(self.qr_poll_timer)
@@ -1279,6 +1556,13 @@ class WorkshopUploader:
             try:
                 self.steamcmd_process.terminate()
             except: pass
+        self.close_steamcmd_session()
+
+        try:
+            self._get_workshop_backend().close()
+            self.steam_service.close()
+        except Exception:
+            pass
 
         # Clean up temp preview files
         try:
@@ -1399,6 +1683,7 @@ class WorkshopUploader:
         btn_row.pack(fill="x", pady=(8, 0))
         ttk.Button(btn_row, text="OPEN", command=self.open_selected_project).pack(side="left")
         ttk.Button(btn_row, text="SAVE", command=self.save_current_project_state).pack(side="left", padx=4)
+        ttk.Button(btn_row, text="PUBLISH QUEUE", command=self.publish_selected_projects).pack(side="left")
         ttk.Button(btn_row, text="EXPORT", command=self.save_profile).pack(side="right")
         ttk.Button(btn_row, text="IMPORT", command=self.load_profile).pack(side="right", padx=4)
 
@@ -1430,15 +1715,19 @@ class WorkshopUploader:
 
         tree_frame = ttk.Frame(frame)
         tree_frame.pack(fill="both", expand=True)
-        self.tree = ttk.Treeview(tree_frame, columns=("Title", "ID", "Visibility", "Updated"), show="headings", height=10)
+        self.tree = ttk.Treeview(tree_frame, columns=("Title", "ID", "Visibility", "Updated", "Size", "Tags"), show="headings", height=10)
         self.tree.heading("Title", text="Title")
         self.tree.heading("ID", text="Workshop ID")
         self.tree.heading("Visibility", text="Visibility")
         self.tree.heading("Updated", text="Updated")
+        self.tree.heading("Size", text="Size")
+        self.tree.heading("Tags", text="Tags")
         self.tree.column("Title", width=220)
         self.tree.column("ID", width=110, anchor="center")
         self.tree.column("Visibility", width=90, anchor="center")
         self.tree.column("Updated", width=120, anchor="center")
+        self.tree.column("Size", width=80, anchor="center")
+        self.tree.column("Tags", width=160)
         lib_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=lib_scroll.set)
         self.tree.pack(side="left", fill="both", expand=True)
@@ -1524,6 +1813,12 @@ class WorkshopUploader:
         watch_row.grid(row=3, column=1, columnspan=3, sticky="w", pady=(0, 8))
         watch_cb = ttk.Checkbutton(watch_row, text="WATCH FOR CHANGES", variable=self.watch_mode_var, command=self.toggle_watch_mode)
         watch_cb.pack(side="left")
+        hash_cb = ttk.Checkbutton(watch_row, text="COMPARE FILE CONTENTS", variable=self.content_hash_diff_var, command=self._on_content_hash_mode_changed)
+        hash_cb.pack(side="left", padx=(10, 0))
+        stage_cb = ttk.Checkbutton(watch_row, text="STAGE FILTERED COPY", variable=self.stage_upload_var, command=self.save_config)
+        stage_cb.pack(side="left", padx=(10, 0))
+        orphan_cb = ttk.Checkbutton(watch_row, text="DROP ORPHANS", variable=self.stage_prune_orphans_var, command=self.save_config)
+        orphan_cb.pack(side="left", padx=(10, 0))
 
         ttk.Label(frame, text="Preview Image:").grid(row=4, column=0, sticky="w", pady=5)
         ttk.Entry(frame, textvariable=self.preview_path).grid(row=4, column=1, columnspan=2, sticky="ew", padx=5, pady=5)
@@ -1559,6 +1854,16 @@ class WorkshopUploader:
         self.upload_btn.pack(side="left", fill="x", expand=True, ipady=6)
         self.logs_btn = ttk.Button(actions, text="STEAM LOGS", command=self.show_steam_logs)
         self.logs_btn.pack(side="right", padx=(6, 0))
+        stream_cb = ttk.Checkbutton(actions, text="LIVE PROGRESS", variable=self.stream_steamcmd_var, command=self.save_config)
+        stream_cb.pack(side="right", padx=(6, 0))
+        session_cb = ttk.Checkbutton(actions, text="KEEP STEAMCMD OPEN", variable=self.persistent_steamcmd_var, command=self._on_persistent_steamcmd_changed)
+        session_cb.pack(side="right", padx=(6, 0))
+        prewarm_cb = ttk.Checkbutton(actions, text="PREWARM STEAMCMD", variable=self.prewarm_steamcmd_var, command=self._on_prewarm_steamcmd_changed)
+        prewarm_cb.pack(side="right", padx=(6, 0))
+        metadata_cb = ttk.Checkbutton(actions, text="METADATA-ONLY IF UNCHANGED", variable=self.metadata_only_var, command=self.save_config)
+        metadata_cb.pack(side="right", padx=(6, 0))
+
+        ttk.Label(frame, textvariable=self.upload_progress_var, foreground="#ffff44").grid(row=12, column=0, columnspan=4, sticky="w", pady=(6, 0))
 
         self._update_upload_mode_indicator()
 
@@ -1718,6 +2023,26 @@ class WorkshopUploader:
         return True
 
     def _test_steamcmd_login_worker(self, exe, user, pwd, use_cached, guard_code):
+        self._wait_for_steamcmd_prewarm()
+        if self._use_steamcmd_session(user, "" if use_cached else pwd, "" if use_cached else guard_code):
+            try:
+                ok, failure, _output = self._get_steamcmd_session(exe).ensure_ready(
+                    user, pwd=pwd, use_cached=use_cached, guard_code=guard_code, force_login=True,
+                )
+                if ok:
+                    self.root.after(0, lambda: self.steam_login_status_var.set("Steam login: verified (session open)"))
+                    self.root.after(0, lambda: self.log("SteamCMD login check passed; session kept open for publishing."))
+                else:
+                    self.root.after(0, lambda: self.steam_login_status_var.set("Steam login: failed"))
+                    self.root.after(0, lambda: self.log(f"SteamCMD login check failed: {failure}"))
+            except Exception as e:
+                self.close_steamcmd_session()
+                self.root.after(0, lambda: self.steam_login_status_var.set("Steam login: failed"))
+                self.root.after(0, lambda: self.log(f"SteamCMD login check failed: {e}"))
+            finally:
+                self._set_busy("SteamCMD Login Test", False)
+            return
+
         try:
             result = self._get_workshop_backend().test_steamcmd_login(
                 exe=exe,
@@ -1833,6 +2158,7 @@ class WorkshopUploader:
         if self.watch_mode_var.get():
             self.log("Watch Mode enabled.")
             self.last_watch_signature = None
+            self.last_watch_tree = None
             self.last_watch_summary = None
             if not self.watch_thread or not self.watch_thread.is_alive():
                 self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
@@ -1840,6 +2166,7 @@ class WorkshopUploader:
         else:
             self.log("Watch Mode disabled.")
             self.last_watch_signature = None
+            self.last_watch_tree = None
             self.last_watch_summary = None
 
     def _watch_loop(self):
@@ -1849,16 +2176,25 @@ class WorkshopUploader:
             if mod_dir and os.path.exists(mod_dir):
                 try:
                     inventory = self._build_mod_inventory(mod_dir)
-                    current_signature = self._fingerprint_inventory(inventory)
+                    current_tree = self._get_mod_scanner().fingerprint_tree(inventory)
+                    current_signature = current_tree[""]
 
                     if self.last_watch_signature is None:
                         self.last_watch_signature = current_signature
+                        self.last_watch_tree = current_tree
                         self.root.after(0, self.refresh_current_project_readiness)
                     elif current_signature != self.last_watch_signature:
+                        changed_dirs = self._get_mod_scanner().locate_changed_directories(self.last_watch_tree, current_tree)
+                        changed_labels = [
+                            f"{name}/" for name in changed_dirs
+                            if name and not any(other.startswith(f"{name}/") for other in changed_dirs)
+                        ] or ["content root"]
                         self.last_watch_signature = current_signature
-                        self.log("Change detected! Scanning...")
+                        self.last_watch_tree = current_tree
+                        self.log(f"Change detected in {', '.join(changed_labels[:5])}! Scanning...")
                         findings = self._collect_mod_findings(mod_dir, inventory=inventory)
                         self.current_inventory = inventory
+                        self.current_project_signature = current_signature
                         self.current_findings = findings
                         summary = (
                             len(findings["issues"]),
@@ -1933,6 +2269,13 @@ class WorkshopUploader:
 
             self.qr_session_id = client_id
             self.qr_request_id = request_id
+            try:
+                interval = float(res.get("interval") or QR_POLL_DEFAULT_INTERVAL)
+            except (TypeError, ValueError):
+                interval = QR_POLL_DEFAULT_INTERVAL
+            self.qr_poll_interval = min(max(interval, 1.0), QR_POLL_MAX_INTERVAL)
+            self.qr_poll_failures = 0
+            self.qr_expires_at = time.monotonic() + QR_SESSION_TIMEOUT_SECONDS
             self.steam_login_status_var.set("Steam login: QR pending")
             
             # Step 2: Show QR Window
@@ -1969,6 +2312,19 @@ class WorkshopUploader:
         self.qr_label = tk.Label(qr_frame, text="Loading QR...", bg="#ffffff", fg="#000000")
         self.qr_label.pack()
 
+        ttk.Label(self.qr_win, text="1. Open Steam Mobile App\n2. Go to Steam Guard\n3. Select 'Scan a QR Code'", background="#1a1a1a", foreground="#d4d4d4", justify="left").pack(pady=10)
+        self.qr_link_box = tk.Text(self.qr_win, height=3, wrap="word", bg="#050505", fg="#d4d4d4", insertbackground="#d4d4d4", font=("Consolas", 9))
+        self.qr_link_box.pack(fill="x", padx=20, pady=(0, 10))
+        self._render_qr_challenge(challenge_url)
+        
+        cancel_btn = ttk.Button(self.qr_win, text="CANCEL", command=self.cancel_qr_login)
+        cancel_btn.pack(pady=(10, 20))
+        
+        self.qr_win.protocol("WM_DELETE_WINDOW", self.cancel_qr_login)
+        self.qr_win.transient(self.root)
+        self.qr_win.grab_set()
+
+    def _render_qr_challenge(self, challenge_url):
         try:
             if HAS_PIL and HAS_QRCODE:
                 qr_img = qrcode.make(challenge_url).resize((250, 250))
@@ -1981,22 +2337,21 @@ class WorkshopUploader:
         except Exception as e:
             self.qr_label.config(text=f"Failed to render QR\n{e}")
 
-        ttk.Label(self.qr_win, text="1. Open Steam Mobile App\n2. Go to Steam Guard\n3. Select 'Scan a QR Code'", background="#1a1a1a", foreground="#d4d4d4", justify="left").pack(pady=10)
-        link_box = tk.Text(self.qr_win, height=3, wrap="word", bg="#050505", fg="#d4d4d4", insertbackground="#d4d4d4", font=("Consolas", 9))
-        link_box.pack(fill="x", padx=20, pady=(0, 10))
-        link_box.insert("1.0", challenge_url)
-        link_box.config(state="disabled")
-        
-        cancel_btn = ttk.Button(self.qr_win, text="CANCEL", command=self.cancel_qr_login)
-        cancel_btn.pack(pady=(10, 20))
-        
-        self.qr_win.protocol("WM_DELETE_WINDOW", self.cancel_qr_login)
-        self.qr_win.transient(self.root)
-        self.qr_win.grab_set()
+        self.qr_link_box.config(state="normal")
+        self.qr_link_box.delete("1.0", "end")
+        self.qr_link_box.insert("1.0", challenge_url)
+        self.qr_link_box.config(state="disabled")
+
+    def _schedule_qr_poll(self, delay_seconds):
+        self.qr_poll_timer = self.root.after(int(delay_seconds * 1000), self.poll_qr_status)
 
     def poll_qr_status(self):
+        self.qr_poll_timer = None
         if not self.qr_session_id: return
-        
+        if self.qr_expires_at is not None and time.monotonic() >= self.qr_expires_at:
+            self._end_qr_session("QR session expired. Start QR WEB CHECK again to get a new code.", "Steam login: QR expired")
+            return
+
         try:
             r = self._get_steam_service().poll_qr_auth_session(
                 client_id=self.qr_session_id,
@@ -2004,30 +2359,42 @@ class WorkshopUploader:
                 timeout=5,
             )
             if r.status_code == 404: # Session expired or invalid
-                self.log("QR Session expired.")
-                self.cancel_qr_login()
+                self._end_qr_session("QR session expired.", "Steam login: QR expired")
                 return
 
             res = r.json().get("response", {})
-            # Possible results: 
+            # Possible results:
             # - Empty: still waiting
+            # - new_challenge_url: Steam rotated the code, redraw it
             # - refresh_token: success
-            
+
             if res.get("refresh_token"):
                 self.handle_qr_success(res)
                 return
-            
-            # Poll again in 2 seconds
-            self.qr_poll_timer = self.root.after(2000, self.poll_qr_status)
-            
+
+            if res.get("new_client_id"):
+                self.qr_session_id = res["new_client_id"]
+            if res.get("new_challenge_url") and hasattr(self, "qr_label"):
+                self._render_qr_challenge(res["new_challenge_url"])
+
+            self.qr_poll_failures = 0
+            self._schedule_qr_poll(self.qr_poll_interval)
+
         except Exception as e:
             status = getattr(getattr(e, "response", None), "status_code", None)
-            if status == 404:
-                self.log("QR Session expired.")
-                self.cancel_qr_login()
+            if status in (400, 404, 410):
+                self._end_qr_session("QR session expired.", "Steam login: QR expired")
                 return
-            # Minor errors (timeout etc) are ignored during polling
-            self.qr_poll_timer = self.root.after(2000, self.poll_qr_status)
+            self.qr_poll_failures += 1
+            if self.qr_poll_failures >= QR_POLL_MAX_FAILURES:
+                self._end_qr_session(
+                    f"QR polling stopped after {self.qr_poll_failures} failed attempts: {self._friendly_api_error(e)}",
+                    "Steam login: QR failed",
+                )
+                return
+            delay = min(QR_POLL_MAX_INTERVAL, self.qr_poll_interval * (2 ** self.qr_poll_failures))
+            self.log(f"QR status check failed ({self._friendly_api_error(e)}); retrying in {delay:.0f}s.")
+            self._schedule_qr_poll(delay)
 
     def handle_qr_success(self, res):
         self.log("QR session confirmed.")
@@ -2047,18 +2414,23 @@ class WorkshopUploader:
             self.qr_win.destroy()
         self.qr_session_id = None
         self.qr_request_id = None
+        self.qr_expires_at = None
 
-    def cancel_qr_login(self):
+    def _end_qr_session(self, message, status_text):
         if self.qr_poll_timer:
             self.root.after_cancel(self.qr_poll_timer)
             self.qr_poll_timer = None
         self.qr_session_id = None
         self.qr_request_id = None
+        self.qr_expires_at = None
         if hasattr(self, 'qr_win'):
             self.qr_win.destroy()
         if hasattr(self, "steam_login_status_var"):
-            self.steam_login_status_var.set("Steam login: QR cancelled")
-        self.log("QR Login cancelled.")
+            self.steam_login_status_var.set(status_text)
+        self.log(message)
+
+    def cancel_qr_login(self):
+        self._end_qr_session("QR Login cancelled.", "Steam login: QR cancelled")
 
     def _toggle_auth_fields(self, *args):
         is_busy = bool(self._active_operations)
@@ -2240,6 +2612,14 @@ class WorkshopUploader:
         inventory = self._build_mod_inventory(content)
         findings = self._collect_mod_findings(content, inventory=inventory)
         plan = self._build_publish_plan(content, preview, use_cached, findings, inventory)
+        metadata = self._current_published_metadata()
+        metadata_changes = self._metadata_only_changes(self._publish_signature(content, inventory), metadata)
+        if self._nothing_to_publish(metadata_changes):
+            return
+        if metadata_changes is not None:
+            plan["mode"] = f"METADATA ONLY ({plan['item_id']}): {', '.join(metadata_changes)}"
+        else:
+            self.log(f"Estimated upload: {plan['upload_estimate']}")
 
         if hasattr(self, "readiness_tree"):
             publish_ok, selected_fixups = self._confirm_publish_review(plan, findings)
@@ -2252,40 +2632,295 @@ class WorkshopUploader:
         if selected_fixups:
             findings = self._apply_publish_fixups(findings, selected_fixups)
             inventory = self.current_inventory or self._build_mod_inventory(content)
+            metadata_changes = self._metadata_only_changes(self._publish_signature(content, inventory), metadata)
+            if self._nothing_to_publish(metadata_changes):
+                return
 
         self.save_config()
         self.save_current_project_state(quiet=True)
-        
-        # Create VDF
+
+        vdf_fields = {
+            "appid": self.games[self.game_var.get()]["appid"],
+            "publishedfileid": self.item_id_var.get(),
+            "previewfile": preview,
+            "visibility": self._visibility_code(),
+            "title": self.title_var.get(),
+            "description": desc,
+            "changenote": self.note_var.get(),
+        }
+        self.pending_publish_signature = self._publish_signature(content, inventory)
+        self.pending_publish_metadata = metadata
+        self.pending_publish_bytes = plan["upload_bytes"]
+        if metadata_changes is not None:
+            self._set_busy("Upload", True)
+            threading.Thread(target=self._metadata_update_worker, args=(metadata_changes, sc, user, pwd, vdf_fields), daemon=True).start()
+            return
+
+        # Run SteamCMD
+        # We use a separate thread to not freeze UI, but we might need a new console for 2FA
+        self._set_busy("Upload", True)
+        threading.Thread(target=self._content_upload_worker, args=(sc, user, pwd, content, inventory, vdf_fields), daemon=True).start()
+
+    def _content_upload_worker(self, exe, user, pwd, content, inventory, vdf_fields):
         try:
-            appid = self.games[self.game_var.get()]["appid"]
-            vis = self._visibility_code()
+            content_dir, publish_inventory = self._stage_upload_content(content, inventory)
+            if publish_inventory is not inventory:
+                self._refine_upload_estimate(publish_inventory)
             vdf_path = self._get_upload_preflight().write_upload_vdf(
                 base_dir=self.base_dir,
-                appid=appid,
-                publishedfileid=self.item_id_var.get(),
-                contentfolder=content,
-                previewfile=preview,
-                visibility=vis,
-                title=self.title_var.get(),
-                description=desc,
-                changenote=self.note_var.get(),
+                contentfolder=content_dir,
                 build_upload_vdf_content=self._build_upload_vdf_content,
+                **vdf_fields,
             )
             self.log(f"Generated VDF at {vdf_path}")
-            
         except Exception as e:
             self.log(f"Error creating VDF: {e}")
+            self.pending_publish_signature = None
+            self.pending_publish_metadata = None
+            self.pending_publish_bytes = 0
+            self._set_busy("Upload", False)
             return
+        self.run_steamcmd(exe, user, pwd, vdf_path, publish_inventory)
+
+    def _refine_upload_estimate(self, publish_inventory):
+        args = self._last_upload_diff_args(publish_inventory)
+        args.update(inventory=publish_inventory, current_key=None)
+        engine = self._get_inventory_diff_engine()
+        upload_bytes = engine.changed_bytes(publish_inventory, engine.diff(**args))
+        if upload_bytes != self.pending_publish_bytes:
+            self.pending_publish_bytes = upload_bytes
+            history = (self.current_project_data or {}).get("upload_history")
+            self.log(f"Staged upload estimate: {self._get_upload_history().describe(history, upload_bytes)}")
+
+    def _record_upload_throughput(self, elapsed, use_cached):
+        transfer = self.pending_publish_transfer
+        size = self.pending_publish_bytes
+        if transfer and transfer[0]:
+            seconds, source = transfer[1], "stream"
+        elif use_cached:
+            seconds, source = elapsed, "wall"
+        else:
+            return
+        if not size:
+            return
+        history = self._get_upload_history().record(self.current_project_data.get("upload_history"), size, seconds, source=source)
+        self.current_project_data["upload_history"] = history
+        self.log(f"Recorded upload throughput: {size / (1024 * 1024):.1f} MB in {seconds:.0f}s.")
 
-        # Run SteamCMD
-        # We use a separate thread to not freeze UI, but we might need a new console for 2FA
-        self.pending_publish_signature = self._fingerprint_inventory(inventory)
-        self.pending_publish_inventory = self._build_inventory_snapshot(inventory)
-        self._set_busy("Upload", True)
-        threading.Thread(target=self.run_steamcmd, args=(sc, user, pwd, vdf_path), daemon=True).start()
+    def _stage_upload_content(self, mod_dir, inventory):
+        if not self.stage_upload_var.get():
+            return mod_dir, inventory
+        try:
+            orphans = None
+            if self.stage_prune_orphans_var.get():
+                orphans = self._get_memory_analyzer().analyze(mod_dir)["orphans"]
+                self.staged_orphans[os.path.abspath(mod_dir)] = orphans
+            summary = self._get_upload_stager().stage(mod_dir, inventory, orphans=orphans)
+            return summary["path"], summary["entries"]
+        except Exception as e:
+            self.log(f"Upload staging failed ({e}); uploading the content folder directly.")
+            return mod_dir, inventory
+
+    def _publish_inventory(self, mod_dir, inventory):
+        if not self.stage_upload_var.get() or not mod_dir:
+            return inventory
+        orphans = None
+        if self.stage_prune_orphans_var.get():
+            orphans = self.staged_orphans.get(os.path.abspath(mod_dir))
+        kept, _skipped = self._get_upload_stager().select_files(mod_dir, inventory, orphans=orphans)
+        return [entry for _rel_path, entry in kept]
+
+    def _publish_settings_key(self, mod_dir):
+        if not self.stage_upload_var.get():
+            return ""
+        patterns = self._get_upload_stager().load_ignore_patterns(mod_dir)
+        return "\n".join(["prune-orphans" if self.stage_prune_orphans_var.get() else "keep-orphans"] + patterns)
+
+    def _publish_signature(self, mod_dir, inventory, fingerprint=None):
+        fingerprint = fingerprint or self._fingerprint_inventory(inventory)
+        settings = self._publish_settings_key(mod_dir)
+        if not fingerprint or not settings:
+            return fingerprint
+        return hashlib.sha1(f"{fingerprint}\0{settings}".encode("utf-8", errors="ignore")).hexdigest()
+
+    def _current_published_metadata(self):
+        return self._get_upload_preflight().build_published_metadata(
+            title=self.title_var.get(),
+            description=self._get_desc_text_value(),
+            visibility=self._visibility_code(),
+            tags=self.tags_var.get(),
+            preview_path=self.preview_path.get(),
+        )
+
+    def _metadata_only_changes(self, signature, metadata):
+        if not self.metadata_only_var.get():
+            return None
+        item_id = self.item_id_var.get().strip()
+        if not item_id.isdigit() or item_id == "0":
+            return None
+        project = self.current_project_data or {}
+        if not signature or project.get("last_upload_signature") != signature:
+            return None
+        if project.get("last_uploaded_item_id") and project.get("last_uploaded_item_id") != item_id:
+            return None
+        return self._get_upload_preflight().changed_metadata_fields(project.get("last_published_metadata"), metadata)
+
+    def _nothing_to_publish(self, metadata_changes):
+        if metadata_changes is None or metadata_changes:
+            return False
+        self.log("Content and metadata are unchanged since the last publish; nothing was sent to Steam.")
+        messagebox.showinfo("Nothing to Publish", "Content and metadata are unchanged since the last publish.")
+        return True
+
+    def _metadata_update_worker(self, changes, exe, user, pwd, vdf_fields):
+        metadata = self.pending_publish_metadata
+        item_id = self.item_id_var.get().strip()
+        self.log(f"Content is unchanged since the last publish; updating metadata only ({', '.join(changes)})...")
+        try:
+            result = self._get_workshop_backend().update_workshop_metadata(
+                api_key=self.api_key_var.get(),
+                item_id=item_id,
+                appid=self.games[self.game_var.get()]["appid"],
+                title=metadata["title"],
+                description=metadata["description"],
+                visibility=metadata["visibility"],
+                preview_path=self.preview_path.get() if "preview" in changes else None,
+                tags=list(metadata["tags"]) if "tags" in changes else None,
+                change_note=self.note_var.get(),
+                steamworks_updater=self._get_steamworks_tag_updater(),
+                base_dir=self.base_dir,
+                create_appid_file=self.experimental_native_appid_var.get(),
+            )
+        except Exception as e:
+            self.log(f"Metadata-only update failed ({self._friendly_api_error(e)}); running a full SteamCMD build instead.")
+            if "tags" in changes and not metadata["tags"]:
+                previous = (self.current_project_data or {}).get("last_published_metadata") or {}
+                self.pending_publish_metadata = dict(metadata, tags=previous.get("tags") or [])
+                self.log("A SteamCMD build cannot remove Workshop tags; remove them on the Workshop page or retry with Steamworks available.")
+            content = self.mod_path.get()
+            self._content_upload_worker(exe, user, pwd, content, self.current_inventory or self._build_mod_inventory(content), vdf_fields)
+            return
+
+        try:
+            method = "Steamworks" if result.get("method") == "steamworks" else "Web API"
+            self.log(f"Workshop metadata updated via {method}; no content was uploaded.")
+            self.current_project_data.update({
+                "last_upload_at": datetime.now(timezone.utc).isoformat(),
+                "last_uploaded_item_id": item_id,
+                "last_published_metadata": metadata,
+            })
+            self.save_current_project_state(quiet=True)
+            self._update_project_status(self.current_inventory)
+            self.root.after(0, lambda: messagebox.showinfo("Success", f"Workshop metadata updated via {method}.\nContent was unchanged, so SteamCMD was skipped."))
+        finally:
+            self.pending_publish_signature = None
+            self.pending_publish_metadata = None
+            self.pending_publish_bytes = 0
+            self.pending_publish_transfer = None
+            self._set_busy("Upload", False)
+
+    def _get_steamcmd_session(self, exe):
+        if self.steamcmd_session is not None and os.path.abspath(self.steamcmd_session.exe) != os.path.abspath(exe):
+            self.close_steamcmd_session()
+        if self.steamcmd_session is None:
+            self.steamcmd_session = SteamCmdSession(exe, logger=self.log, is_windows=IS_WINDOWS)
+        self.steamcmd_session.logger = self.log
+        return self.steamcmd_session
+
+    def _use_steamcmd_session(self, user, pwd="", guard_code=""):
+        if not self.persistent_steamcmd_var.get():
+            return False
+        if SteamCmdSession.accepts_credentials(user, pwd, guard_code):
+            return True
+        self.log("The Steam username or password contains a double quote, which the SteamCMD console cannot accept; using a one-shot SteamCMD run instead.")
+        return False
+
+    def close_steamcmd_session(self):
+        session = self.steamcmd_session
+        self.steamcmd_session = None
+        if session is not None:
+            try:
+                session.close()
+            except Exception as e:
+                self.log(f"Error closing SteamCMD session: {e}")
 
-    def run_steamcmd(self, exe, user, pwd, vdf):
+    def _on_persistent_steamcmd_changed(self):
+        if not self.persistent_steamcmd_var.get():
+            threading.Thread(target=self.close_steamcmd_session, daemon=True).start()
+        self.save_config()
+
+    def _execute_steamcmd_in_session(self, exe, user, pwd, vdf, use_cached, guard_code):
+        session = self._get_steamcmd_session(exe)
+        self.root.after(0, lambda: self.upload_progress_var.set("Connecting to SteamCMD session..."))
+        ok, failure, _output = session.ensure_ready(user, pwd=pwd, use_cached=use_cached, guard_code=guard_code)
+        if not ok:
+            self.root.after(0, lambda: self.upload_progress_var.set(f"Login failed: {failure}"))
+            return 1, failure
+
+        parser = SteamCmdProgressParser()
+        parser.phase = "login"
+
+        def on_update(progress):
+            text = progress.describe()
+            self.root.after(0, lambda: self.upload_progress_var.set(text))
+
+        ok, failure, _output = session.build_item(vdf, parser=parser, on_update=on_update)
+        self.pending_publish_transfer = (parser.bytes_total, time.monotonic() - parser.started_at, "stream")
+        if ok:
+            parser.phase = "success"
+        final_text = parser.describe()
+        self.root.after(0, lambda: self.upload_progress_var.set(final_text))
+        return (0 if ok else 1), failure
+
+    def _execute_steamcmd(self, exe, user, pwd, vdf, use_cached, guard_code):
+        if self._use_steamcmd_session(user, "" if use_cached else pwd, "" if use_cached else guard_code):
+            try:
+                return self._execute_steamcmd_in_session(exe, user, pwd, vdf, use_cached, guard_code)
+            except Exception as e:
+                self.log(f"Persistent SteamCMD session failed ({e}); it will be restarted on the next publish.")
+                self.close_steamcmd_session()
+                return 1, str(e)
+
+        stream = bool(self.stream_steamcmd_var.get())
+        backend = self._get_workshop_backend()
+        self.steamcmd_process, _cmd = backend.launch_steamcmd(
+            exe=exe,
+            user=user,
+            pwd=pwd,
+            vdf=vdf,
+            use_cached=use_cached,
+            guard_code=guard_code,
+            is_windows=IS_WINDOWS,
+            capture_output=stream,
+        )
+        try:
+            if not stream:
+                return self.steamcmd_process.wait(), ""
+
+            parser = SteamCmdProgressParser()
+            self.root.after(0, lambda: self.upload_progress_var.set(parser.describe()))
+
+            def on_update(progress):
+                text = progress.describe()
+                self.root.after(0, lambda: self.upload_progress_var.set(text))
+
+            returncode = backend.stream_steamcmd_output(self.steamcmd_process, parser, on_update=on_update)
+            self.pending_publish_transfer = (parser.bytes_total, time.monotonic() - parser.started_at, "stream")
+            if returncode == 0 and not parser.failure_reason:
+                parser.phase = "success"
+            final_text = parser.describe()
+            self.root.after(0, lambda: self.upload_progress_var.set(final_text))
+            return returncode, parser.failure_reason
+        finally:
+            self.steamcmd_process = None
+
+    def run_steamcmd(self, exe, user, pwd, vdf, publish_inventory=None):
+        if publish_inventory is not None:
+            try:
+                self.pending_publish_inventory = self._build_publish_snapshot(publish_inventory)
+            except Exception as e:
+                self.log(f"Content hashing failed ({e}); recording sizes and timestamps only.")
+                self.pending_publish_inventory = self._build_inventory_snapshot(publish_inventory)
         self.log("Starting SteamCMD...")
         
         use_cached = self.use_cached_creds_var.get()
@@ -2297,34 +2932,36 @@ class WorkshopUploader:
                 self.log("Attempting login using cached credentials (no username provided)...")
         
         try:
-            self.steamcmd_process, _cmd = self._get_workshop_backend().launch_steamcmd(
-                exe=exe,
-                user=user,
-                pwd=pwd,
-                vdf=vdf,
-                use_cached=use_cached,
-                guard_code=guard_code,
-                is_windows=IS_WINDOWS,
-            )
-            self.steamcmd_process.wait()
-            p = self.steamcmd_process
-            self.steamcmd_process = None
-            
-            if p.returncode == 0:
+            self._wait_for_steamcmd_prewarm()
+            self.pending_publish_transfer = None
+            started = time.monotonic()
+            returncode, stream_failure = self._execute_steamcmd(exe, user, pwd, vdf, use_cached, guard_code)
+            elapsed = time.monotonic() - started
+
+            if returncode == 0 and not stream_failure:
                 self.log("SteamCMD finished successfully.")
                 updated_item_id = self.update_item_id_from_vdf(vdf)
                 if updated_item_id:
                     self.item_id_var.set(updated_item_id)
                 uploaded_item_id = updated_item_id or self.item_id_var.get().strip()
+                self.current_project_data.pop("last_upload_inventory", None)
                 self.current_project_data.update({
                     "last_upload_signature": self.pending_publish_signature,
-                    "last_upload_inventory": self.pending_publish_inventory or {},
                     "last_upload_at": datetime.now(timezone.utc).isoformat(),
                     "last_uploaded_item_id": uploaded_item_id,
                     "item_id": uploaded_item_id or self.item_id_var.get(),
+                    "last_published_metadata": self.pending_publish_metadata,
                 })
-                self._update_project_status(self.current_inventory)
+                self._record_upload_throughput(elapsed, use_cached)
+                if self.mod_path.get().strip():
+                    try:
+                        profile_path = self.project_store.resolve_profile_path(self._build_project_payload())
+                        self._store_last_upload_snapshot(profile_path, self.pending_publish_inventory)
+                    except Exception as e:
+                        self.log(f"Failed to save publish snapshot: {e}")
+                        self.current_project_data.pop("last_upload_signature", None)
                 self.save_current_project_state(quiet=True)
+                self._update_project_status(self.current_inventory)
                 
                 # Apply Tags if present
                 if self.tags_var.get().strip():
@@ -2333,15 +2970,18 @@ class WorkshopUploader:
                 self.root.after(0, self.refresh_current_project_readiness)
                 self.root.after(0, lambda: messagebox.showinfo("Success", "SteamCMD finished.\nProject state and publish snapshot were updated."))
             else:
-                self.log(f"SteamCMD exited with code {p.returncode}")
-                
-                analysis = self.analyze_last_upload_log()
-                msg = f"SteamCMD encountered an error (Code {p.returncode})."
-                
-                if use_cached:
+                self.log(f"SteamCMD exited with code {returncode}")
+
+                msg = f"SteamCMD encountered an error (Code {returncode})."
+                if stream_failure:
+                    self.log(f"SteamCMD reported: {stream_failure}")
+                    msg += f"\n\nSteamCMD reported:\n{stream_failure}"
+                elif use_cached:
                     msg = "SteamCMD failed to login using cached credentials.\n\nPlease ensure you are logged into SteamCMD manually first, or use the QR Login / Manual boxes."
-                elif analysis:
-                    msg += f"\n\nPossible Errors found in log:\n{analysis}"
+                else:
+                    analysis = self.analyze_last_upload_log()
+                    if analysis:
+                        msg += f"\n\nPossible Errors found in log:\n{analysis}"
                 
                 def show_err():
                     if messagebox.askyesno("Upload Error", f"{msg}\n\nOpen logs to investigate?"):
@@ -2353,10 +2993,203 @@ class WorkshopUploader:
         finally:
             self.pending_publish_signature = None
             self.pending_publish_inventory = None
+            self.pending_publish_metadata = None
+            self.pending_publish_bytes = 0
+            self.pending_publish_transfer = None
             self._set_busy("Upload", False)
 
+    def publish_selected_projects(self):
+        if not hasattr(self, "project_tree"):
+            return False
+        profile_paths = []
+        for selected in self.project_tree.selection():
+            tags = self.project_tree.item(selected).get("tags", [])
+            if tags:
+                profile_paths.append(tags[0])
+        if not profile_paths:
+            messagebox.showinfo("Publish Queue", "Select one or more saved projects first.")
+            return False
+        if not messagebox.askyesno("Publish Queue", f"Publish {len(profile_paths)} project(s) using their saved settings in one SteamCMD login?"):
+            return False
+
+        self.save_config()
+        self.save_current_project_state(quiet=True)
+        settings = {
+            "steamcmd_path": self.steamcmd_path.get(),
+            "username": self.username_var.get().strip(),
+            "password": self.password_var.get(),
+            "use_cached_creds": self.use_cached_creds_var.get(),
+            "guard_code": self.steam_guard_var.get(),
+            "appid": self.games[self.game_var.get()]["appid"],
+            "title_limit": STEAM_TITLE_LIMIT,
+            "description_limit": STEAM_DESC_LIMIT,
+        }
+        self._set_busy("Publish Queue", True)
+        threading.Thread(target=self._publish_queue_worker, args=(profile_paths, settings), daemon=True).start()
+        return True
+
+    def _run_publish_queue_builds(self, settings, vdf_paths):
+        exe = settings["steamcmd_path"]
+        user = settings["username"]
+
+        def on_update(progress):
+            text = progress.describe()
+            self.root.after(0, lambda: self.upload_progress_var.set(text))
+
+        use_cached = settings["use_cached_creds"]
+        if self._use_steamcmd_session(user, "" if use_cached else settings["password"], "" if use_cached else settings["guard_code"]):
+            session = self._get_steamcmd_session(exe)
+            ok, failure, _output = session.ensure_ready(
+                user,
+                pwd=settings["password"],
+                use_cached=settings["use_cached_creds"],
+                guard_code=settings["guard_code"],
+            )
+            if not ok:
+                return [(False, failure)] * len(vdf_paths)
+            outcomes = []
+            for vdf_path in vdf_paths:
+                parser = SteamCmdProgressParser()
+                parser.phase = "login"
+                ok, failure, _output = session.build_item(vdf_path, parser=parser, on_update=on_update)
+                outcomes.append((ok, failure))
+            return outcomes
+
+        backend = self._get_workshop_backend()
+        queue = self._get_publish_queue()
+        tracker = BatchProgressTracker(
+            len(vdf_paths),
+            markers=[(os.path.basename(vdf_path), queue.read_item_id(vdf_path)) for vdf_path in vdf_paths],
+        )
+        self.steamcmd_process, _cmd = backend.launch_steamcmd(
+            exe=exe,
+            user=user,
+            pwd=settings["password"],
+            vdf=vdf_paths,
+            use_cached=settings["use_cached_creds"],
+            guard_code=settings["guard_code"],
+            is_windows=IS_WINDOWS,
+            capture_output=True,
+        )
+        try:
+            returncode = backend.stream_steamcmd_output(self.steamcmd_process, tracker, on_update=on_update)
+        finally:
+            self.steamcmd_process = None
+        return tracker.results(returncode)
+
+    def _publish_queue_worker(self, profile_paths, settings):
+        queue = self._get_publish_queue()
+        try:
+            self.log(f"Preflighting {len(profile_paths)} queued project(s)...")
+            jobs = queue.prepare_jobs(profile_paths, settings)
+            ready = []
+            for job in jobs:
+                if job["error"]:
+                    self.log(f"Skipping {job['label']}: {job['error']}")
+                    continue
+                try:
+                    job["content_dir"], publish_inventory = self._stage_upload_content(job["project"]["mod_path"], job["inventory"])
+                    job["signature"] = self._publish_signature(job["project"]["mod_path"], job["inventory"], job["signature"])
+                    if publish_inventory is not job["inventory"]:
+                        job["snapshot"] = self._build_inventory_snapshot(publish_inventory)
+                    queue.write_job_vdf(job, settings["appid"], self._visibility_code_for, self._build_upload_vdf_content)
+                except Exception as e:
+                    job["error"] = f"Error creating VDF: {e}"
+                    self.log(f"Skipping {job['label']}: {job['error']}")
+                    continue
+                ready.append(job)
+            if not ready:
+                self.root.after(0, lambda: messagebox.showwarning("Publish Queue", "No queued project passed preflight. See the activity log for details."))
+                return
+
+            self._wait_for_steamcmd_prewarm()
+            self.log(f"Publishing {len(ready)} project(s) in one SteamCMD login...")
+            outcomes = self._run_publish_queue_builds(settings, [job["vdf_path"] for job in ready])
+            lines = []
+            published = []
+            for job, (ok, detail) in zip(ready, outcomes):
+                try:
+                    project = queue.record_result(job, ok, detail)
+                except Exception as e:
+                    self.log(f"Failed to record publish result for {job['label']}: {e}")
+                    continue
+                status = "published" if ok else f"failed ({job['detail']})"
+                self.log(f"Queue: {job['label']} {status}")
+                lines.append(f"{job['label']}: {status}")
+                if job["profile_path"] == self.current_project_profile_path:
+                    self.root.after(0, lambda data=project: self._apply_queue_result_to_current(data))
+                if ok:
+                    published.append(project)
+            self._apply_queue_tags(published, settings)
+            for job in jobs:
+                if job["error"]:
+                    lines.append(f"{job['label']}: skipped ({job['error']})")
+            self.root.after(0, self.refresh_recent_projects)
+            summary = "\n".join(lines)
+            self.root.after(0, lambda: messagebox.showinfo("Publish Queue", summary))
+        except Exception as e:
+            self.log(f"Publish queue error: {e}")
+        finally:
+            self._set_busy("Publish Queue", False)
+
+    def _apply_queue_tags(self, projects, settings):
+        tags_by_item = {}
+        change_notes = {}
+        for project in projects:
+            tags = [t.strip() for t in (project.get("tags") or "").split(",") if t.strip()]
+            item_id = project.get("item_id")
+            if not tags or not item_id or item_id == "0":
+                continue
+            tags_by_item[item_id] = tags
+            change_notes[item_id] = project.get("change_note", "")
+        if not tags_by_item:
+            return
+        results = self._get_batch_client().update_tags(
+            self.api_key_var.get(),
+            settings["appid"],
+            tags_by_item,
+            change_notes=change_notes,
+            steamworks_updater=self._get_steamworks_tag_updater(),
+            base_dir=self.base_dir,
+            create_appid_file=self.experimental_native_appid_var.get(),
+        )
+        for item_id, result in results.items():
+            if isinstance(result, Exception):
+                self.log(f"Queue: tag update for item {item_id} failed: {self._friendly_api_error(result)}")
+            else:
+                self.log(f"Queue: updated tags for item {item_id}.")
+
+    def _apply_queue_result_to_current(self, project):
+        self.current_project_data.update({
+            key: project[key]
+            for key in (
+                "last_upload_signature",
+                "last_upload_at",
+                "last_uploaded_item_id",
+                "item_id",
+                "last_queue_result",
+                "last_published_metadata",
+                "upload_history",
+            )
+            if key in project
+        })
+        self._upload_snapshot_cache_key = None
+        if project.get("item_id"):
+            self.item_id_var.set(project["item_id"])
+        self._update_project_status(self.current_inventory)
+
     def _on_manage_selection(self, _event=None):
-        self.use_selected_item_id_for_upload(switch_to_upload=False, quiet=True)
+        if self.use_selected_item_id_for_upload(switch_to_upload=False, quiet=True):
+            self._prefetch_workshop_items([self.item_id_var.get()])
+
+    def _prefetch_workshop_items(self, item_ids):
+        api_key = self.api_key_var.get().strip()
+        if not api_key:
+            return
+        for item_id in item_ids:
+            item_id = str(item_id or "")
+            if item_id.isdigit() and item_id != "0":
+                self._get_workshop_backend().prefetch_item(api_key, item_id)
 
     def use_selected_item_id_for_upload(self, switch_to_upload=True, quiet=False):
         selected = self.tree.selection()
@@ -2430,15 +3263,90 @@ class WorkshopUploader:
         self.steam_login_status_var.set(f"Steam login: detected {display_name}")
         self.log(f"Detected Steam login: {display_name} ({account['steamid']})")
 
-    def refresh_workshop_items(self):
+    def _detail_tag_names(self, details):
+        tag_names = []
+        for tag in details.get("tags") or []:
+            if isinstance(tag, dict):
+                value = tag.get("tag") or tag.get("display_name") or ""
+            else:
+                value = str(tag)
+            value = value.strip()
+            if value:
+                tag_names.append(value)
+        return tag_names
+
+    def _render_workshop_items(self, items, details=None):
+        details = details or {}
+        self.tree.delete(*self.tree.get_children())
+        for item in items:
+            item_details = details.get(str(item["publishedfileid"])) or {}
+            size_label = ""
+            try:
+                if item_details.get("file_size"):
+                    size_label = f"{int(item_details['file_size']) / (1024 * 1024):.1f} MB"
+            except Exception:
+                size_label = ""
+            tags_label = ", ".join(self._detail_tag_names(item_details))
+            self.tree.insert("", "end", values=(item["title"], item["publishedfileid"], item["visibility_label"], item["updated_label"], size_label, tags_label))
+        if not items:
+            self.tree.insert("", "end", values=("(No Workshop items returned)", "", "", "", "", ""))
+
+    def show_cached_workshop_library(self, steam_id):
+        appid = self.games[self.game_var.get()]["appid"]
+        entry = self._get_library_cache().load(steam_id, appid)
+        if not entry:
+            return None
+        self._get_workshop_backend().seed_item_details(entry.get("details"))
+        self._render_workshop_items(entry["items"], entry.get("details"))
+        age = self._get_library_cache().describe_age(entry)
+        self.library_status_var.set(f"Showing {len(entry['items'])} cached Workshop items for {steam_id} (updated {age}).")
+        return entry
+
+    def _prune_temp_previews(self):
+        keep = os.path.abspath(str(self.preview_path.get() or ""))
+        removed = 0
+        try:
+            names = os.listdir(self.temp_dir)
+        except OSError:
+            return 0
+        for name in names:
+            path = os.path.join(self.temp_dir, name)
+            if os.path.abspath(path) == keep or not os.path.isfile(path):
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            self.log(f"Pruned {removed} stale preview file(s).")
+        return removed
+
+    def _show_cached_library_on_startup(self):
+        steam_id = str(self.manage_identity_var.get() or "").strip()
+        if not (steam_id.isdigit() and len(steam_id) == 17):
+            return None
+        try:
+            entry = self.show_cached_workshop_library(steam_id)
+        except Exception as e:
+            self.log(f"Could not load cached Workshop library: {e}")
+            return None
+        if entry and not self._get_library_cache().is_fresh(entry) and self.api_key_var.get().strip():
+            self.log("Cached Workshop library is stale; refreshing in the background...")
+            self.refresh_workshop_items(quiet=True)
+        return entry
+
+    def refresh_workshop_items(self, quiet=False):
         if not self.api_key_var.get():
-            messagebox.showerror("Error", "Steam Web API Key is required for this feature.")
+            if not quiet:
+                messagebox.showerror("Error", "Steam Web API Key is required for this feature.")
             self.api_key_status_var.set("API key: missing")
             return
 
         identity_input = self.resolve_owner_identity(quiet=True)
         if not identity_input:
-            messagebox.showerror("Error", "Enter SteamID64/Profile URL/Vanity in the Workshop Library panel, or use 'USE CURRENT LOGIN'.")
+            if not quiet:
+                messagebox.showerror("Error", "Enter SteamID64/Profile URL/Vanity in the Workshop Library panel, or use 'USE CURRENT LOGIN'.")
             return
 
         self.save_config()
@@ -2448,14 +3356,19 @@ class WorkshopUploader:
         threading.Thread(target=self._refresh_worker, args=(identity_input,), daemon=True).start()
 
     def _refresh_worker(self, identity_input):
+        appid = self.games[self.game_var.get()]["appid"]
         try:
             api_key = self.api_key_var.get()
-            appid = self.games[self.game_var.get()]["appid"]
+            throttled_before = self._get_steam_service().throttle_stats()["throttled_seconds"]
+            cached = self._get_library_cache().load(identity_input, appid)
+            if cached:
+                self._get_workshop_backend().seed_item_details(cached.get("details"))
             steam_id, items, meta = self._get_workshop_backend().query_workshop_items(
                 api_key=api_key,
                 identity_input=identity_input,
                 appid=appid,
                 resolve_steam_id=self.resolve_steam_id,
+                known_items=cached["items"] if cached else None,
             )
 
             if not steam_id:
@@ -2463,27 +3376,46 @@ class WorkshopUploader:
                 self.root.after(0, lambda: self.log("Error: Could not resolve owner. Use SteamID64, profile URL, vanity URL, or 'USE CURRENT LOGIN'."))
                 return
 
+            details = self._get_batch_client().fetch_details(
+                api_key,
+                [item["publishedfileid"] for item in items],
+                known_updates={str(item["publishedfileid"]): item.get("time_updated") for item in items},
+            )
+
+            try:
+                self._get_library_cache().save(steam_id, appid, items, meta, details=details)
+            except Exception as e:
+                self.log(f"Could not cache Workshop library: {e}")
+
             self.root.after(0, lambda: self.manage_identity_var.set(steam_id))
             self.root.after(0, lambda: self.owner_status_var.set(f"Workshop owner: {steam_id}"))
             self.root.after(0, lambda: self.api_key_status_var.set("API key: accepted"))
-            
-            self.root.after(0, lambda: self.tree.delete(*self.tree.get_children()))
-            
-            for item in items:
-                self.root.after(
-                    0,
-                    lambda i=item: self.tree.insert("", "end", values=(i["title"], i["publishedfileid"], i["visibility_label"], i["updated_label"]))
-                )
-            if not items:
-                self.root.after(0, lambda: self.tree.insert("", "end", values=("(No Workshop items returned)", "", "", "")))
+            self.root.after(0, lambda: self._render_workshop_items(items, details))
+            self._prefetch_workshop_items([item["publishedfileid"] for item in items[:PREFETCH_TOP_ITEMS]])
+            throttled = self._get_steam_service().throttle_stats()["throttled_seconds"] - throttled_before
+            if throttled >= 0.5:
+                self.root.after(0, lambda: self.log(f"Steam Web API rate limiting delayed this refresh by {throttled:.1f}s."))
             pages = meta.get("pages", 0)
             total = meta.get("total", len(items))
-            self.root.after(0, lambda: self.library_status_var.set(f"Loaded {len(items)} of {total} Workshop items for {steam_id} across {pages} page(s)."))
+            if meta.get("incremental"):
+                changed = meta.get("changed", 0)
+                self.root.after(0, lambda: self.library_status_var.set(f"Synced {len(items)} Workshop items for {steam_id}; {changed} changed since last refresh ({pages} page(s))."))
+            else:
+                self.root.after(0, lambda: self.library_status_var.set(f"Loaded {len(items)} of {total} Workshop items for {steam_id} across {pages} page(s)."))
 
         except Exception as e:
+            friendly = self._friendly_api_error(e)
+            cached = self._get_library_cache().load(identity_input, appid)
+            if cached:
+                age = self._get_library_cache().describe_age(cached)
+                self._get_workshop_backend().seed_item_details(cached.get("details"))
+                self.root.after(0, lambda: self._render_workshop_items(cached["items"], cached.get("details")))
+                self.root.after(0, lambda: self.library_status_var.set(f"Steam unavailable ({friendly}); showing cached library from {age}."))
+                self.root.after(0, lambda: self.log(f"Workshop refresh failed ({friendly}); using cached library from {age}."))
+                return
             self.root.after(0, lambda: self.library_status_var.set("Workshop library load failed."))
             self.root.after(0, lambda: self.api_key_status_var.set("API key: failed or unauthorized"))
-            self.root.after(0, lambda: self.log(f"API Error: {self._friendly_api_error(e)}"))
+            self.root.after(0, lambda: self.log(f"API Error: {friendly}"))
         finally:
             self._set_busy("Refresh", False)
 
@@ -2543,32 +3475,19 @@ class WorkshopUploader:
     def _prepare_update_worker(self, item_id):
         try:
             api_key = self.api_key_var.get()
-            details = self._get_workshop_backend().fetch_workshop_item_details(api_key=api_key, item_id=item_id)
+            details, cached_preview = self._get_workshop_backend().prefetch_item(api_key, item_id).result()
             if not details:
                 self.root.after(0, lambda: self.log(f"Could not fetch details for {item_id}"))
                 return
 
-            preview_url = details.get("preview_url")
             preview_local_path = ""
-            if preview_url:
-                preview_bytes = self._get_workshop_backend().download_preview_bytes(preview_url)
-                if preview_bytes:
-                    preview_local_path = os.path.join(self.temp_dir, f"{item_id}.jpg")
-                    with open(preview_local_path, 'wb') as f:
-                        f.write(preview_bytes)
+            if cached_preview and os.path.exists(cached_preview):
+                preview_local_path = os.path.join(self.temp_dir, f"{item_id}.jpg")
+                shutil.copyfile(cached_preview, preview_local_path)
             
             vis_map = {0: "0 (Public)", 1: "1 (Friends)", 2: "2 (Private)"}
             vis_str = vis_map.get(details.get("visibility"), "0 (Public)")
-            detail_tags = details.get("tags") or []
-            tag_names = []
-            for tag in detail_tags:
-                if isinstance(tag, dict):
-                    value = tag.get("tag") or tag.get("display_name") or ""
-                else:
-                    value = str(tag)
-                value = value.strip()
-                if value:
-                    tag_names.append(value)
+            tag_names = self._detail_tag_names(details)
 
             def do_populate():
                 self.autosave_suspended = True
@@ -2596,6 +3515,19 @@ class WorkshopUploader:
         appid = self.games[self.game_var.get()]["appid"]
         return self._get_workshop_backend().analyze_last_upload_log(sc_exe, appid)
 
+    def _describe_log_session(self, session):
+        parts = [f"Latest session at byte {session['offset']}"]
+        if session["phase"]:
+            parts.append(f"phase {session['phase']}")
+        if session["result_code"] is not None:
+            parts.append(f"result {session['result_code']}")
+        if session["bytes_total"]:
+            parts.append(f"{session['bytes_total'] / (1024 * 1024):.1f} MB")
+        if session["duration_seconds"] is not None:
+            parts.append(f"{session['duration_seconds']:.0f}s")
+        parts.append(f"{len(session['errors'])} error line(s)")
+        return "=== " + ", ".join(parts) + " ===\n"
+
     def show_steam_logs(self):
         sc_exe = self.steamcmd_path.get()
         if not sc_exe:
@@ -2603,7 +3535,7 @@ class WorkshopUploader:
             return
             
         appid = self.games[self.game_var.get()]["appid"]
-        logs = self._get_workshop_backend().get_log_paths(sc_exe, appid)
+        logs = self._get_workshop_backend().read_upload_log_sessions(sc_exe, appid)
         
         win = tk.Toplevel(self.root)
         win.title("SteamCMD Logs")
@@ -2613,34 +3545,138 @@ class WorkshopUploader:
         nb = ttk.Notebook(win)
         nb.pack(fill="both", expand=True, padx=5, pady=5)
         
-        for name, path in logs:
+        views = []
+        for name, path, session in logs:
             f = ttk.Frame(nb)
             nb.add(f, text=name)
+
+            filter_row = ttk.Frame(f)
+            filter_row.pack(fill="x", pady=(0, 5))
+            ttk.Label(filter_row, text="FILTER (REGEX):").pack(side="left", padx=(0, 5))
+            filter_var = tk.StringVar()
+            filter_entry = ttk.Entry(filter_row, textvariable=filter_var)
+            filter_entry.pack(side="left", fill="x", expand=True)
+            follow_var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(filter_row, text="FOLLOW", variable=follow_var).pack(side="left", padx=5)
             
             st = tk.Text(f, bg="#050505", fg="#d4d4d4", font=("Consolas", 9))
             st.pack(fill="both", expand=True)
+            st.tag_config("error", foreground="#ff5555", background="#220000")
             
-            if os.path.exists(path):
+            view = {
+                "text": st,
+                "tail": LogTail(path),
+                "session": session,
+                "filter_var": filter_var,
+                "follow_var": follow_var,
+                "regex": None,
+                "searching": False,
+                "missing": session is None,
+            }
+            views.append(view)
+            filter_entry.bind("<Return>", lambda _e, v=view: self._apply_log_filter(v))
+            ttk.Button(filter_row, text="APPLY", command=lambda v=view: self._apply_log_filter(v)).pack(side="left")
+            if session is not None:
                 try:
-                    with open(path, 'r', errors='ignore') as log_file:
-                        content = log_file.read()
-                        st.insert("end", content)
-                        
-                        st.tag_config("error", foreground="#ff5555", background="#220000")
-                        for keyword in ["error", "failed"]:
-                            start = "1.0"
-                            while True:
-                                pos = st.search(keyword, start, stopindex="end", nocase=True)
-                                if not pos: break
-                                end = f"{pos} lineend"
-                                st.tag_add("error", pos, end)
-                                start = end
-                        st.see("end")
+                    self._render_log_view(view, view["tail"].read_tail(start=session["offset"]), self._describe_log_session(session))
                 except Exception as e:
                     st.insert("end", f"Error reading file: {e}")
             else:
                 st.insert("end", f"Log file not found at:\n{path}\n\nThis log is usually created after an upload attempt.")
 
+        if views:
+            state = {"token": None}
+
+            def stop_polling(event):
+                if event.widget is win and state["token"]:
+                    self.root.after_cancel(state["token"])
+                    state["token"] = None
+
+            win.bind("<Destroy>", stop_polling)
+            state["token"] = self.root.after(LOG_VIEW_POLL_MS, lambda: self._poll_log_views(win, views, state))
+
+    def _append_log_lines(self, text, lines, follow=True):
+        if not lines:
+            return
+        for line in lines:
+            tags = ("error",) if any(marker in line.lower() for marker in ERROR_MARKERS) else ()
+            text.insert("end", line + "\n", tags)
+        excess = int(text.index("end-1c").split(".")[0]) - 1 - LOG_VIEW_MAX_LINES
+        if excess > 0:
+            text.delete("1.0", f"{excess + 1}.0")
+        if follow:
+            text.see("end")
+
+    def _render_log_view(self, view, lines, header=""):
+        text = view["text"]
+        text.delete("1.0", "end")
+        if header:
+            text.insert("end", header)
+        self._append_log_lines(text, lines)
+
+    def _apply_log_filter(self, view):
+        pattern = view["filter_var"].get().strip()
+        tail = view["tail"]
+        session = view["session"]
+        view["searching"] = False
+        if not pattern:
+            view["regex"] = None
+            start = session["offset"] if session is not None else 0
+            self._render_log_view(view, tail.read_tail(start=start), self._describe_log_session(session) if session is not None else "")
+            return
+        try:
+            view["regex"] = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            view["regex"] = None
+            self._render_log_view(view, [], f"Invalid filter: {e}\n")
+            return
+        regex = view["regex"]
+        self._render_log_view(view, [], f"=== Searching for /{pattern}/... ===\n")
+        tail.read_new()
+        end = tail.offset
+        view["searching"] = True
+
+        def worker():
+            try:
+                lines = tail.search(pattern, end=end)
+                header = f"=== {len(lines)} matching line(s) for /{pattern}/ ===\n"
+            except Exception as e:
+                lines, header = [], f"Error searching file: {e}\n"
+
+            def apply():
+                if view["regex"] is regex:
+                    view["searching"] = False
+                    self._render_log_view(view, lines, header)
+
+            self.root.after(0, apply)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _poll_log_views(self, win, views, state):
+        state["token"] = None
+        try:
+            if not win.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        for view in views:
+            if view["searching"]:
+                continue
+            try:
+                lines, reset = view["tail"].read_new()
+            except OSError:
+                continue
+            if view["regex"] is not None:
+                lines = [line for line in lines if view["regex"].search(line)]
+            if reset and view["missing"]:
+                view["missing"] = False
+                self._render_log_view(view, lines, f"=== Log file created: {view['tail'].path} ===\n")
+            elif reset:
+                self._render_log_view(view, lines, "=== Log was truncated or replaced ===\n")
+            else:
+                self._append_log_lines(view["text"], lines, follow=view["follow_var"].get())
+        state["token"] = self.root.after(LOG_VIEW_POLL_MS, lambda: self._poll_log_views(win, views, state))
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = WorkshopUploader(root)
@@ -1,13 +1,46 @@
 import json
 import os
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
+from steam_log_reader import SteamLogReader
+
+WORKSHOP_QUERY_RANKED_BY_PUBLICATION_DATE = 1
+WORKSHOP_QUERY_LAST_UPDATED = 21
+DETAILS_BATCH_SIZE = 100
+PREFETCH_WORKERS = 3
+PREFETCH_CACHE_ITEMS = 16
+STEAMCMD_PREWARM_TIMEOUT = 900
+STEAMCMD_PREWARM_OK_CODES = (0, 7)
+DETAILS_CACHE_FIELDS = (
+    "publishedfileid",
+    "title",
+    "description",
+    "preview_url",
+    "file_size",
+    "visibility",
+    "time_updated",
+    "tags",
+    "result",
+)
+
 
 class WorkshopBackend:
-    def __init__(self, steam_service, logger=None):
+    def __init__(self, steam_service, logger=None, preview_cache=None):
         self.steam_service = steam_service
         self.logger = logger
+        self.preview_cache = preview_cache
+        self._details_cache = {}
+        self._details_lock = threading.Lock()
+        self._prefetch_cache = OrderedDict()
+        self._prefetch_inflight = {}
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_executor = None
+        self.log_reader = SteamLogReader(logger=logger)
 
     def log(self, msg):
         if self.logger:
@@ -25,7 +58,10 @@ class WorkshopBackend:
                 cmd.append(pwd)
             if guard_code:
                 cmd.append(guard_code)
-        cmd.extend(["+workshop_build_item", vdf, "+quit"])
+        vdfs = vdf if isinstance(vdf, (list, tuple)) else [vdf]
+        for path in vdfs:
+            cmd.extend(["+workshop_build_item", path])
+        cmd.append("+quit")
         return cmd
 
     def build_steamcmd_login_test_command(self, exe, user, pwd, use_cached, guard_code=""):
@@ -45,12 +81,60 @@ class WorkshopBackend:
         cmd.append("+quit")
         return cmd
 
-    def launch_steamcmd(self, exe, user, pwd, vdf, use_cached, guard_code="", is_windows=False):
+    def launch_steamcmd(self, exe, user, pwd, vdf, use_cached, guard_code="", is_windows=False, capture_output=False):
         cmd = self.build_steamcmd_command(exe, user, pwd, vdf, use_cached, guard_code=guard_code)
-        creation_flags = subprocess.CREATE_NEW_CONSOLE if is_windows else 0
-        process = subprocess.Popen(cmd, creationflags=creation_flags)
+        if not capture_output:
+            creation_flags = subprocess.CREATE_NEW_CONSOLE if is_windows else 0
+            process = subprocess.Popen(cmd, creationflags=creation_flags)
+            return process, cmd
+
+        creation_flags = subprocess.CREATE_NO_WINDOW if is_windows else 0
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="ignore",
+            bufsize=1,
+            creationflags=creation_flags,
+        )
         return process, cmd
 
+    def stream_steamcmd_output(self, process, parser, on_update=None):
+        for line in iter(process.stdout.readline, ""):
+            changed = parser.feed(line)
+            if on_update is not None and parser.should_report(changed):
+                on_update(parser)
+            if parser.needs_input and process.poll() is None:
+                process.terminate()
+                break
+        process.stdout.close()
+        return process.wait()
+
+    def prewarm_steamcmd(self, exe, is_windows=False, timeout=STEAMCMD_PREWARM_TIMEOUT):
+        started = time.monotonic()
+        completed = subprocess.run(
+            [exe, "+quit"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="ignore",
+            timeout=timeout,
+            cwd=os.path.dirname(exe) or None,
+            creationflags=subprocess.CREATE_NO_WINDOW if is_windows else 0,
+        )
+        output = completed.stdout or ""
+        lower = output.lower()
+        return {
+            "returncode": completed.returncode,
+            "success": completed.returncode in STEAMCMD_PREWARM_OK_CODES,
+            "updated": any(marker in lower for marker in ("update complete", "downloading update", "applying update")),
+            "elapsed": time.monotonic() - started,
+            "output": output,
+        }
+
     def test_steamcmd_login(self, exe, user, pwd, use_cached, guard_code="", timeout=60):
         cmd = self.build_steamcmd_login_test_command(
             exe=exe,
@@ -87,22 +171,36 @@ class WorkshopBackend:
             "command": cmd,
         }
 
-    def query_workshop_items(self, api_key, identity_input, appid, resolve_steam_id):
-        steam_id = resolve_steam_id(identity_input, api_key)
-        if not steam_id:
-            return None, [], {"pages": 0, "total": 0, "next_cursor": ""}
+    def _normalize_workshop_item(self, item):
+        vis_map = {0: "Public", 1: "Friends", 2: "Private"}
+        updated = item.get("time_updated")
+        try:
+            time_updated = int(updated)
+            updated_label = datetime.fromtimestamp(time_updated).strftime("%Y-%m-%d %H:%M")
+        except Exception:
+            time_updated = 0
+            updated_label = "Unknown"
+        return {
+            "title": item.get("title", ""),
+            "publishedfileid": item.get("publishedfileid", ""),
+            "visibility_label": vis_map.get(item.get("visibility"), "Unknown"),
+            "updated_label": updated_label,
+            "time_updated": time_updated,
+        }
 
-        query_url = "https://api.steampowered.com/IPublishedFileService/QueryFiles/v1/"
+    def _query_workshop_pages(self, api_key, steam_id, appid, query_type, known_updates=None):
+        query_url = self.steam_service.api_url("IPublishedFileService/QueryFiles/v1/")
         cursor = "*"
         page_count = 0
         total = 0
         items = []
         seen_cursors = set()
+        reached_known = False
 
         while cursor and cursor not in seen_cursors:
             seen_cursors.add(cursor)
             query_payload = {
-                "query_type": 1,
+                "query_type": query_type,
                 "cursor": cursor,
                 "page": 1,
                 "creator_appid": appid,
@@ -120,50 +218,185 @@ class WorkshopBackend:
             )
             payload = response.json().get("response", {})
             batch = payload.get("publishedfiledetails", []) or []
-            items.extend(batch)
             page_count += 1
             try:
                 total = int(payload.get("total", total or len(items)) or 0)
             except Exception:
                 total = total or len(items)
 
+            for item in batch:
+                normalized = self._normalize_workshop_item(item)
+                file_id = str(normalized["publishedfileid"])
+                if known_updates and normalized["time_updated"] and known_updates.get(file_id) == normalized["time_updated"]:
+                    reached_known = True
+                    break
+                items.append(normalized)
+            if reached_known:
+                break
+
             next_cursor = str(payload.get("next_cursor", "") or "")
             if not next_cursor or next_cursor == cursor or not batch:
                 cursor = ""
             else:
                 cursor = next_cursor
+        return items, page_count, total, cursor, reached_known
 
-        normalized = []
-        vis_map = {0: "Public", 1: "Friends", 2: "Private"}
-        for item in items:
-            updated = item.get("time_updated")
-            try:
-                updated_label = datetime.fromtimestamp(int(updated)).strftime("%Y-%m-%d %H:%M")
-            except Exception:
-                updated_label = "Unknown"
-            normalized.append({
-                "title": item.get("title", ""),
-                "publishedfileid": item.get("publishedfileid", ""),
-                "visibility_label": vis_map.get(item.get("visibility"), "Unknown"),
-                "updated_label": updated_label,
-            })
-        return steam_id, normalized, {
-            "pages": page_count,
-            "total": total or len(normalized),
+    def order_workshop_items(self, items):
+        return sorted(items, key=lambda item: (-(item.get("time_updated", 0) or 0), str(item.get("publishedfileid", ""))))
+
+    def merge_workshop_items(self, known_items, changed_items):
+        changed_ids = {str(item["publishedfileid"]) for item in changed_items}
+        merged = list(changed_items)
+        merged.extend(item for item in known_items or [] if str(item.get("publishedfileid", "")) not in changed_ids)
+        return self.order_workshop_items(merged)
+
+    def query_workshop_items(self, api_key, identity_input, appid, resolve_steam_id, known_items=None):
+        steam_id = resolve_steam_id(identity_input, api_key)
+        if not steam_id:
+            return None, [], {"pages": 0, "total": 0, "next_cursor": ""}
+
+        known_updates = {
+            str(item.get("publishedfileid", "")): item.get("time_updated")
+            for item in known_items or []
+            if item.get("time_updated")
+        }
+        if known_updates:
+            changed, pages, total, cursor, reached_known = self._query_workshop_pages(
+                api_key, steam_id, appid, WORKSHOP_QUERY_LAST_UPDATED, known_updates=known_updates
+            )
+            if reached_known:
+                merged = self.merge_workshop_items(known_items, changed)
+                if not total or total == len(merged):
+                    return steam_id, merged, {
+                        "pages": pages,
+                        "total": total or len(merged),
+                        "next_cursor": "",
+                        "incremental": True,
+                        "changed": len(changed),
+                    }
+                self.log("Cached Workshop library is out of step with Steam; running a full sync.")
+
+        items, pages, total, cursor, _reached = self._query_workshop_pages(api_key, steam_id, appid, WORKSHOP_QUERY_RANKED_BY_PUBLICATION_DATE)
+        items = self.order_workshop_items(items)
+        return steam_id, items, {
+            "pages": pages,
+            "total": total or len(items),
             "next_cursor": cursor,
+            "incremental": False,
+            "changed": len(items),
         }
 
+    def _slim_details(self, details):
+        return {key: details[key] for key in DETAILS_CACHE_FIELDS if key in details}
+
+    def seed_item_details(self, details_by_id):
+        with self._details_lock:
+            for item_id, details in (details_by_id or {}).items():
+                if isinstance(details, dict) and details:
+                    self._details_cache[str(item_id)] = details
+
+    def cached_item_details(self, item_id):
+        with self._details_lock:
+            return self._details_cache.get(str(item_id))
+
+    def _forget_item(self, item_id):
+        with self._details_lock:
+            self._details_cache.pop(str(item_id), None)
+        with self._prefetch_lock:
+            self._prefetch_cache.pop(str(item_id), None)
+
+    def fetch_workshop_items_details(self, api_key, item_ids, known_updates=None, batch_size=DETAILS_BATCH_SIZE):
+        known_updates = known_updates or {}
+        results = {}
+        missing = []
+        with self._details_lock:
+            for item_id in dict.fromkeys(str(item_id) for item_id in item_ids or [] if item_id):
+                cached = self._details_cache.get(item_id)
+                expected = known_updates.get(item_id)
+                if cached and (not expected or int(cached.get("time_updated", 0) or 0) == expected):
+                    results[item_id] = cached
+                else:
+                    missing.append(item_id)
+
+        url = self.steam_service.api_url("ISteamRemoteStorage/GetPublishedFileDetails/v1/")
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            data = {"key": api_key, "itemcount": len(batch)}
+            for index, item_id in enumerate(batch):
+                data[f"publishedfileids[{index}]"] = item_id
+            response = self.steam_service.request_with_retry(
+                "POST",
+                url,
+                operation_name="Fetch Workshop item details",
+                data=data,
+                timeout=10,
+            )
+            fetched = response.json().get("response", {}).get("publishedfiledetails", []) or []
+            with self._details_lock:
+                for details in fetched:
+                    item_id = str(details.get("publishedfileid", "") or "")
+                    if not item_id or details.get("result", 1) != 1:
+                        continue
+                    details = self._slim_details(details)
+                    self._details_cache[item_id] = details
+                    results[item_id] = details
+            with self._prefetch_lock:
+                for item_id in batch:
+                    self._prefetch_cache.pop(item_id, None)
+        return results
+
     def fetch_workshop_item_details(self, api_key, item_id):
-        url = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
-        response = self.steam_service.request_with_retry(
-            "POST",
-            url,
-            operation_name="Fetch Workshop item details",
-            data={"key": api_key, "itemcount": 1, "publishedfileids[0]": item_id},
-            timeout=10,
-        )
-        details = response.json().get("response", {}).get("publishedfiledetails", [{}])[0]
-        return details or {}
+        cached = self.cached_item_details(item_id)
+        if cached:
+            return cached
+        return self.fetch_workshop_items_details(api_key, [item_id]).get(str(item_id), {})
+
+    def _get_prefetch_executor(self):
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="workshop-prefetch")
+        return self._prefetch_executor
+
+    def prefetch_item(self, api_key, item_id):
+        item_id = str(item_id)
+        with self._prefetch_lock:
+            cached = self._prefetch_cache.get(item_id)
+            if cached is not None:
+                self._prefetch_cache.move_to_end(item_id)
+                future = Future()
+                future.set_result(cached)
+                return future
+            future = self._prefetch_inflight.get(item_id)
+            if future is None:
+                future = self._get_prefetch_executor().submit(self._prefetch_worker, api_key, item_id)
+                self._prefetch_inflight[item_id] = future
+            return future
+
+    def _prefetch_worker(self, api_key, item_id):
+        try:
+            details = self.fetch_workshop_item_details(api_key, item_id)
+            preview_path = self.download_preview_file(details.get("preview_url")) if details else ""
+            result = (details, preview_path)
+            if details:
+                with self._prefetch_lock:
+                    self._prefetch_cache[item_id] = result
+                    self._prefetch_cache.move_to_end(item_id)
+                    while len(self._prefetch_cache) > PREFETCH_CACHE_ITEMS:
+                        self._prefetch_cache.popitem(last=False)
+            return result
+        finally:
+            with self._prefetch_lock:
+                self._prefetch_inflight.pop(item_id, None)
+
+    def close(self):
+        executor = self._prefetch_executor
+        self._prefetch_executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def download_preview_file(self, preview_url):
+        if not preview_url or self.preview_cache is None:
+            return ""
+        return self.preview_cache.fetch(preview_url, self.steam_service)
 
     def download_preview_bytes(self, preview_url):
         if not preview_url:
@@ -175,9 +408,12 @@ class WorkshopBackend:
             stream=True,
             timeout=10,
         )
-        if response.ok:
-            return response.content
-        return b""
+        try:
+            if response.ok:
+                return b"".join(response.iter_content(chunk_size=64 * 1024))
+            return b""
+        finally:
+            response.close()
 
     def update_workshop_tags(
         self,
@@ -209,7 +445,7 @@ class WorkshopBackend:
                 raise native_error
             raise ValueError("API key is required for Web API tag updates.")
 
-        url = "https://api.steampowered.com/IPublishedFileService/Update/v1/"
+        url = self.steam_service.api_url("IPublishedFileService/Update/v1/")
         data = {
             "key": api_key,
             "publishedfileid": item_id,
@@ -230,6 +466,74 @@ class WorkshopBackend:
             "native_error": str(native_error) if native_error else "",
         }
 
+    def update_workshop_metadata(
+        self,
+        api_key,
+        item_id,
+        appid,
+        title,
+        description,
+        visibility,
+        preview_path=None,
+        tags=None,
+        change_note="",
+        steamworks_updater=None,
+        base_dir=None,
+        create_appid_file=False,
+    ):
+        native_error = None
+        if steamworks_updater is not None:
+            try:
+                result = steamworks_updater.try_update_item(
+                    appid=appid,
+                    publishedfileid=item_id,
+                    title=title,
+                    description=description,
+                    visibility=visibility,
+                    preview_path=preview_path,
+                    tags=tags,
+                    change_note=change_note,
+                    base_dir=base_dir,
+                    create_appid_file=create_appid_file,
+                )
+                self._forget_item(item_id)
+                return result
+            except Exception as e:
+                native_error = e
+
+        if preview_path:
+            raise RuntimeError(f"A new preview image needs the native Steamworks path: {native_error or 'not available'}")
+        if tags is not None and not tags:
+            raise RuntimeError(f"Removing every tag needs the native Steamworks path: {native_error or 'not available'}")
+        if not api_key:
+            if native_error:
+                raise native_error
+            raise ValueError("API key is required for Web API metadata updates.")
+
+        data = {
+            "key": api_key,
+            "publishedfileid": item_id,
+            "appid": appid,
+            "title": title,
+            "file_description": description,
+            "visibility": visibility,
+        }
+        for i, tag in enumerate(tags or []):
+            data[f"tags[{i}]"] = tag
+
+        self.steam_service.request_with_retry(
+            "POST",
+            self.steam_service.api_url("IPublishedFileService/Update/v1/"),
+            operation_name="Update Workshop metadata",
+            data=data,
+            timeout=10,
+        )
+        self._forget_item(item_id)
+        return {
+            "method": "web_api",
+            "native_error": str(native_error) if native_error else "",
+        }
+
     def get_log_paths(self, steamcmd_exe, appid):
         base_dir = os.path.dirname(steamcmd_exe)
         return [
@@ -242,12 +546,13 @@ class WorkshopBackend:
         if not os.path.exists(build_log):
             return None
 
-        try:
-            with open(build_log, "r", errors="ignore") as f:
-                lines = f.readlines()
-            errors = [line.strip() for line in lines if "error" in line.lower() or "failed" in line.lower()]
-            if errors:
-                return "\n".join(errors[-5:])
-        except Exception:
-            pass
+        session = self.log_reader.read_latest_session(build_log)
+        if session and session["errors"]:
+            return "\n".join(session["errors"][-5:])
         return None
+
+    def read_upload_log_sessions(self, steamcmd_exe, appid):
+        return [
+            (name, path, self.log_reader.read_latest_session(path))
+            for name, path in self.get_log_paths(steamcmd_exe, appid)
+        ]